@@ -0,0 +1,184 @@
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic_content import generate_content
+
+
+TOOLS_DIR = Path(__file__).resolve().parents[1] / "tools"
+SCALES = (1, 10, 100)
+
+# (phase, script, arguments, uses the parse cache). Paths are relative to the
+# generated tree, which is also the working directory of every tool run.
+PHASES = [
+    (
+        "recipe_index",
+        "build_recipe_index.py",
+        [
+            "--recipes", "Recipes",
+            "--items", "Content/Gameplay",
+            "--content-root", "Content",
+            "--output", "out/recipes.json",
+            "--icons-dir", "out/recipe_icons",
+            "--normalized-dir", "out/recipes",
+        ],
+        True,
+    ),
+    (
+        "spell_catalog",
+        "build_spell_catalog.py",
+        [
+            "--spells", "Content/Gameplay",
+            "--items", "Content/Gameplay",
+            "--content-root", "Content",
+            "--output", "out/spells.json",
+            "--icons-dir", "out/spell_icons",
+        ],
+        True,
+    ),
+    (
+        "item_tables",
+        "build_item_tables.py",
+        [
+            "--source", "Content/Gameplay/Items", "Content/Gameplay/Character/Player/Equipment",
+            "--table", "Table",
+            "--content-root", "Content",
+        ],
+        True,
+    ),
+    ("rename_assets", "rename_dwe_assets.py", ["--root", "Table"], False),
+    ("sync_assets", "sync_table_to_assets.py", ["--table", "Table", "--assets", "docs/DWE/Assets"], False),
+    ("dwe_catalog", "build_dwe_catalog.py", ["--assets", "docs/DWE/Assets", "--output", "out/catalog.json"], False),
+]
+
+# nocache: full parse without the cache; cold: empty cache and outputs;
+# warm: cache and outputs from the cold pass are kept (no content changes).
+PASSES = ("nocache", "cold", "warm")
+
+
+def run_phase(
+    root: Path, log_dir: Path, name: str, script: str, arguments: list[str]
+) -> tuple[float, dict]:
+    log_path = log_dir / f"{name}.txt"
+    metrics_path = log_dir / f"{name}.metrics.json"
+    with log_path.open("w", encoding="utf-8") as log:
+        start = time.perf_counter()
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(TOOLS_DIR / script),
+                *arguments,
+                "--metrics-out",
+                str(metrics_path.resolve()),
+            ],
+            cwd=root,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{script} exited with {result.returncode} (log: {log_path})")
+    return elapsed, json.loads(metrics_path.read_text(encoding="utf-8"))
+
+
+def run_pass(root: Path, pass_name: str, jobs: int) -> tuple[dict[str, float], dict[str, dict]]:
+    if pass_name != "warm":
+        shutil.rmtree(root / "out", ignore_errors=True)
+        shutil.rmtree(root / ".build-cache", ignore_errors=True)
+    # rename_dwe_assets renames Table in place, so every pass stages a fresh Table.
+    shutil.rmtree(root / "Table", ignore_errors=True)
+    log_dir = root / "logs" / pass_name
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    timings: dict[str, float] = {}
+    metrics: dict[str, dict] = {}
+    for name, script, arguments, cached in PHASES:
+        arguments = list(arguments)
+        if cached:
+            arguments += ["--jobs", str(jobs)]
+            if pass_name == "nocache":
+                arguments.append("--no-cache")
+        timings[name], metrics[name] = run_phase(root, log_dir, name, script, arguments)
+    return timings, metrics
+
+
+def print_table(scale: int, results: dict[str, dict[str, float]]) -> None:
+    print(f"[INFO] Scale {scale}x (seconds)")
+    print(f"  {'phase':<16}" + "".join(f"{name:>10}" for name in PASSES))
+    for name, *_rest in PHASES:
+        row = "".join(f"{results[pass_name][name]:>10.3f}" for pass_name in PASSES)
+        print(f"  {name:<16}{row}")
+    totals = "".join(f"{sum(results[pass_name].values()):>10.3f}" for pass_name in PASSES)
+    print(f"  {'total':<16}{totals}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Time the build tools phase by phase against synthetic content."
+    )
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        choices=SCALES,
+        default=list(SCALES),
+        help="Content scales to run (default: 1 10 100).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="--jobs passed to the tools that parse exports (default: 1).",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Content generator seed (default: 0).")
+    parser.add_argument(
+        "--workdir",
+        help="Folder for generated trees (default: a temporary folder removed afterwards).",
+    )
+    parser.add_argument(
+        "--output",
+        help="Optional JSON file for the timings.",
+    )
+    args = parser.parse_args()
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="dwe-bench-"))
+    report: dict[str, dict] = {}
+    try:
+        for scale in args.scales:
+            root = workdir / f"scale_{scale}x"
+            shutil.rmtree(root, ignore_errors=True)
+            start = time.perf_counter()
+            counts = generate_content(root, scale, args.seed)
+            generated = time.perf_counter() - start
+            print(f"[INFO] Generated {counts['files']} files for {scale}x in {generated:.2f}s: {root}")
+
+            results = {}
+            metrics = {}
+            for pass_name in PASSES:
+                results[pass_name], metrics[pass_name] = run_pass(root, pass_name, args.jobs)
+            print_table(scale, results)
+            report[f"{scale}x"] = {
+                "counts": counts,
+                "generate": generated,
+                "passes": results,
+                "metrics": metrics,
+            }
+    except RuntimeError as exc:
+        print(f"[ERROR] {exc}")
+        return 1
+    if not args.workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"[INFO] Wrote timings: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
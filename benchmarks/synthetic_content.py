@@ -0,0 +1,345 @@
+import argparse
+import base64
+import json
+import random
+import struct
+import zlib
+from pathlib import Path
+
+
+# Roughly the size of the current export dump; scale multiplies every count.
+BASE_COUNTS = {
+    "items": 680,
+    "equipment": 100,
+    "plans": 700,
+    "vestiges": 70,
+    "spells": 33,
+    "recipes": 600,
+}
+ASSET_MATCH_RATIO = 0.9
+ASSET_EXTRA_RATIO = 0.05
+
+ITEM_GROUPS = [
+    ("Weapons", "ItemFilter.Type.Weapon.Melee", "BagTab/Weapons/Melee Weapons"),
+    ("Weapons", "ItemFilter.Type.Weapon.Ranged", "BagTab/Weapons/Ranged Weapons"),
+    ("Tools", "ItemFilter.Type.Tool", "BagTab/Tools"),
+    ("Resources", "ItemFilter.Type.Resource.Ore", "BagTab/Materials/Ores"),
+    ("Resources", "ItemFilter.Type.Resource.Wood", "BagTab/Materials/Wood"),
+    ("Consumables", "ItemFilter.Type.Consumable.Food", "BagTab/Consumables/Food"),
+    ("Consumables", "ItemFilter.Type.Consumable.Drink", "BagTab/Consumables/Drinks"),
+    ("Consumables", "ItemFilter.Type.Consumable.BurntFood", "BagTab/Consumables/Burnt Food"),
+    ("Runes", "ItemFilter.Type.Rune", "RuneTab"),
+    ("Ammo", "ItemFilter.Type.Ammo.Arrow", "AmmoTab/Arrows"),
+    ("Quest", "ItemFilter.Type.Quest", "QuestTab/Synthetic Quest"),
+]
+EQUIPMENT_SLOTS = ("Head", "Body", "Legs", "Cape", "Jewellery")
+RECIPE_CATEGORIES = ("Ammo", "Armour", "Consumable", "Resource", "Tool", "Weapon")
+ADJECTIVES = ("Bronze", "Iron", "Steel", "Ash", "Yew", "Bone", "Runed", "Ancient", "Gilded")
+NOUNS = ("Sword", "Axe", "Bow", "Helm", "Ingot", "Plank", "Stew", "Tea", "Arrow", "Rune")
+
+EXPORT_FLAGS = "RF_Public | RF_Standalone | RF_Transactional | RF_WasLoaded | RF_LoadCompleted"
+
+
+def persistence_id(rng: random.Random) -> str:
+    return base64.urlsafe_b64encode(rng.randbytes(16)).decode("ascii").rstrip("=")
+
+
+def png_stub(index: int) -> bytes:
+    # 1x1 RGBA image; the pixel encodes the index so every icon hashes differently.
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+    header = struct.pack(">IIBBBBB", 1, 1, 8, 6, 0, 0, 0)
+    pixel = b"\x00" + struct.pack(">I", index & 0xFFFFFFFF)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(pixel))
+        + chunk(b"IEND", b"")
+    )
+
+
+def object_ref(type_name: str, object_path: str) -> dict:
+    name = object_path.rsplit("/", 1)[-1]
+    return {
+        "ObjectName": f"{type_name}'{name}'",
+        "ObjectPath": f"RSDragonwilds/Content/{object_path}.0",
+    }
+
+
+def text_ref(table: str, key: str, value: str) -> dict:
+    return {
+        "TableId": f"/Game/Gameplay/Items/{table}.{table}",
+        "Key": key,
+        "SourceString": value,
+        "LocalizedString": value,
+    }
+
+
+def write_json(path: Path, data) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+class ContentWriter:
+    def __init__(self, root: Path, seed: int) -> None:
+        self.root = root
+        self.rng = random.Random(seed)
+        self.icon_count = 0
+        self.file_count = 0
+
+    def icon(self, folder: str, name: str) -> str:
+        # Names end in a letter: the tools strip a trailing ".0" with rstrip(".0").
+        object_path = f"Art/UI/Icons/Synthetic/{folder}/{name}"
+        path = self.root / "Content" / f"{object_path}.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(png_stub(self.icon_count))
+        self.icon_count += 1
+        self.file_count += 1
+        return object_path
+
+    def export(self, path: Path, entries: list[dict]) -> None:
+        write_json(path, entries)
+        self.file_count += 1
+
+    def item(self, folder: Path, item_id: str, display: str, tag: str, extra: dict) -> dict:
+        icon_path = self.icon("Items", f"T_Icon_{item_id.removeprefix('ITEM_')}")
+        props = {
+            "Name": text_ref("ST_ItemNames", item_id, display),
+            "Description": text_ref("ST_ItemDescriptions", item_id, f"A synthetic {display.lower()}."),
+            "Icon": object_ref("Texture2D", icon_path),
+            "MaxStackSize": self.rng.choice((1, 1, 10, 50, 100)),
+            "Weight": round(self.rng.uniform(0.1, 20.0), 1),
+            "Category": {"TagName": tag},
+            "ItemFilterTags": [tag],
+            "AudioSwitchTag": {"TagName": "Audio.Item.Generic"},
+            "PersistenceID": persistence_id(self.rng),
+            "InternalName": item_id.lower(),
+        }
+        props.update(extra)
+        self.export(
+            folder / f"{item_id}.json",
+            [
+                {
+                    "Type": "ItemData",
+                    "Name": item_id,
+                    "Class": "UScriptClass'ItemData'",
+                    "Flags": EXPORT_FLAGS,
+                    "Properties": props,
+                }
+            ],
+        )
+        return {
+            "item_id": item_id,
+            "display_name": display,
+            "persistence_id": props["PersistenceID"],
+            "object_path": (folder.relative_to(self.root / "Content") / item_id).as_posix(),
+            "max_stack": props["MaxStackSize"],
+        }
+
+
+def display_name(rng: random.Random, index: int) -> str:
+    return f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {index}"
+
+
+def generate_items(writer: ContentWriter, count: int) -> list[tuple[dict, str]]:
+    items_root = writer.root / "Content" / "Gameplay" / "Items"
+    generated = []
+    for index in range(count):
+        folder, tag, asset_dir = ITEM_GROUPS[index % len(ITEM_GROUPS)]
+        item_id = f"ITEM_Syn_{folder}_{index:06d}_A"
+        extra = {}
+        if folder in ("Weapons", "Tools"):
+            extra = {"BaseDurability": writer.rng.choice((300, 600, 900)), "PowerLevel": 1 + index % 5}
+        record = writer.item(items_root / folder, item_id, display_name(writer.rng, index), tag, extra)
+        generated.append((record, asset_dir))
+    return generated
+
+
+def generate_equipment(writer: ContentWriter, count: int) -> list[tuple[dict, str]]:
+    equipment_root = writer.root / "Content" / "Gameplay" / "Character" / "Player" / "Equipment"
+    generated = []
+    for index in range(count):
+        slot = EQUIPMENT_SLOTS[index % len(EQUIPMENT_SLOTS)]
+        item_id = f"ITEM_Syn_Armour_{slot}_{index:06d}_A"
+        extra = {"BaseDurability": 500, "PowerLevel": 1 + index % 5}
+        record = writer.item(
+            equipment_root / slot,
+            item_id,
+            f"{writer.rng.choice(ADJECTIVES)} {slot} {index}",
+            f"ItemFilter.Type.Armour.{slot}",
+            extra,
+        )
+        generated.append((record, f"BagTab/Armour/{slot}"))
+    return generated
+
+
+def generate_plans(writer: ContentWriter, folder: str, count: int) -> list[tuple[dict, str]]:
+    plans_root = writer.root / "Content" / "Gameplay" / "Items" / "Consumables" / folder
+    generated = []
+    label = folder.rstrip("s")
+    for index in range(count):
+        item_id = f"DA_Consumable_{label}_Syn_{index:06d}_A"
+        record = writer.item(
+            plans_root / f"Group_{index % 8}",
+            item_id,
+            f"{label} {display_name(writer.rng, index)}",
+            f"ItemFilter.Type.Consumable.{label}",
+            {"BuildingPieceToUnlock": object_ref("BlueprintGeneratedClass", f"Gameplay/Building/BP_Syn_{index:06d}_C")},
+        )
+        generated.append((record, f"BagTab/{folder}"))
+    return generated
+
+
+def generate_spells(writer: ContentWriter, count: int, items: list[dict]) -> None:
+    spells_root = writer.root / "Content" / "Gameplay" / "UtilityMagic"
+    for index in range(count):
+        spell_id = f"USD_Syn_Spell_{index:06d}_A"
+        costs = [
+            {"ItemData": object_ref("ItemData", item["object_path"]), "Count": writer.rng.randint(1, 20)}
+            for item in writer.rng.sample(items, k=min(2, len(items)))
+        ]
+        icon_path = writer.icon("Spells", f"T_Skill_Syn_Spell_{index:06d}_A")
+        writer.export(
+            spells_root / f"Group_{index % 4}" / f"{spell_id}.json",
+            [
+                {
+                    "Type": "SpellModule_CostItems",
+                    "Name": "SpellModule_CostItems_0",
+                    "Outer": spell_id,
+                    "Class": "UScriptClass'SpellModule_CostItems'",
+                    "Properties": {"ItemsCostInfo": costs, "bUseMagicAmmo": False, "ModuleName": "CostItems"},
+                },
+                {
+                    "Type": "UtilitySpellData",
+                    "Name": spell_id,
+                    "Class": "UScriptClass'UtilitySpellData'",
+                    "Properties": {
+                        "SpellDisplayName": text_ref("ST_Spells", spell_id, f"Synthetic Spell {index}"),
+                        "CooldownDuration": float(writer.rng.choice((10, 30, 60))),
+                        "SpellIcon": object_ref("Texture2D", icon_path),
+                        "SpellTagIcon": object_ref("Texture2D", icon_path),
+                        "PersistenceID": persistence_id(writer.rng),
+                        "InternalName": f"spell_syn_{index:06d}",
+                    },
+                },
+            ],
+        )
+
+
+def generate_recipes(writer: ContentWriter, count: int, items: list[dict]) -> None:
+    recipes_root = writer.root / "Recipes"
+    for index in range(count):
+        category = RECIPE_CATEGORIES[index % len(RECIPE_CATEGORIES)]
+        recipe_id = f"RECIPE_{category}_Syn_{index:06d}_A"
+        picked = writer.rng.sample(items, k=min(4, len(items)))
+
+        def refs(chosen: list[dict]) -> list[dict]:
+            return [
+                {"ItemData": object_ref("ItemData", item["object_path"]), "Count": writer.rng.randint(1, 10)}
+                for item in chosen
+            ]
+
+        writer.export(
+            recipes_root / f"{recipe_id}.json",
+            [
+                {
+                    "Type": "RecipeData",
+                    "Name": recipe_id,
+                    "Class": "UScriptClass'RecipeData'",
+                    "Flags": EXPORT_FLAGS,
+                    "Properties": {
+                        "ItemsConsumed": refs(picked[1:]),
+                        "ItemsCreated": refs(picked[:1]),
+                        "AudioTag": {"TagName": "Audio.Craft.Generic"},
+                        "OnCraftXpEvent": {
+                            "DataTable": object_ref("DataTable", "Gameplay/Progress/DT_XPEvents_Crafting"),
+                            "RowName": f"Craft_{category}_Tier{1 + index % 3}",
+                        },
+                        "SkillXPAwardedOnCraft": 1 + index % 20,
+                        "PersistenceID": persistence_id(writer.rng),
+                        "InternalName": recipe_id.lower(),
+                    },
+                }
+            ],
+        )
+
+
+def generate_assets(writer: ContentWriter, items: list[tuple[dict, str]]) -> None:
+    # A curated DWE/Assets tree named the way rename_dwe_assets names Table files,
+    # so sync_table_to_assets finds matches and build_dwe_catalog has items to read.
+    assets_root = writer.root / "docs" / "DWE" / "Assets"
+    placeholders = assets_root / "Placeholders"
+    placeholders.mkdir(parents=True, exist_ok=True)
+    for name in ("placeholder_icon.png", "recipe_icon.png"):
+        (placeholders / name).write_bytes(png_stub(writer.icon_count))
+        writer.icon_count += 1
+        writer.file_count += 1
+    spell_placeholder = (
+        writer.root / "Content" / "Art" / "UI" / "Skills" / "Icons" / "Unlock" / "Placeholder"
+    )
+    spell_placeholder.mkdir(parents=True, exist_ok=True)
+    (spell_placeholder / "T_Skill_Placeholder_Active_Spells.png").write_bytes(png_stub(writer.icon_count))
+    writer.icon_count += 1
+    writer.file_count += 1
+
+    extra = int(len(items) * ASSET_EXTRA_RATIO)
+    for index, (record, asset_dir) in enumerate(items + items[:extra]):
+        if index < len(items) and writer.rng.random() > ASSET_MATCH_RATIO:
+            continue
+        name = record["display_name"]
+        if index >= len(items):
+            name = f"{name} Curated"
+        folder = assets_root / asset_dir
+        write_json(
+            folder / f"{name}.json",
+            {
+                "ItemData": record["persistence_id"],
+                "name": record["display_name"],
+                "max_stack": record["max_stack"],
+                "icon": f"{name}.png",
+                "description": f"A synthetic {record['display_name'].lower()}.",
+            },
+        )
+        (folder / f"{name}.png").write_bytes(png_stub(writer.icon_count))
+        writer.icon_count += 1
+        writer.file_count += 2
+
+
+def generate_content(root: Path, scale: int, seed: int = 0) -> dict[str, int]:
+    writer = ContentWriter(root, seed)
+    counts = {key: value * scale for key, value in BASE_COUNTS.items()}
+    items = generate_items(writer, counts["items"])
+    equipment = generate_equipment(writer, counts["equipment"])
+    plans = generate_plans(writer, "Plans", counts["plans"])
+    vestiges = generate_plans(writer, "Vestiges", counts["vestiges"])
+    item_records = [record for record, _asset_dir in items + equipment]
+    generate_spells(writer, counts["spells"], item_records)
+    generate_recipes(writer, counts["recipes"], item_records)
+    generate_assets(writer, items + equipment + plans + vestiges)
+    counts["files"] = writer.file_count
+    counts["icons"] = writer.icon_count
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic UE export tree (ITEM_/DA_/USD_/RECIPE_ JSON and PNG stubs)."
+    )
+    parser.add_argument("--output", required=True, help="Folder to generate into.")
+    parser.add_argument("--scale", type=int, default=1, help="Multiplier on the base content size.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0).")
+    args = parser.parse_args()
+
+    root = Path(args.output)
+    if root.exists() and any(root.iterdir()):
+        print(f"[ERROR] Output folder is not empty: {root}")
+        return 1
+    counts = generate_content(root, args.scale, args.seed)
+    print(f"[INFO] Generated {counts['files']} files ({counts['icons']} icons) in {root}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -61,6 +61,7 @@ const state = {
   pageIndex: 0,
   catalog: null,
   catalogIndex: new Map(),
+  searchIndex: null,
   inventory: {},
   personalInventory: {},
   loadout: {},
@@ -263,6 +264,94 @@ function updateBrowserArrows(totalItems) {
   }
 }
 
+function bagCategoryRoots(category) {
+  return category === "Plans" ? ["Plans", "Vestiges"] : [category];
+}
+
+function itemMatchesQuery(item, query) {
+  const name = (item.name ?? "").toLowerCase();
+  const category = (item.category ?? "").toLowerCase();
+  return name.includes(query) || category.includes(query);
+}
+
+function mergePostings(lists) {
+  return [...new Set(lists.flat())].sort((a, b) => a - b);
+}
+
+function intersectPostings(lists) {
+  if (!lists.length) {
+    return [];
+  }
+  const [shortest, ...rest] = [...lists].sort((a, b) => a.length - b.length);
+  const sets = rest.map((list) => new Set(list));
+  return shortest.filter((position) => sets.every((set) => set.has(position)));
+}
+
+function getTabSearchIndex(tabKey, items) {
+  const tabIndex = state.searchIndex?.tabs?.[tabKey];
+  if (!tabIndex || tabIndex.count !== items.length) {
+    return null;
+  }
+  return tabIndex;
+}
+
+function searchPositions(tabIndex, items, query) {
+  const gramSize = state.searchIndex.gramSize;
+  // Grams are built per code point (Python slicing), so split the query the
+  // same way rather than by UTF-16 unit; names outside the BMP still match.
+  const chars = Array.from(query);
+  if (chars.length <= gramSize) {
+    return tabIndex.grams[query] ?? [];
+  }
+  const lists = [];
+  for (let start = 0; start + gramSize <= chars.length; start += 1) {
+    const postings = tabIndex.grams[chars.slice(start, start + gramSize).join("")];
+    if (!postings) {
+      return [];
+    }
+    lists.push(postings);
+  }
+  return intersectPostings(lists).filter((position) =>
+    itemMatchesQuery(items[position], query)
+  );
+}
+
+function getBrowserItems(tabData) {
+  const items = tabData.items ?? [];
+  const category =
+    state.activeTab === "bag" && state.bagCategory ? state.bagCategory : null;
+  const query = state.searchQuery ? state.searchQuery.toLowerCase() : "";
+  if (!category && !query) {
+    return items;
+  }
+
+  const tabIndex = getTabSearchIndex(state.activeTab, items);
+  if (!tabIndex) {
+    return items.filter((item) => {
+      if (category) {
+        const root = (item.category ?? "").split("/")[0];
+        if (!bagCategoryRoots(category).includes(root)) {
+          return false;
+        }
+      }
+      return !query || itemMatchesQuery(item, query);
+    });
+  }
+
+  const lists = [];
+  if (category) {
+    lists.push(
+      mergePostings(
+        bagCategoryRoots(category).map((root) => tabIndex.categories[root] ?? [])
+      )
+    );
+  }
+  if (query) {
+    lists.push(searchPositions(tabIndex, items, query));
+  }
+  return intersectPostings(lists).map((position) => items[position]);
+}
+
 function renderItemBrowser() {
   if (!state.catalog) {
     return;
@@ -273,25 +362,7 @@ function renderItemBrowser() {
     return;
   }
 
-  let items = tabData.items ?? [];
-  if (state.activeTab === "bag" && state.bagCategory) {
-    items = items.filter((item) => {
-      const category = item.category ?? "";
-      const root = category.split("/")[0];
-      if (state.bagCategory === "Plans") {
-        return root === "Plans" || root === "Vestiges";
-      }
-      return root === state.bagCategory;
-    });
-  }
-  if (state.searchQuery) {
-    const query = state.searchQuery.toLowerCase();
-    items = items.filter((item) => {
-      const name = (item.name ?? "").toLowerCase();
-      const category = (item.category ?? "").toLowerCase();
-      return name.includes(query) || category.includes(query);
-    });
-  }
+  const items = getBrowserItems(tabData);
   const start = state.pageIndex * PAGE_SIZE;
   const pageItems = items.slice(start, start + PAGE_SIZE);
   renderBrowserSlots(pageItems);
@@ -1403,7 +1474,7 @@ if (browserNext) {
     if (!tabData) {
       return;
     }
-    const totalItems = tabData.items?.length ?? 0;
+    const totalItems = getBrowserItems(tabData).length;
     const totalPages = Math.max(1, Math.ceil(totalItems / PAGE_SIZE));
     if (state.pageIndex >= totalPages - 1) {
       return;
@@ -1521,6 +1592,15 @@ if (countModal) {
   });
 }
 
+// The search index is optional: the browser renders from the catalog at once
+// and filters linearly until the index arrives, which gives the same results.
+fetch("./data/catalog_search.json")
+  .then((response) => (response.ok ? response.json() : null))
+  .then((searchIndex) => {
+    state.searchIndex = searchIndex;
+  })
+  .catch(() => {});
+
 fetch("./data/catalog.json")
   .then((response) => response.json())
   .then((catalog) => {
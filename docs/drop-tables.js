@@ -2,6 +2,7 @@ const DATA_PATHS = {
   lootTable: "./data/loot_drop_table.json",
   enemyNames: "./data/loot_drop_table_enemy_names.json",
   itemNames: "./data/loot_drop_table_item_names.json",
+  dropSummary: "./data/loot_drop_summary.json",
   catalog: "./data/catalog.json",
 };
 
@@ -16,9 +17,14 @@ const table = document.getElementById("drop-table");
 const tableBody = document.getElementById("drop-table-body");
 
 const state = {
-  lootRows: {},
+  lootRows: null,
+  lootRowsRequest: null,
   enemyDisplayList: [],
   enemyDisplayToInternal: new Map(),
+  enemyInternalToDisplay: new Map(),
+  itemSources: {},
+  itemDisplayList: [],
+  itemDisplayToId: new Map(),
   itemNameMap: {},
   catalogByName: new Map(),
   activeEnemyDisplay: "",
@@ -49,6 +55,14 @@ function formatPercent(value) {
   return `${normalized}%`;
 }
 
+function formatExpected(value) {
+  const num = Number(value);
+  if (Number.isNaN(num)) {
+    return "";
+  }
+  return `~${Number(num.toFixed(2))}`;
+}
+
 function formatQuantity(min, max) {
   if (typeof min === "undefined" || typeof max === "undefined") {
     return "";
@@ -154,15 +168,19 @@ function renderTable(alwaysRows, bonusRows) {
       const itemCell = document.createElement("td");
       const itemWrap = document.createElement("div");
       itemWrap.className = "drop-item";
-      const icon = document.createElement("img");
-      icon.className = "drop-item__icon";
-      icon.alt = row.displayName;
-      icon.loading = "lazy";
-      if (row.iconPath) {
-        icon.src = row.iconPath;
-      } else {
-        icon.classList.add("is-missing");
-        icon.src = "./DWE/UI/Inventory/Item_BG.png";
+      // Enemy rows (item lookups) have no icon of their own.
+      if (row.showIcon !== false) {
+        const icon = document.createElement("img");
+        icon.className = "drop-item__icon";
+        icon.alt = row.displayName;
+        icon.loading = "lazy";
+        if (row.iconPath) {
+          icon.src = row.iconPath;
+        } else {
+          icon.classList.add("is-missing");
+          icon.src = "./DWE/UI/Inventory/Item_BG.png";
+        }
+        itemWrap.appendChild(icon);
       }
       const nameLink = document.createElement("a");
       nameLink.className = "drop-item__name";
@@ -170,7 +188,6 @@ function renderTable(alwaysRows, bonusRows) {
       nameLink.href = row.wikiUrl ?? "#";
       nameLink.target = "_blank";
       nameLink.rel = "noopener";
-      itemWrap.appendChild(icon);
       itemWrap.appendChild(nameLink);
       itemCell.appendChild(itemWrap);
 
@@ -216,9 +233,84 @@ function buildRows(resources) {
   });
 }
 
+function renderItemSources(displayName, itemId) {
+  // Enemies that drop the item, precomputed by update_drop_tables.py as
+  // [enemy, drop chance %, expected count per kill].
+  const sources = state.itemSources[itemId] ?? [];
+  const rows = sources.map(([enemy, chance, expected]) => {
+    const enemyName = state.enemyInternalToDisplay.get(enemy) || enemy;
+    return {
+      displayName: enemyName,
+      showIcon: false,
+      wikiUrl: buildWikiUrl(enemyName),
+      quantity: formatExpected(expected),
+      rarity: formatPercent(chance),
+      chanceValue: Number(chance),
+    };
+  });
+
+  state.activeEnemyDisplay = displayName;
+  resultsHeader.classList.remove("is-hidden");
+  resultsHeader.hidden = false;
+  enemyTitle.textContent = displayName;
+  const itemLink = document.createElement("a");
+  itemLink.href = buildWikiUrl(displayName);
+  itemLink.target = "_blank";
+  itemLink.rel = "noopener";
+  itemLink.textContent = "View on Wiki";
+  enemySubtitle.textContent = `Dropped by ${rows.length} NPC${rows.length === 1 ? "" : "s"}. `;
+  enemySubtitle.appendChild(itemLink);
+
+  if (!rows.length) {
+    table.classList.add("is-hidden");
+    table.hidden = true;
+    hideEmptyState();
+    return;
+  }
+  renderTable(
+    rows.filter((rowItem) => rowItem.chanceValue === 100),
+    rows.filter((rowItem) => rowItem.chanceValue !== 100)
+  );
+}
+
+function loadLootRows() {
+  // The full table is only needed for an enemy's own loot, so it is fetched
+  // on the first enemy lookup rather than at page load.
+  if (!state.lootRowsRequest) {
+    state.lootRowsRequest = fetch(DATA_PATHS.lootTable)
+      .then((res) => res.json())
+      .then((lootTable) => {
+        state.lootRows = lootTable?.[0]?.Rows ?? {};
+      })
+      .catch((error) => {
+        state.lootRowsRequest = null;
+        throw error;
+      });
+  }
+  return state.lootRowsRequest;
+}
+
 function renderEnemyLoot(displayName) {
   const internalKey =
     state.enemyDisplayToInternal.get(normalizeText(displayName)) ?? null;
+  const itemId = state.itemDisplayToId.get(normalizeText(displayName));
+  if (!internalKey && itemId) {
+    renderItemSources(displayName, itemId);
+    return;
+  }
+  if (internalKey && !state.lootRows) {
+    state.activeEnemyDisplay = displayName;
+    loadLootRows()
+      .then(() => {
+        if (state.activeEnemyDisplay === displayName) {
+          renderEnemyLoot(displayName);
+        }
+      })
+      .catch(() => {
+        showEmptyState("Failed to load drop table data.");
+      });
+    return;
+  }
   const row = internalKey ? state.lootRows[internalKey] : null;
 
   state.activeEnemyDisplay = displayName;
@@ -273,7 +365,7 @@ function handleInput() {
     table.classList.add("is-hidden");
     table.hidden = true;
     state.activeEnemyDisplay = "";
-    showEmptyState("Type in an NPC name to see its loot table.");
+    showEmptyState("Type in an NPC name to see its loot table, or an item name to see what drops it.");
     return;
   }
   searchClear.classList.remove("is-hidden");
@@ -282,6 +374,11 @@ function handleInput() {
   const matches = state.enemyDisplayList.filter((name) =>
     normalizeText(name).includes(query)
   );
+  state.itemDisplayList.forEach((name) => {
+    if (normalizeText(name).includes(query) && !matches.includes(name)) {
+      matches.push(name);
+    }
+  });
   showSuggestions(matches.slice(0, 8));
 }
 
@@ -295,7 +392,8 @@ function handleSubmit() {
       return;
     }
   }
-  const match = state.enemyDisplayToInternal.get(key);
+  const match =
+    state.enemyDisplayToInternal.get(key) ?? state.itemDisplayToId.get(key);
   if (match) {
     selectEnemy(value.trim());
   } else {
@@ -304,21 +402,22 @@ function handleSubmit() {
 }
 
 async function loadData() {
-  const [lootTable, enemyNames, itemNames, catalog] = await Promise.all([
-    fetch(DATA_PATHS.lootTable).then((res) => res.json()),
+  // The summary only adds item lookups; the enemy search works without it.
+  const [enemyNames, itemNames, catalog, dropSummary] = await Promise.all([
     fetch(DATA_PATHS.enemyNames).then((res) => res.json()),
     fetch(DATA_PATHS.itemNames).then((res) => res.json()),
     fetch(DATA_PATHS.catalog).then((res) => res.json()),
+    fetch(DATA_PATHS.dropSummary)
+      .then((res) => (res.ok ? res.json() : null))
+      .catch(() => null),
   ]);
 
-  const lootRows = lootTable?.[0]?.Rows ?? {};
-  state.lootRows = lootRows;
-
   state.itemNameMap = itemNames ?? {};
 
   const enemyEntries = Object.entries(enemyNames ?? {});
   const displayList = [];
   const displayToInternal = new Map();
+  const internalToDisplay = new Map();
   enemyEntries.forEach(([internal, display]) => {
     const displayName = String(display ?? internal).trim();
     if (!displayName) {
@@ -326,10 +425,28 @@ async function loadData() {
     }
     displayList.push(displayName);
     displayToInternal.set(normalizeText(displayName), internal);
+    internalToDisplay.set(internal, displayName);
   });
   displayList.sort((a, b) => a.localeCompare(b));
   state.enemyDisplayList = displayList;
   state.enemyDisplayToInternal = displayToInternal;
+  state.enemyInternalToDisplay = internalToDisplay;
+
+  state.itemSources = dropSummary?.items ?? {};
+  const itemDisplayList = [];
+  const itemDisplayToId = new Map();
+  Object.keys(state.itemSources).forEach((itemId) => {
+    const displayName = String(state.itemNameMap[itemId] || itemId).trim();
+    const key = normalizeText(displayName);
+    if (!displayName || itemDisplayToId.has(key)) {
+      return;
+    }
+    itemDisplayList.push(displayName);
+    itemDisplayToId.set(key, itemId);
+  });
+  itemDisplayList.sort((a, b) => a.localeCompare(b));
+  state.itemDisplayList = itemDisplayList;
+  state.itemDisplayToId = itemDisplayToId;
 
   const catalogItems = [];
   Object.values(catalog?.tabs ?? {}).forEach((tab) => {
@@ -21,6 +21,8 @@ const saveButton = document.getElementById("save-button");
 const characterInput = document.getElementById("character-file");
 
 const RECIPES_URL = "./data/recipes.json";
+const RECIPES_MANIFEST_URL = "./data/recipes/manifest.json";
+const BOM_URL = "./data/recipe_bom.json";
 const ICONS_BASE = "./recipes/icons/";
 const CHECKED_ICON = "./homepage/assets/checked.png";
 const PAGE_SIZE = 64;
@@ -33,6 +35,7 @@ let characterSource = null;
 let characterFileName = null;
 let characterFileHandle = null;
 let contextRecipeIndex = null;
+let recipeBom = null;
 
 function setStatus(message, loaded) {
   if (!statusText || !statusBar || !statusIcon) {
@@ -141,20 +144,23 @@ function updatePagination() {
   }
 }
 
-function applyFilter(query) {
+function filterRecipes(query) {
   const needle = query.trim().toLowerCase();
   if (!needle) {
-    filteredRecipes = [...allRecipes];
-  } else {
-    filteredRecipes = allRecipes.filter((recipe) => {
-      const name = recipe.display_name || recipe.name || "";
-      const rowName = recipe.row_name || "";
-      return (
-        name.toLowerCase().includes(needle) ||
-        rowName.toLowerCase().includes(needle)
-      );
-    });
-  }
+    return [...allRecipes];
+  }
+  return allRecipes.filter((recipe) => {
+    const name = recipe.display_name || recipe.name || "";
+    const rowName = recipe.row_name || "";
+    return (
+      name.toLowerCase().includes(needle) ||
+      rowName.toLowerCase().includes(needle)
+    );
+  });
+}
+
+function applyFilter(query) {
+  filteredRecipes = filterRecipes(query);
   currentPage = 0;
   updateTitle();
   renderGrid();
@@ -188,22 +194,40 @@ function buildTooltip(recipe) {
     return;
   }
   consumed.forEach((item) => {
-    const line = document.createElement("div");
-    line.className = "tooltip__row";
-    const iconWrap = document.createElement("div");
-    iconWrap.className = "tooltip__icon";
-    const icon = document.createElement("img");
-    icon.src = iconPath(item.icon);
-    icon.alt = "";
-    iconWrap.appendChild(icon);
-    line.appendChild(iconWrap);
-    const value = document.createElement("div");
-    value.textContent = `${item.display_name || item.item_id} × ${item.count}`;
-    line.appendChild(value);
-    tooltipMeta.appendChild(line);
+    appendTooltipRow(item.icon, `${item.display_name || item.item_id} × ${item.count}`);
+  });
+
+  // Only worth showing when an ingredient is itself crafted.
+  const bom = recipeBom && recipeBom.recipes[recipe.name];
+  if (!bom || !bom.intermediates.length) {
+    return;
+  }
+  const heading = document.createElement("div");
+  heading.className = "tooltip__section";
+  heading.textContent = "Raw materials";
+  tooltipMeta.appendChild(heading);
+  bom.raw.forEach(([index, count]) => {
+    const [itemId, displayName, , icon] = recipeBom.items[index];
+    appendTooltipRow(icon, `${displayName || itemId} × ${count}`);
   });
 }
 
+function appendTooltipRow(iconName, text) {
+  const line = document.createElement("div");
+  line.className = "tooltip__row";
+  const iconWrap = document.createElement("div");
+  iconWrap.className = "tooltip__icon";
+  const icon = document.createElement("img");
+  icon.src = iconPath(iconName);
+  icon.alt = "";
+  iconWrap.appendChild(icon);
+  line.appendChild(iconWrap);
+  const value = document.createElement("div");
+  value.textContent = text;
+  line.appendChild(value);
+  tooltipMeta.appendChild(line);
+}
+
 function showTooltip(recipe, event) {
   if (!tooltip) {
     return;
@@ -530,14 +554,74 @@ function bindControls() {
   }
 }
 
+async function fetchJson(url) {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error(`${url}: ${response.status}`);
+  }
+  return response.json();
+}
+
+function expandRecipes(shardRecipes, items) {
+  const expandItems = (refs) =>
+    (refs || []).map(([index, count]) => {
+      const [itemId, displayName, persistenceId, icon] = items[index];
+      return {
+        item_id: itemId,
+        count,
+        display_name: displayName,
+        persistence_id: persistenceId,
+        icon,
+      };
+    });
+  return shardRecipes.map((recipe) => ({
+    ...recipe,
+    items_created: expandItems(recipe.items_created),
+    items_consumed: expandItems(recipe.items_consumed),
+  }));
+}
+
+function showLoadedRecipes() {
+  filteredRecipes = filterRecipes(recipeSearchInput ? recipeSearchInput.value : "");
+  const pageCount = Math.max(1, Math.ceil(filteredRecipes.length / PAGE_SIZE));
+  currentPage = Math.min(currentPage, pageCount - 1);
+  updateTitle();
+  renderGrid();
+  updatePagination();
+}
+
+async function loadShardedRecipes() {
+  const manifest = await fetchJson(RECIPES_MANIFEST_URL);
+  const baseUrl = RECIPES_MANIFEST_URL.slice(0, RECIPES_MANIFEST_URL.lastIndexOf("/") + 1);
+  const itemTable = await fetchJson(`${baseUrl}${manifest.items}`);
+  const shardRequests = manifest.shards.map((shard) => fetchJson(`${baseUrl}${shard.file}`));
+  shardRequests.forEach((request) => request.catch(() => {}));
+  for (const request of shardRequests) {
+    const shard = await request;
+    allRecipes = allRecipes.concat(expandRecipes(shard.recipes, itemTable.items));
+    showLoadedRecipes();
+  }
+}
+
+async function loadRecipeBom() {
+  try {
+    recipeBom = await fetchJson(BOM_URL);
+  } catch (error) {
+    console.warn("Bill of materials unavailable.", error);
+  }
+}
+
 async function loadRecipes() {
   try {
-    const response = await fetch(RECIPES_URL);
-    allRecipes = await response.json();
-    filteredRecipes = [...allRecipes];
-    updateTitle();
-    renderGrid();
-    updatePagination();
+    await loadShardedRecipes();
+    return;
+  } catch (error) {
+    allRecipes = [];
+    console.warn("Sharded recipe catalog unavailable, loading full catalog.", error);
+  }
+  try {
+    allRecipes = await fetchJson(RECIPES_URL);
+    showLoadedRecipes();
   } catch (error) {
     setStatus("Failed to load recipe catalog.", false);
     console.error(error);
@@ -548,3 +632,4 @@ setStatus("Load a character file to highlight unlocked recipes.", false);
 bindSlotEvents();
 bindControls();
 loadRecipes();
+loadRecipeBom();
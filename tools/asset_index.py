@@ -0,0 +1,46 @@
+from pathlib import Path
+
+from build_cache import BuildCache, DirectoryIndex
+from build_metrics import count, phase
+
+
+ASSET_ROOT = "Art"
+
+
+class AssetIndex:
+    # Every PNG under <content root>/Art, listed once per run (unchanged
+    # folders come from the build cache's directory listings), so resolving an
+    # icon ObjectPath is a set lookup instead of a stat. Paths outside Art are
+    # still checked on disk.
+    def __init__(self, content_root: Path, cache: BuildCache | None = None) -> None:
+        self.content_root = content_root
+        tree = DirectoryIndex(content_root / ASSET_ROOT, cache.connection if cache else None)
+        with phase("scan"):
+            files = tree.files()
+        tree.flush()
+        self._files = {f"{ASSET_ROOT}/{rel}" for rel in files if rel.lower().endswith(".png")}
+        # Exports and checkouts do not always agree on case; the first match in
+        # sorted order wins so the pick is stable.
+        self._folded: dict[str, str] = {}
+        for rel in sorted(self._files):
+            self._folded.setdefault(rel.casefold(), rel)
+        self.case_matches = 0
+
+    def find(self, rel_path: Path) -> Path | None:
+        rel = rel_path.as_posix()
+        if rel in self._files:
+            return self.content_root / rel
+        if rel.split("/", 1)[0].casefold() != ASSET_ROOT.casefold():
+            count("asset_stat_fallbacks")
+            path = self.content_root / rel_path
+            return path if path.exists() else None
+        actual = self._folded.get(rel.casefold())
+        if actual is None:
+            return None
+        self.case_matches += 1
+        return self.content_root / actual
+
+
+def report_assets(assets: AssetIndex) -> None:
+    if assets.case_matches:
+        print(f"[INFO] Icons matched ignoring case: {assets.case_matches}")
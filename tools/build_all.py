@@ -0,0 +1,499 @@
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import json_codec
+from build_cache import DEFAULT_CACHE_DIR
+from file_ops import LINK_MODES, write_text_if_changed
+from tree_watch import open_watcher, stat_tree
+
+
+TOOLS_DIR = Path(__file__).resolve().parent
+STATE_NAME = "build_all.json"
+LOGS_DIR_NAME = "logs"
+
+
+class Stage:
+    def __init__(
+        self,
+        name: str,
+        script: str,
+        args: list[str],
+        inputs: list[str],
+        outputs: list[str],
+        deps: tuple[str, ...] = (),
+        requires: tuple[str, ...] = (),
+        parse_jobs: bool = False,
+        link_mode: bool = False,
+        locales: bool = False,
+    ) -> None:
+        self.name = name
+        self.script = script
+        self.args = args
+        self.inputs = inputs
+        self.outputs = outputs
+        self.deps = deps
+        self.requires = requires
+        self.parse_jobs = parse_jobs
+        self.link_mode = link_mode
+        self.locales = locales
+
+    def command(self, options: argparse.Namespace, metrics_dir: Path | None) -> list[str]:
+        command = [sys.executable, str(TOOLS_DIR / self.script), *self.args]
+        if self.parse_jobs:
+            command += ["--jobs", str(options.jobs)]
+            if options.no_cache:
+                command.append("--no-cache")
+        if self.link_mode:
+            command += ["--link-mode", options.link_mode]
+        if self.locales and options.locales:
+            command += ["--locales", *options.locales]
+        if metrics_dir is not None:
+            command += ["--metrics-out", str(metrics_dir / f"{self.name}.json")]
+        return command
+
+
+# Inputs include upstream outputs, so a stage reruns whenever a dependency
+# actually changed something it reads. Paths are relative to the repo root.
+STAGES = [
+    Stage(
+        "recipe_catalog",
+        "build_recipe_catalog.py",
+        [],
+        inputs=["Content/Gameplay"],
+        outputs=["Recipes"],
+    ),
+    Stage(
+        "recipe_index",
+        "build_recipe_index.py",
+        [],
+        inputs=["Recipes", "Content", "docs/DWE/Assets/Placeholders"],
+        outputs=[
+            "docs/data/recipes.json",
+            "docs/data/recipes",
+            "docs/data/recipe_bom.json",
+            "docs/recipes/icons",
+            str(DEFAULT_CACHE_DIR / "item_index.json"),
+        ],
+        deps=("recipe_catalog",),
+        parse_jobs=True,
+        link_mode=True,
+        locales=True,
+    ),
+    Stage(
+        "spell_catalog",
+        "build_spell_catalog.py",
+        [],
+        inputs=["Content"],
+        outputs=["docs/data/spells.json", "docs/spells/icons"],
+        parse_jobs=True,
+        link_mode=True,
+        locales=True,
+    ),
+    Stage(
+        "item_tables",
+        "build_item_tables.py",
+        [
+            "--source",
+            "Content/Gameplay/Items",
+            "Content/Gameplay/Character/Player/Equipment",
+            "--table",
+            "Table",
+            "--content-root",
+            "Content",
+        ],
+        inputs=["Content", "docs/DWE/Assets/Placeholders"],
+        outputs=["Table"],
+        parse_jobs=True,
+        link_mode=True,
+        locales=True,
+    ),
+    Stage(
+        "rename_assets",
+        "rename_dwe_assets.py",
+        ["--root", "Table"],
+        inputs=["Table"],
+        outputs=["Table"],
+        deps=("item_tables",),
+    ),
+    Stage(
+        "sync_assets",
+        "sync_table_to_assets.py",
+        ["--table", "Table", "--assets", "docs/DWE/Assets"],
+        inputs=["Table", "docs/DWE/Assets"],
+        outputs=["docs/DWE/Assets"],
+        deps=("rename_assets",),
+        link_mode=True,
+    ),
+    Stage(
+        "dwe_catalog",
+        "build_dwe_catalog.py",
+        [],
+        inputs=["docs/DWE/Assets"],
+        outputs=[
+            "web/data/catalog.json",
+            "web/data/catalog_search.json",
+            "docs/data/catalog.json",
+            "docs/data/catalog_search.json",
+        ],
+        deps=("sync_assets",),
+    ),
+    Stage(
+        "character_catalog",
+        "build_character_catalog.py",
+        [],
+        inputs=["docs/charactereditor/data"],
+        outputs=["docs/charactereditor/data/character_catalog.json"],
+    ),
+    Stage(
+        "drop_tables",
+        "update_drop_tables.py",
+        [],
+        inputs=["LootDropTable", str(DEFAULT_CACHE_DIR / "item_index.json")],
+        outputs=[
+            "docs/data/loot_drop_table.json",
+            "docs/data/loot_drop_table_enemy_names.json",
+            "docs/data/loot_drop_table_item_names.json",
+            "docs/data/loot_drop_summary.json",
+        ],
+        # The item index is written by recipe_index/spell_catalog.
+        deps=("recipe_index",),
+        requires=("LootDropTable/DT_LootDropTable.json",),
+    ),
+]
+
+
+class TreeSignatures:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._signatures: dict[str, str] = {}
+
+    def signature(self, rel_path: str) -> str:
+        signature = self._signatures.get(rel_path)
+        if signature is None:
+            signature = self._walk(self.root / rel_path)
+            self._signatures[rel_path] = signature
+        return signature
+
+    def _walk(self, path: Path) -> str:
+        files = stat_tree(path)
+        if not files and not path.is_dir():
+            return "missing"
+        hasher = hashlib.sha1()
+        for rel, (mtime_ns, size) in sorted(files.items()):
+            line = f"{rel}:{mtime_ns}:{size}" if rel else f"{mtime_ns}:{size}"
+            hasher.update(line.encode("utf-8"))
+            hasher.update(b"\n")
+        return hasher.hexdigest()
+
+    def invalidate(self, rel_paths: list[str]) -> None:
+        changed = [Path(rel_path) for rel_path in rel_paths]
+        for cached in list(self._signatures):
+            cached_path = Path(cached)
+            if any(
+                cached_path == path or path in cached_path.parents or cached_path in path.parents
+                for path in changed
+            ):
+                del self._signatures[cached]
+
+
+def tools_signature() -> str:
+    hasher = hashlib.sha1()
+    for path in sorted(TOOLS_DIR.glob("*.py")):
+        stat = path.stat()
+        hasher.update(f"{path.name}:{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+    return hasher.hexdigest()
+
+
+def stage_fingerprint(
+    stage: Stage, options: argparse.Namespace, signatures: TreeSignatures, tools: str
+) -> str:
+    # Only options that change what a tool writes are part of the fingerprint;
+    # --jobs, --no-cache and --metrics-out do not.
+    hasher = hashlib.sha1()
+    settings = [stage.script, *stage.args]
+    if stage.link_mode:
+        settings.append(options.link_mode)
+    if stage.locales and options.locales:
+        settings += ["--locales", *options.locales]
+    hasher.update(json.dumps(settings).encode("utf-8"))
+    hasher.update(tools.encode("ascii"))
+    for rel_path in stage.inputs:
+        hasher.update(f"{rel_path}={signatures.signature(rel_path)}\n".encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def load_state(path: Path) -> dict[str, str]:
+    if not path.exists():
+        return {}
+    try:
+        return json_codec.loads(path.read_bytes())
+    except json.JSONDecodeError:
+        print(f"[WARN] Ignoring unreadable build state: {path}")
+        return {}
+
+
+def select_stages(only: list[str] | None, skip: list[str] | None) -> list[Stage]:
+    names = {stage.name for stage in STAGES}
+    for name in (only or []) + (skip or []):
+        if name not in names:
+            raise ValueError(f"Unknown stage: {name}")
+    selected = [stage for stage in STAGES if not only or stage.name in only]
+    return [stage for stage in selected if not skip or stage.name not in skip]
+
+
+def run_stage(command: list[str], root: Path, log_path: Path) -> tuple[int, float]:
+    start = time.perf_counter()
+    with log_path.open("w", encoding="utf-8") as log:
+        result = subprocess.run(command, cwd=root, stdout=log, stderr=subprocess.STDOUT)
+    return result.returncode, time.perf_counter() - start
+
+
+def build_all(options: argparse.Namespace) -> int:
+    root = Path(options.root).resolve()
+    cache_dir = root / DEFAULT_CACHE_DIR
+    state_path = cache_dir / STATE_NAME
+    logs_dir = cache_dir / LOGS_DIR_NAME
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    metrics_dir = Path(options.metrics_dir).resolve() if options.metrics_dir else None
+    if metrics_dir is not None:
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        stages = select_stages(options.only, options.skip)
+    except ValueError as exc:
+        print(f"[ERROR] {exc}")
+        return 1
+    selected = {stage.name for stage in stages}
+    state = {} if options.force else load_state(state_path)
+    signatures = TreeSignatures(root)
+    tools = tools_signature()
+
+    # Stage name -> "ran", "skipped", "failed" or "blocked". Deps outside the
+    # selection count as done, so --only reuses whatever is already on disk.
+    status: dict[str, str] = {}
+    pending = list(stages)
+    running: dict[Future, tuple[Stage, str]] = {}
+    started = time.perf_counter()
+
+    def finished(name: str) -> bool:
+        return name not in selected or status.get(name) in ("ran", "skipped")
+
+    with ThreadPoolExecutor(max_workers=options.parallel) as executor:
+        while pending or running:
+            for stage in list(pending):
+                if any(status.get(dep) in ("failed", "blocked") for dep in stage.deps):
+                    pending.remove(stage)
+                    status[stage.name] = "blocked"
+                    print(f"[WARN] {stage.name}: blocked by a failed dependency")
+                    continue
+                if not all(finished(dep) for dep in stage.deps):
+                    continue
+                pending.remove(stage)
+                missing = [path for path in stage.requires if not (root / path).exists()]
+                if missing:
+                    status[stage.name] = "blocked"
+                    print(f"[WARN] {stage.name}: missing input {missing[0]}; stage not run")
+                    continue
+                command = stage.command(options, metrics_dir)
+                fingerprint = stage_fingerprint(stage, options, signatures, tools)
+                outputs_present = all((root / path).exists() for path in stage.outputs)
+                if state.get(stage.name) == fingerprint and outputs_present:
+                    status[stage.name] = "skipped"
+                    print(f"[INFO] {stage.name}: up to date")
+                    continue
+                if options.dry_run:
+                    status[stage.name] = "ran"
+                    print(f"[DRYRUN] {stage.name}: {' '.join(command[1:])}")
+                    continue
+                print(f"[INFO] {stage.name}: running")
+                log_path = logs_dir / f"{stage.name}.txt"
+                future = executor.submit(run_stage, command, root, log_path)
+                running[future] = (stage, command)
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, command = running.pop(future)
+                returncode, elapsed = future.result()
+                log_path = logs_dir / f"{stage.name}.txt"
+                if options.verbose:
+                    print(log_path.read_text(encoding="utf-8"), end="")
+                if returncode != 0:
+                    status[stage.name] = "failed"
+                    print(f"[ERROR] {stage.name}: exited with {returncode} after {elapsed:.2f}s (log: {log_path})")
+                    state.pop(stage.name, None)
+                    continue
+                status[stage.name] = "ran"
+                print(f"[INFO] {stage.name}: done in {elapsed:.2f}s")
+                # Record the post-run fingerprint so stages that rewrite their own
+                # inputs (rename, sync) are not rerun on the next build.
+                signatures.invalidate(stage.outputs)
+                state[stage.name] = stage_fingerprint(stage, options, signatures, tools)
+
+    if not options.dry_run:
+        write_text_if_changed(state_path, json_codec.dumps(state, sort_keys=True) + "\n")
+
+    counts = {key: list(status.values()).count(key) for key in ("ran", "skipped", "failed", "blocked")}
+    print(
+        f"[INFO] Build finished in {time.perf_counter() - started:.2f}s: "
+        f"{counts['ran']} ran, {counts['skipped']} up to date, "
+        f"{counts['failed']} failed, {counts['blocked']} blocked"
+    )
+    return 1 if counts["failed"] else 0
+
+
+def affected_stages(changed: set[str], stages: list[Stage]) -> list[Stage]:
+    names = {
+        stage.name
+        for stage in stages
+        if any(
+            path == rel_path or path.startswith(rel_path + "/")
+            for path in changed
+            for rel_path in stage.inputs
+        )
+    }
+    # STAGES is in dependency order, so one pass picks up everything downstream.
+    for stage in stages:
+        if any(dep in names for dep in stage.deps):
+            names.add(stage.name)
+    return [stage for stage in stages if stage.name in names]
+
+
+def watch(options: argparse.Namespace) -> int:
+    root = Path(options.root).resolve()
+    try:
+        stages = select_stages(options.only, options.skip)
+    except ValueError as exc:
+        print(f"[ERROR] {exc}")
+        return 1
+    # Build-cache files are written by the stages themselves; deps cover them.
+    cache_prefix = DEFAULT_CACHE_DIR.as_posix() + "/"
+    watched = [
+        rel_path
+        for stage in stages
+        for rel_path in stage.inputs
+        if not rel_path.startswith(cache_prefix)
+    ]
+
+    build_all(options)
+    options.force = False
+    watcher = open_watcher(root, watched, poll=options.poll)
+    print(f"[INFO] Watching {len(watcher.rel_paths)} paths ({watcher.name}); Ctrl+C to stop")
+    # Source edits saved while a rebuild was running, picked up on the next pass.
+    pending: set[str] = set()
+    try:
+        while True:
+            changed = pending | watcher.wait(0 if pending else options.interval)
+            pending = set()
+            if not changed:
+                continue
+            # Debounce: keep collecting until the tree has been quiet for a moment.
+            while True:
+                more = watcher.wait(options.debounce)
+                if not more:
+                    break
+                changed |= more
+            rerun = affected_stages(changed, stages)
+            sample = ", ".join(sorted(changed)[:3]) + (", ..." if len(changed) > 3 else "")
+            print(f"[INFO] {len(changed)} changed: {sample}")
+            if not rerun:
+                continue
+            build_all(argparse.Namespace(**{**vars(options), "only": [stage.name for stage in rerun], "skip": None}))
+            # Drop events caused by the stages' own writes but keep any other
+            # change that arrived during the build.
+            pending = watcher.drain([path for stage in rerun for path in stage.outputs])
+    except KeyboardInterrupt:
+        print("[INFO] Watch stopped")
+    finally:
+        watcher.close()
+    return 0
+
+
+def main() -> int:
+    stage_names = [stage.name for stage in STAGES]
+    parser = argparse.ArgumentParser(
+        description="Run every build tool in dependency order, in parallel where possible."
+    )
+    parser.add_argument("--root", default=".", help="Repository root (default: current folder).")
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Stages run at the same time (default: CPU count).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="--jobs passed to the tools that parse exports (0 = all CPUs, default: 1).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Pass --no-cache to the tools that parse exports.",
+    )
+    parser.add_argument(
+        "--link-mode",
+        choices=LINK_MODES,
+        default="copy",
+        help="--link-mode passed to the tools that stage icons and asset files.",
+    )
+    parser.add_argument(
+        "--locales",
+        nargs="+",
+        default=[],
+        help="--locales passed to the catalog builders (per-locale recipe, spell and item strings).",
+    )
+    parser.add_argument("--only", nargs="+", choices=stage_names, help="Run only these stages.")
+    parser.add_argument("--skip", nargs="+", choices=stage_names, help="Leave these stages out.")
+    parser.add_argument("--force", action="store_true", help="Run stages even if inputs are unchanged.")
+    parser.add_argument("--dry-run", action="store_true", help="Print the stages that would run.")
+    parser.add_argument("--verbose", action="store_true", help="Print each tool's output when it finishes.")
+    parser.add_argument(
+        "--metrics-dir",
+        help="Pass --metrics-out <dir>/<stage>.json to every stage.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After the build, rerun only the stages whose inputs change.",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="With --watch, poll file stats instead of using inotify.",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="With --watch, seconds between polls (default: 1.0).",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.2,
+        help="With --watch, quiet seconds to wait before rebuilding (default: 0.2).",
+    )
+    args = parser.parse_args()
+    if args.parallel < 1:
+        print("[ERROR] --parallel must be at least 1")
+        return 1
+    if args.watch:
+        if args.dry_run:
+            print("[ERROR] --watch cannot be combined with --dry-run")
+            return 1
+        return watch(args)
+    return build_all(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,293 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+from build_metrics import count
+
+
+DEFAULT_CACHE_DIR = Path(".build-cache")
+SCHEMA_VERSION = 1
+
+
+def file_digest(path: Path) -> str:
+    start = time.perf_counter()
+    hasher = hashlib.sha1()
+    size = 0
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            hasher.update(chunk)
+            size += len(chunk)
+    count("files_hashed")
+    count("bytes_hashed", size)
+    count("hash_seconds", time.perf_counter() - start)
+    return hasher.hexdigest()
+
+
+def stat_signature(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def task_path(task: Any) -> Path:
+    return task if isinstance(task, Path) else task[0]
+
+
+def task_key(task: Any) -> str:
+    return str(task) if isinstance(task, Path) else repr(task)
+
+
+class FileDigests:
+    def __init__(self, connection: sqlite3.Connection | None = None) -> None:
+        self.connection = connection
+        self._digests: dict[str, tuple[int, int, str]] = {}
+        self._dirty: set[str] = set()
+        self.hashed = 0
+        if connection is not None:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS file_digests ("
+                " path TEXT PRIMARY KEY,"
+                " mtime_ns INTEGER NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " digest TEXT NOT NULL)"
+            )
+            cursor = connection.execute("SELECT path, mtime_ns, size, digest FROM file_digests")
+            self._digests = {path: (mtime_ns, size, digest) for path, mtime_ns, size, digest in cursor}
+
+    def digest(self, path: Path) -> str:
+        key = os.path.abspath(path)
+        mtime_ns, size = stat_signature(path)
+        known = self._digests.get(key)
+        if known and known[0] == mtime_ns and known[1] == size:
+            return known[2]
+        digest = file_digest(path)
+        self.hashed += 1
+        self.remember(path, digest)
+        return digest
+
+    def remember(self, path: Path, digest: str) -> None:
+        key = os.path.abspath(path)
+        mtime_ns, size = stat_signature(path)
+        self._digests[key] = (mtime_ns, size, digest)
+        self._dirty.add(key)
+
+    def flush(self) -> None:
+        if self.connection is None or not self._dirty:
+            return
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO file_digests (path, mtime_ns, size, digest) VALUES (?, ?, ?, ?)",
+            [(key, *self._digests[key]) for key in self._dirty],
+        )
+        self._dirty.clear()
+
+
+class DirectoryIndex:
+    # Listings of a directory tree keyed by each folder's mtime. Adding,
+    # removing or renaming an entry bumps its folder's mtime, so an unchanged
+    # folder costs one stat instead of a listing.
+    def __init__(self, root: Path, connection: sqlite3.Connection | None = None) -> None:
+        self.root = root
+        self.key = os.path.abspath(root)
+        self.connection = connection
+        self._listings: dict[str, tuple[int, list[str], list[str]]] = {}
+        self._dirty: set[str] = set()
+        self._seen: set[str] = set()
+        self.listed = 0
+        self.reused = 0
+        if connection is not None:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS dir_listings ("
+                " root TEXT NOT NULL,"
+                " path TEXT NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " entries BLOB NOT NULL,"
+                " PRIMARY KEY (root, path))"
+            )
+            cursor = connection.execute(
+                "SELECT path, mtime_ns, entries FROM dir_listings WHERE root = ?", (self.key,)
+            )
+            self._listings = {
+                path: (mtime_ns, *pickle.loads(entries)) for path, mtime_ns, entries in cursor
+            }
+
+    def _listing(self, rel_dir: str) -> tuple[int, list[str], list[str]] | None:
+        path = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        known = self._listings.get(rel_dir)
+        if known and known[0] == mtime_ns:
+            self.reused += 1
+            return known
+        dirs: list[str] = []
+        files: list[str] = []
+        try:
+            scan = os.scandir(path)
+        except FileNotFoundError:
+            return None
+        with scan:
+            for entry in scan:
+                (dirs if entry.is_dir(follow_symlinks=False) else files).append(entry.name)
+        # A folder changed within the last two seconds may change again without
+        # a visible mtime bump on coarse filesystems; list it again next time.
+        if time.time_ns() - mtime_ns < 2_000_000_000:
+            mtime_ns = -1
+        listing = (mtime_ns, sorted(dirs), sorted(files))
+        self._listings[rel_dir] = listing
+        self._dirty.add(rel_dir)
+        self.listed += 1
+        count("dirs_listed")
+        return listing
+
+    def files(self) -> list[str]:
+        # Relative posix paths of every file under root.
+        found: list[str] = []
+        pending = [""]
+        self._seen.clear()
+        while pending:
+            rel_dir = pending.pop()
+            listing = self._listing(rel_dir)
+            if listing is None:
+                continue
+            self._seen.add(rel_dir)
+            prefix = f"{rel_dir}/" if rel_dir else ""
+            found.extend(prefix + name for name in listing[2])
+            pending.extend(prefix + name for name in reversed(listing[1]))
+        return found
+
+    def flush(self) -> None:
+        # Folders not reached by the last files() walk were deleted.
+        if self.connection is None or not self._seen:
+            return
+        gone = [path for path in self._listings if path not in self._seen]
+        if gone:
+            self.connection.executemany(
+                "DELETE FROM dir_listings WHERE root = ? AND path = ?",
+                [(self.key, path) for path in gone],
+            )
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO dir_listings (root, path, mtime_ns, entries) VALUES (?, ?, ?, ?)",
+            [
+                (
+                    self.key,
+                    path,
+                    self._listings[path][0],
+                    pickle.dumps(self._listings[path][1:], protocol=pickle.HIGHEST_PROTOCOL),
+                )
+                for path in self._dirty
+                if path in self._seen
+            ],
+        )
+        # Commit now: the connection is shared with BuildCache, which only
+        # commits on close, and parallel stages would wait on the write lock.
+        self.connection.commit()
+        self._dirty.clear()
+
+
+class BuildCache:
+    def __init__(self, cache_dir: Path) -> None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.path = cache_dir / "records.sqlite"
+        self.connection = sqlite3.connect(self.path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " mtime_ns INTEGER NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " digest TEXT NOT NULL,"
+            " payload BLOB NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self.digests = FileDigests(self.connection)
+        self._rows: dict[str, dict[str, tuple[int, int, str, bytes]]] = {}
+        self._pending: dict[tuple[str, str], tuple[int, int, str]] = {}
+        self._writes: list[tuple[str, str, int, int, str, bytes]] = []
+        self.hits = 0
+        self.misses = 0
+
+    def _namespace_rows(self, namespace: str) -> dict[str, tuple[int, int, str, bytes]]:
+        rows = self._rows.get(namespace)
+        if rows is None:
+            cursor = self.connection.execute(
+                "SELECT key, mtime_ns, size, digest, payload FROM records WHERE namespace = ?",
+                (f"{namespace}@{SCHEMA_VERSION}",),
+            )
+            rows = {key: (mtime_ns, size, digest, payload) for key, mtime_ns, size, digest, payload in cursor}
+            self._rows[namespace] = rows
+        return rows
+
+    def lookup(self, namespace: str, task: Any) -> tuple[str, Any] | None:
+        key = task_key(task)
+        path = task_path(task)
+        try:
+            mtime_ns, size = stat_signature(path)
+        except OSError:
+            return None
+        row = self._namespace_rows(namespace).get(key)
+        if row and row[0] == mtime_ns and row[1] == size:
+            self.hits += 1
+            count("cache_hits")
+            return pickle.loads(row[3])
+        digest = file_digest(path)
+        if row and row[2] == digest:
+            self.hits += 1
+            count("cache_hits")
+            self._writes.append((namespace, key, mtime_ns, size, digest, row[3]))
+            return pickle.loads(row[3])
+        self.misses += 1
+        count("cache_misses")
+        self._pending[(namespace, key)] = (mtime_ns, size, digest)
+        return None
+
+    def store(self, namespace: str, task: Any, output: str, result: Any) -> None:
+        key = task_key(task)
+        signature = self._pending.pop((namespace, key), None)
+        if signature is None:
+            return
+        payload = pickle.dumps((output, result), protocol=pickle.HIGHEST_PROTOCOL)
+        self._writes.append((namespace, key, *signature, payload))
+
+    def close(self) -> None:
+        self.digests.flush()
+        if self._writes:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO records (namespace, key, mtime_ns, size, digest, payload)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (f"{namespace}@{SCHEMA_VERSION}", key, mtime_ns, size, digest, payload)
+                    for namespace, key, mtime_ns, size, digest, payload in self._writes
+                ],
+            )
+            self._writes.clear()
+        self.connection.commit()
+        self.connection.close()
+
+
+def open_cache(cache_dir: str, enabled: bool = True) -> BuildCache | None:
+    if not enabled:
+        return None
+    return BuildCache(Path(cache_dir))
+
+
+def report_cache(cache: BuildCache | None) -> None:
+    if cache is not None:
+        print(f"[INFO] Cache hits: {cache.hits}, misses: {cache.misses} ({cache.path})")
+
+
+def add_cache_arguments(
+    parser,
+    cache_help: str = "the incremental parse cache",
+    no_cache_help: str = "Parse every export instead of reusing cached records.",
+) -> None:
+    parser.add_argument(
+        "--cache-dir",
+        default=str(DEFAULT_CACHE_DIR),
+        help=f"Directory for {cache_help} (default: {DEFAULT_CACHE_DIR}).",
+    )
+    parser.add_argument("--no-cache", action="store_true", help=no_cache_help)
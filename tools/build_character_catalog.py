@@ -1,11 +1,13 @@
 import argparse
-import json
 from pathlib import Path
 from typing import Any
 
+from build_metrics import add_metrics_argument, load_json_file, write_metrics
+from catalog_output import add_output_arguments, write_catalog
+
 
 def load_json(path: Path) -> object:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return load_json_file(path)
 
 
 def extract_rows(data: object) -> list[str]:
@@ -35,6 +37,8 @@ def main() -> int:
         default="docs/charactereditor/data/character_catalog.json",
         help="Output JSON path for the catalog.",
     )
+    add_output_arguments(parser)
+    add_metrics_argument(parser)
     args = parser.parse_args()
 
     source_dir = Path(args.source)
@@ -64,12 +68,11 @@ def main() -> int:
         data = load_json(path)
         catalog[key] = extract_rows(data)
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(
-        json.dumps(catalog, indent=2, ensure_ascii=True) + "\n",
-        encoding="utf-8",
-    )
-    print(f"[INFO] Wrote catalog: {output_path}")
+    if write_catalog(output_path, catalog, args.compact, args.precompress):
+        print(f"[INFO] Wrote catalog: {output_path}")
+    else:
+        print(f"[INFO] Catalog unchanged: {output_path}")
+    write_metrics(args.metrics_out, "build_character_catalog")
     return 0
 
 
@@ -1,7 +1,10 @@
-import json
+import argparse
 import os
 from pathlib import Path
 
+from build_metrics import add_metrics_argument, load_json_file, phase, write_metrics
+from catalog_output import add_output_arguments, write_catalog
+
 
 ROOT = Path(__file__).resolve().parents[1]
 DOCS_ASSETS_DIR = ROOT / "docs" / "DWE" / "Assets"
@@ -10,6 +13,9 @@ OUTPUT_FILES = [
     ROOT / "web" / "data" / "catalog.json",
     ROOT / "docs" / "data" / "catalog.json",
 ]
+SEARCH_INDEX_NAME = "catalog_search.json"
+SEARCH_INDEX_VERSION = 1
+SEARCH_GRAM_SIZE = 3
 
 TAB_LABELS = {
     "BagTab": "Bag Items",
@@ -23,23 +29,73 @@ def to_web_path(path: Path, base_root: Path) -> str:
     return path.relative_to(base_root).as_posix()
 
 
-def build_catalog():
-    assets_root = DOCS_ASSETS_DIR if DOCS_ASSETS_DIR.exists() else ASSETS_DIR
-    base_root = ROOT / "docs" if assets_root == DOCS_ASSETS_DIR else ROOT
+def search_fields(item: dict) -> list[str]:
+    return [(item.get("name") or "").lower(), (item.get("category") or "").lower()]
+
+
+def add_posting(postings: dict[str, list[int]], key: str, position: int) -> None:
+    ids = postings.setdefault(key, [])
+    if not ids or ids[-1] != position:
+        ids.append(position)
+
+
+@phase("extract")
+def build_tab_search_index(items: list[dict]) -> dict:
+    # Positions index into the tab's item list. Grams cover every substring up to
+    # SEARCH_GRAM_SIZE characters, so short queries are a single lookup and longer
+    # ones only re-check the items shared by all of their grams. Grams are cut
+    # per code point; docs/app.js splits queries with Array.from to match.
+    categories: dict[str, list[int]] = {}
+    grams: dict[str, list[int]] = {}
+    for position, item in enumerate(items):
+        add_posting(categories, (item.get("category") or "").split("/")[0], position)
+        for field in search_fields(item):
+            for size in range(1, SEARCH_GRAM_SIZE + 1):
+                for start in range(len(field) - size + 1):
+                    add_posting(grams, field[start : start + size], position)
+    return {
+        "count": len(items),
+        "categories": dict(sorted(categories.items())),
+        "grams": dict(sorted(grams.items())),
+    }
+
+
+def build_search_index(catalog: dict) -> dict:
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "gramSize": SEARCH_GRAM_SIZE,
+        "tabs": {
+            key: build_tab_search_index(tab["items"])
+            for key, tab in catalog["tabs"].items()
+        },
+    }
+
+
+def build_catalog(
+    compact: bool = False,
+    precompress: bool = False,
+    assets_root: Path | None = None,
+    output_files: list[Path] | None = None,
+):
+    if assets_root is None:
+        assets_root = DOCS_ASSETS_DIR if DOCS_ASSETS_DIR.exists() else ASSETS_DIR
+    # Web paths are relative to the folder that holds DWE/Assets.
+    base_root = assets_root.parent.parent
     catalog = {"tabs": {}}
     for tab_name in ["BagTab", "RuneTab", "AmmoTab", "QuestTab"]:
         tab_dir = assets_root / tab_name
+        with phase("scan"):
+            tab_files = [
+                Path(root) / filename
+                for root, _, files in os.walk(tab_dir)
+                for filename in files
+                if filename.lower().endswith(".json") and filename.lower() != "desktop.ini"
+            ]
         items = []
-        for root, _, files in os.walk(tab_dir):
-            for filename in files:
-                if not filename.lower().endswith(".json"):
-                    continue
-                file_path = Path(root) / filename
-                if file_path.name.lower() == "desktop.ini":
-                    continue
-                with file_path.open("r", encoding="utf-8") as handle:
-                    data = json.load(handle)
-
+        for file_path in tab_files:
+            with phase("parse"):
+                data = load_json_file(file_path)
+            with phase("extract"):
                 icon_name = data.get("icon") or file_path.with_suffix(".png").name
                 icon_path = file_path.parent / icon_name
                 rel_dir = file_path.parent.relative_to(tab_dir)
@@ -68,18 +124,54 @@ def build_catalog():
 
                 items.append(item)
 
-        items.sort(key=lambda item: (item.get("category") or "", item.get("name") or ""))
+        items.sort(
+            key=lambda item: (
+                item.get("category") or "",
+                item.get("name") or "",
+                item["sourcePath"],
+            )
+        )
         key = tab_name.replace("Tab", "").lower()
         catalog["tabs"][key] = {
             "label": TAB_LABELS.get(tab_name, tab_name),
             "items": items,
         }
 
-    for output_file in OUTPUT_FILES:
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with output_file.open("w", encoding="utf-8") as handle:
-            json.dump(catalog, handle, indent=2)
+    search_index = build_search_index(catalog)
+    for output_file in output_files or OUTPUT_FILES:
+        write_catalog(
+            output_file, catalog, compact, precompress, trailing_newline=False
+        )
+        write_catalog(
+            output_file.with_name(SEARCH_INDEX_NAME),
+            search_index,
+            compact=True,
+            precompress=precompress,
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Build the item editor catalog from DWE asset JSON files."
+    )
+    parser.add_argument(
+        "--assets",
+        help="DWE/Assets folder to read (default: docs/DWE/Assets, else DWE/Assets).",
+    )
+    parser.add_argument(
+        "--output",
+        action="append",
+        help="Catalog output path; repeat for several (default: web/data and docs/data).",
+    )
+    add_output_arguments(parser)
+    add_metrics_argument(parser)
+    args = parser.parse_args()
+    assets_root = Path(args.assets).resolve() if args.assets else None
+    output_files = [Path(path) for path in args.output] if args.output else None
+    build_catalog(args.compact, args.precompress, assets_root, output_files)
+    write_metrics(args.metrics_out, "build_dwe_catalog")
+    return 0
 
 
 if __name__ == "__main__":
-    build_catalog()
+    raise SystemExit(main())
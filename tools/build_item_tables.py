@@ -1,10 +1,24 @@
 import argparse
 import json
 import re
-import shutil
 from pathlib import Path
 from typing import Optional, Tuple
 
+import json_codec
+from asset_index import AssetIndex, report_assets
+from build_cache import add_cache_arguments, open_cache, report_cache
+from build_metrics import add_metrics_argument, phase, write_metrics
+from content_scanner import content_files
+from export_reader import load_export_prefix
+from file_ops import add_link_arguments, place_file, write_text_if_changed
+from parse_pool import add_parse_arguments, parse_files
+from records import TextRef
+from string_tables import add_locale_arguments, locale_path, open_locales, report_locale, text_ref
+
+
+# (tag, item JSON, icon ObjectPath, internal name, (name ref, description ref))
+ExtractedItem = Tuple[str, dict, str, str, Tuple[Optional[TextRef], Optional[TextRef]]]
+
 
 def sanitize_tag(tag: str) -> str:
     tag = tag.replace("ItemFilter.", "")
@@ -12,19 +26,23 @@ def sanitize_tag(tag: str) -> str:
     return re.sub(r"[^A-Za-z0-9._-]+", "_", tag)
 
 
-def resolve_icon_path(object_path: str, content_root: Path) -> Tuple[str, Optional[Path]]:
+def resolve_icon_path(object_path: str, assets: AssetIndex) -> Tuple[str, Optional[Path]]:
     if not object_path:
         return "", None
     cleaned = object_path.replace("RSDragonwilds/Content/", "")
     cleaned = cleaned.rstrip(".0")
     rel_path = Path(cleaned + ".png")
-    abs_path = content_root / rel_path
-    return cleaned, abs_path if abs_path.exists() else None
+    return cleaned, assets.find(rel_path)
+
+
+def has_persistence_id(entries: list) -> bool:
+    props = entries[-1].get("Properties", {}) if isinstance(entries[-1], dict) else None
+    return isinstance(props, dict) and bool(props.get("PersistenceID"))
 
 
 def load_item_data(file_path: Path) -> dict | None:
     try:
-        data = json.loads(file_path.read_text(encoding="utf-8"))
+        data = load_export_prefix(file_path, has_persistence_id)
     except json.JSONDecodeError as exc:
         print(f"[WARN] JSON parse failed: {file_path} ({exc})")
         return None
@@ -41,10 +59,9 @@ def load_item_data(file_path: Path) -> dict | None:
 def extract_item(
     entry: dict,
     source_file: Path,
-    content_root: Path,
     requires_vital_shield: bool,
     equipment_slot: str | None,
-) -> Optional[Tuple[str, dict, Optional[Path], str]]:
+) -> Optional[ExtractedItem]:
     props = entry.get("Properties", {})
     tags = props.get("ItemFilterTags") or []
     item_filter_tags = [t for t in tags if t.startswith("ItemFilter.")]
@@ -57,14 +74,19 @@ def extract_item(
         tag = category_tag if category_tag else "Misc"
 
     name = props.get("Name", {}).get("SourceString") or ""
-    description = props.get("Description", {}).get("SourceString") or ""
+    name_ref = text_ref(props.get("Name")) if name else None
+    description_text = props.get("Description", {})
+    description = description_text.get("SourceString") or ""
     if not description:
-        description = props.get("FlavourText", {}).get("SourceString") or ""
+        description_text = props.get("FlavourText", {})
+        description = description_text.get("SourceString") or ""
     if not description:
         buff_datas = props.get("BuffDatas") or []
         if isinstance(buff_datas, list) and buff_datas:
-            buff_desc = buff_datas[0].get("Description", {}).get("SourceString") or ""
+            description_text = buff_datas[0].get("Description", {})
+            buff_desc = description_text.get("SourceString") or ""
             description = buff_desc
+    description_ref = text_ref(description_text) if description else None
     persistence_id = props.get("PersistenceID") or ""
     internal_name = props.get("InternalName") or ""
     max_stack = props.get("MaxStackSize")
@@ -75,8 +97,6 @@ def extract_item(
     power_level = props.get("PowerLevel")
     weight = props.get("Weight")
 
-    _icon_source, icon_abs = resolve_icon_path(icon_obj, content_root)
-
     item = {
         "ItemData": persistence_id,
         "name": name,
@@ -96,7 +116,17 @@ def extract_item(
         item["PowerLevel"] = power_level
     if weight is not None:
         item["Weight"] = weight
-    return tag, item, icon_abs, icon_obj, internal_name
+    return tag, item, icon_obj, internal_name, (name_ref, description_ref)
+
+
+def read_item(
+    task: Tuple[Path, bool, str | None],
+) -> Optional[ExtractedItem]:
+    file_path, requires_vital_shield, equipment_slot = task
+    entry = load_item_data(file_path)
+    if not entry:
+        return None
+    return extract_item(entry, file_path, requires_vital_shield, equipment_slot)
 
 
 def normalize_plan_name(name: str) -> str:
@@ -116,6 +146,17 @@ def main() -> int:
     )
     parser.add_argument("--table", required=True, help="Output table directory.")
     parser.add_argument("--content-root", default=".", help="Workspace content root.")
+    add_parse_arguments(parser)
+    add_cache_arguments(parser)
+    add_link_arguments(parser)
+    add_locale_arguments(parser)
+    parser.add_argument(
+        "--locale-output",
+        default="docs/data/item_strings.json",
+        help="With --locales, per-locale item names and descriptions keyed by ItemData "
+        "are written to <stem>.<locale>.json (default: docs/data/item_strings.json).",
+    )
+    add_metrics_argument(parser)
     args = parser.parse_args()
 
     source_dirs = [Path(source) for source in args.source]
@@ -129,37 +170,30 @@ def main() -> int:
 
     table_dir.mkdir(parents=True, exist_ok=True)
 
-    groups: dict[str, dict] = {}
+    # Items are written as they are extracted; only the group names are kept.
+    groups: set[str] = set()
+    # With --locales: (ItemData, name, name ref, description, description ref, plan).
+    item_texts: list[tuple[str, str, Optional[TextRef], str, Optional[TextRef], bool]] = []
     icon_copy_count = 0
     missing_icon_count = 0
     placeholder_icon_count = 0
     total_items = 0
     item_json_count = 0
+    item_json_unchanged = 0
     placeholder_icon = Path("docs") / "DWE" / "Assets" / "Placeholders" / "placeholder_icon.png"
 
+    @phase("extract")
     def add_item_from_file(
         file_path: Path,
-        requires_vital_shield: bool = False,
-        equipment_slot: str | None = None,
+        extracted: Optional[ExtractedItem],
         group_override: str | None = None,
     ) -> None:
         nonlocal icon_copy_count, missing_icon_count, placeholder_icon_count
-        nonlocal total_items, item_json_count
-        if "_MeshData" in file_path.name:
-            return
-        entry = load_item_data(file_path)
-        if not entry:
-            return
-        extracted = extract_item(
-            entry,
-            file_path,
-            content_root,
-            requires_vital_shield,
-            equipment_slot,
-        )
+        nonlocal total_items, item_json_count, item_json_unchanged
         if not extracted:
             return
-        tag, item, icon_abs, icon_obj, internal_name = extracted
+        tag, item, icon_obj, internal_name, (name_ref, description_ref) = extracted
+        _icon_source, icon_abs = resolve_icon_path(icon_obj, assets)
         group_key = group_override or sanitize_tag(tag)
 
         if group_key == "Plans" and item.get("name"):
@@ -170,17 +204,26 @@ def main() -> int:
         elif icon_abs:
             item["icon"] = icon_abs.name
 
-        if group_key not in groups:
-            groups[group_key] = {"items": []}
-        groups[group_key]["items"].append(item)
+        groups.add(group_key)
         total_items += 1
+        if locales and item["ItemData"]:
+            item_texts.append(
+                (
+                    item["ItemData"],
+                    item["name"],
+                    name_ref,
+                    item["description"],
+                    description_ref,
+                    group_key == "Plans",
+                )
+            )
 
         dest_dir = table_dir / group_key
         dest_dir.mkdir(parents=True, exist_ok=True)
 
         if icon_abs:
             icon_name = item["icon"] if item["icon"] else icon_abs.name
-            shutil.copy2(icon_abs, dest_dir / icon_name)
+            place_file(icon_abs, dest_dir / icon_name, args.link_mode)
             icon_copy_count += 1
             if internal_name:
                 json_name = f"{internal_name}.json"
@@ -197,43 +240,81 @@ def main() -> int:
             else:
                 json_name = f"{item['ItemData']}.json"
             if placeholder_icon.exists():
-                shutil.copy2(placeholder_icon, dest_dir / item["icon"])
+                place_file(placeholder_icon, dest_dir / item["icon"], args.link_mode)
                 placeholder_icon_count += 1
             else:
                 print(f"[WARN] Placeholder icon missing: {placeholder_icon}")
 
         json_path = dest_dir / json_name
-        json_path.write_text(json.dumps(item, indent=2, ensure_ascii=True), encoding="utf-8")
-        item_json_count += 1
+        with phase("serialize"):
+            item_text = json_codec.dumps(item)
+        if write_text_if_changed(json_path, item_text):
+            item_json_count += 1
+        else:
+            item_json_unchanged += 1
 
-    for source_dir in source_dirs:
-        for file_path in sorted(source_dir.rglob("ITEM_*.json")):
-            requires_vital_shield = "Gameplay" in file_path.parts and "Equipment" in file_path.parts
-            equipment_slot = None
-            if requires_vital_shield:
-                equipment_root = Path("Gameplay") / "Character" / "Player" / "Equipment"
-                for slot in ("Body", "Cape", "Head", "Jewellery", "Legs"):
-                    if equipment_root / slot in file_path.parents:
-                        equipment_slot = slot
-                        break
-            add_item_from_file(
-                file_path,
-                requires_vital_shield=requires_vital_shield,
-                equipment_slot=equipment_slot,
+    def add_items(
+        tasks: list[Tuple[Path, bool, str | None]],
+        group_override: str | None = None,
+    ) -> None:
+        tasks = [task for task in tasks if "_MeshData" not in task[0].name]
+        records = parse_files(read_item, tasks, args.jobs, cache, "item_tables.item.v2")
+        for task, extracted in records:
+            add_item_from_file(task[0], extracted, group_override)
+
+    cache = open_cache(args.cache_dir, not args.no_cache)
+    try:
+        locales = open_locales(args, content_root, cache)
+        assets = AssetIndex(content_root, cache)
+        item_tasks = []
+        for source_dir in source_dirs:
+            for file_path in content_files(source_dir, "ITEM_", cache):
+                requires_vital_shield = "Gameplay" in file_path.parts and "Equipment" in file_path.parts
+                equipment_slot = None
+                if requires_vital_shield:
+                    equipment_root = Path("Gameplay") / "Character" / "Player" / "Equipment"
+                    for slot in ("Body", "Cape", "Head", "Jewellery", "Legs"):
+                        if equipment_root / slot in file_path.parents:
+                            equipment_slot = slot
+                            break
+                item_tasks.append((file_path, requires_vital_shield, equipment_slot))
+        add_items(item_tasks)
+
+        plans_root = content_root / "Gameplay" / "Items" / "Consumables" / "Plans"
+        vestiges_root = content_root / "Gameplay" / "Items" / "Consumables" / "Vestiges"
+        if plans_root.exists():
+            plan_files = content_files(plans_root, "DA_Consumable_", cache)
+            add_items(
+                [(file_path, False, None) for file_path in plan_files],
+                group_override="Plans",
+            )
+        else:
+            print(f"[WARN] Plans folder not found: {plans_root}")
+        if vestiges_root.exists():
+            vestige_files = content_files(vestiges_root, "DA_Consumable_", cache)
+            add_items(
+                [(file_path, False, None) for file_path in vestige_files],
+                group_override="Vestiges",
             )
+        else:
+            print(f"[WARN] Vestiges folder not found: {vestiges_root}")
+        report_assets(assets)
+    finally:
+        report_cache(cache)
+        if cache is not None:
+            cache.close()
 
-    plans_root = content_root / "Gameplay" / "Items" / "Consumables" / "Plans"
-    vestiges_root = content_root / "Gameplay" / "Items" / "Consumables" / "Vestiges"
-    if plans_root.exists():
-        for file_path in sorted(plans_root.rglob("DA_Consumable_*.json")):
-            add_item_from_file(file_path, group_override="Plans")
-    else:
-        print(f"[WARN] Plans folder not found: {plans_root}")
-    if vestiges_root.exists():
-        for file_path in sorted(vestiges_root.rglob("DA_Consumable_*.json")):
-            add_item_from_file(file_path, group_override="Vestiges")
-    else:
-        print(f"[WARN] Vestiges folder not found: {vestiges_root}")
+    for strings in locales:
+        path = locale_path(Path(args.locale_output), strings.locale)
+        catalog = {}
+        for item_data, name, name_ref, description, description_ref, plan in item_texts:
+            name = strings.text(name_ref, name)
+            catalog[item_data] = {
+                "name": normalize_plan_name(name) if plan else name,
+                "description": strings.text(description_ref, description),
+            }
+        write_text_if_changed(path, json_codec.dumps(catalog))
+        report_locale(strings, path)
 
     print("[INFO] Sources:")
     for source_dir in source_dirs:
@@ -241,9 +322,11 @@ def main() -> int:
     print(f"[INFO] Groups: {len(groups)}")
     print(f"[INFO] Items processed: {total_items}")
     print(f"[INFO] Item JSON written: {item_json_count}")
+    print(f"[INFO] Item JSON unchanged: {item_json_unchanged}")
     print(f"[INFO] Icons copied: {icon_copy_count}")
     print(f"[INFO] Icons missing: {missing_icon_count}")
     print(f"[INFO] Placeholder icons copied: {placeholder_icon_count}")
+    write_metrics(args.metrics_out, "build_item_tables")
     return 0
 
 
@@ -0,0 +1,146 @@
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+import json_codec
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def cpu_time() -> float:
+    # Includes reaped worker processes, so pool parsing shows up in the parent.
+    total = time.process_time()
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def peak_rss(who: str = "self") -> int | None:
+    if resource is None:
+        return None
+    target = resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN
+    rss = resource.getrusage(target).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+_started = (time.perf_counter(), cpu_time())
+_phases: dict[str, dict[str, Any]] = {}
+_stack: list[list[Any]] = []
+_totals: dict[str, float] = {}
+
+
+def _phase_stats(name: str) -> dict[str, Any]:
+    stats = _phases.get(name)
+    if stats is None:
+        stats = {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "counters": {}}
+        _phases[name] = stats
+    return stats
+
+
+def _charge(frame: list[Any], wall: float, cpu: float) -> None:
+    stats = _phase_stats(frame[0])
+    stats["wall_seconds"] += wall - frame[1]
+    stats["cpu_seconds"] += cpu - frame[2]
+    frame[1] = wall
+    frame[2] = cpu
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    # Phases nest; time is charged to the innermost one, so the report adds up.
+    if _stack and _stack[-1][0] == name:
+        yield
+        return
+    wall, cpu = time.perf_counter(), cpu_time()
+    if _stack:
+        _charge(_stack[-1], wall, cpu)
+    frame = [name, wall, cpu]
+    _stack.append(frame)
+    _phase_stats(name)["calls"] += 1
+    try:
+        yield
+    finally:
+        wall, cpu = time.perf_counter(), cpu_time()
+        _charge(frame, wall, cpu)
+        _stack.pop()
+        if _stack:
+            _stack[-1][1] = wall
+            _stack[-1][2] = cpu
+        rss = peak_rss()
+        if rss is not None:
+            stats = _phase_stats(name)
+            stats["peak_rss_bytes"] = max(stats.get("peak_rss_bytes", 0), rss)
+
+
+def count(name: str, amount: float = 1) -> None:
+    counters = _phase_stats(_stack[-1][0] if _stack else "other")["counters"]
+    counters[name] = counters.get(name, 0) + amount
+    _totals[name] = _totals.get(name, 0) + amount
+
+
+def snapshot_counters() -> dict[str, float]:
+    return dict(_totals)
+
+
+def counters_since(before: dict[str, float]) -> dict[str, float]:
+    return {
+        name: value - before.get(name, 0)
+        for name, value in _totals.items()
+        if value != before.get(name, 0)
+    }
+
+
+def merge_counters(counters: dict[str, float]) -> None:
+    for name, amount in counters.items():
+        count(name, amount)
+
+
+def load_json_file(path: Path) -> Any:
+    data = path.read_bytes()
+    count("files_read")
+    count("bytes_read", len(data))
+    start = time.perf_counter()
+    try:
+        return json_codec.loads(data)
+    finally:
+        count("json_parse_seconds", time.perf_counter() - start)
+
+
+def build_report(tool: str) -> dict[str, Any]:
+    wall = time.perf_counter() - _started[0]
+    cpu = cpu_time() - _started[1]
+    phases = {name: dict(stats) for name, stats in sorted(_phases.items())}
+    attributed = sum(stats["wall_seconds"] for stats in _phases.values())
+    return {
+        "tool": tool,
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "unattributed_wall_seconds": max(0.0, wall - attributed),
+        "peak_rss_bytes": peak_rss(),
+        "peak_rss_children_bytes": peak_rss("children"),
+        "counters": dict(sorted(_totals.items())),
+        "phases": phases,
+    }
+
+
+def write_metrics(path: str | None, tool: str) -> None:
+    if not path:
+        return
+    metrics_path = Path(path)
+    metrics_path.parent.mkdir(parents=True, exist_ok=True)
+    metrics_path.write_text(json_codec.dumps(build_report(tool)) + "\n", encoding="utf-8")
+    print(f"[INFO] Metrics: {metrics_path}")
+
+
+def add_metrics_argument(parser) -> None:
+    parser.add_argument(
+        "--metrics-out",
+        help="Write per-phase timings and counters to this JSON file.",
+    )
@@ -1,15 +1,10 @@
 import argparse
-import hashlib
-import shutil
 from pathlib import Path
 
-
-def file_hash(path: Path) -> str:
-    hasher = hashlib.sha1()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            hasher.update(chunk)
-    return hasher.hexdigest()
+from build_cache import file_digest
+from build_metrics import add_metrics_argument, phase, write_metrics
+from content_scanner import content_files
+from file_ops import place_file
 
 
 def sanitize_suffix(value: str) -> str:
@@ -33,7 +28,7 @@ def resolve_destination(
     if not dest_path.exists():
         return dest_path, "flat"
 
-    if file_hash(dest_path) == file_hash(source_file):
+    if file_digest(dest_path) == file_digest(source_file):
         return dest_path, "duplicate-skip"
 
     if overwrite:
@@ -73,13 +68,14 @@ def copy_recipes(
             return 1
 
     for source_dir in source_dirs:
-        recipe_files = sorted(source_dir.rglob("RECIPE_*.json"))
+        recipe_files = content_files(source_dir, "RECIPE_")
         print(f"[INFO] Scanning: {source_dir} ({len(recipe_files)} matches)")
         for recipe_path in recipe_files:
             total_found += 1
-            dest_path, mode = resolve_destination(
-                recipe_path, source_dir, output_dir, flat, overwrite
-            )
+            with phase("extract"):
+                dest_path, mode = resolve_destination(
+                    recipe_path, source_dir, output_dir, flat, overwrite
+                )
 
             if mode == "duplicate-skip":
                 total_skipped += 1
@@ -97,7 +93,7 @@ def copy_recipes(
 
             if not dry_run:
                 dest_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(recipe_path, dest_path)
+                place_file(recipe_path, dest_path)
             total_copied += 1
             print(f"[INFO] {action}: {recipe_path} -> {dest_path}")
 
@@ -143,18 +139,22 @@ def main() -> int:
         action="store_true",
         help="Print actions without copying files.",
     )
+    add_metrics_argument(parser)
     args = parser.parse_args()
 
     source_dirs = [Path(source) for source in args.source]
     output_dir = Path(args.output)
 
-    return copy_recipes(
+    result = copy_recipes(
         source_dirs=source_dirs,
         output_dir=output_dir,
         flat=args.flat,
         overwrite=args.overwrite,
         dry_run=args.dry_run,
     )
+    if result == 0:
+        write_metrics(args.metrics_out, "build_recipe_catalog")
+    return result
 
 
 if __name__ == "__main__":
@@ -1,31 +1,31 @@
 import argparse
-import hashlib
-import json
 import re
 from pathlib import Path
 from typing import Any
 
-
-ITEM_ID_PATTERN = re.compile(r"(ITEM_[A-Za-z0-9_]+|DA_[A-Za-z0-9_]+)")
-
-
-def load_json(path: Path) -> list[dict[str, Any]] | None:
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as exc:
-        print(f"[WARN] JSON parse failed: {path} ({exc})")
-        return None
-    if not isinstance(data, list) or not data:
-        print(f"[WARN] Unexpected JSON root: {path}")
-        return None
-    return data
+from asset_index import AssetIndex, report_assets
+from build_cache import DEFAULT_CACHE_DIR, BuildCache, add_cache_arguments, open_cache, report_cache
+from build_metrics import add_metrics_argument, phase, write_metrics
+from catalog_categories import recipe_category
+from catalog_output import add_output_arguments, write_catalog
+from content_scanner import content_files
+from export_reader import extract_entry, has_properties, load_export
+from file_ops import add_link_arguments
+from icon_store import IconStore
+from item_index import load_item_index
+from parse_pool import add_parse_arguments, parse_files
+from recipe_bom import write_recipe_bom
+from records import IngredientRef, ItemRecord, RecipeRecord, resolve_refs
+from string_tables import (
+    LocaleStrings,
+    add_locale_arguments,
+    locale_path,
+    open_locales,
+    report_locale,
+)
 
 
-def extract_entry(data: list[dict[str, Any]]) -> dict[str, Any] | None:
-    for entry in data:
-        if isinstance(entry, dict) and entry.get("Properties"):
-            return entry
-    return data[0] if data else None
+ITEM_ID_PATTERN = re.compile(r"(ITEM_[A-Za-z0-9_]+|DA_[A-Za-z0-9_]+)")
 
 
 def resolve_object_path(object_path: str) -> Path | None:
@@ -36,27 +36,6 @@ def resolve_object_path(object_path: str) -> Path | None:
     return Path(cleaned + ".png")
 
 
-def file_hash(path: Path) -> str:
-    hasher = hashlib.sha1()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            hasher.update(chunk)
-    return hasher.hexdigest()
-
-
-def copy_icon(icon_abs: Path, icons_dir: Path) -> str:
-    icons_dir.mkdir(parents=True, exist_ok=True)
-    dest = icons_dir / icon_abs.name
-    if dest.exists():
-        if file_hash(dest) == file_hash(icon_abs):
-            return dest.name
-        base = icon_abs.stem
-        suffix = file_hash(icon_abs)[:8]
-        dest = icons_dir / f"{base}_{suffix}{icon_abs.suffix}"
-    dest.write_bytes(icon_abs.read_bytes())
-    return dest.name
-
-
 def extract_item_id(item_data: dict[str, Any]) -> str:
     object_name = item_data.get("ObjectName", "")
     object_path = item_data.get("ObjectPath", "")
@@ -68,140 +47,149 @@ def extract_item_id(item_data: dict[str, Any]) -> str:
     return ""
 
 
+@phase("extract")
 def build_item_lookup(
     source_dir: Path,
-    content_root: Path,
-    icons_dir: Path,
+    assets: AssetIndex,
+    icons: IconStore,
     placeholder_icon: str,
-) -> dict[str, dict[str, Any]]:
-    lookup: dict[str, dict[str, Any]] = {}
+    jobs: int = 1,
+    cache: BuildCache | None = None,
+    index_dir: Path = DEFAULT_CACHE_DIR,
+) -> dict[str, ItemRecord]:
+    lookup: dict[str, ItemRecord] = {}
     icon_missing = 0
     item_count = 0
 
-    for pattern in ("ITEM_*.json", "DA_*.json"):
-        for file_path in sorted(source_dir.rglob(pattern)):
-            data = load_json(file_path)
-            if not data:
-                continue
-            entry = extract_entry(data)
-            if not entry:
-                continue
-            props = entry.get("Properties", {})
-            item_id = entry.get("Name") or file_path.stem
-            display_name = (
-                props.get("Name", {}).get("SourceString")
-                or props.get("Name", {}).get("LocalizedString")
-                or props.get("InternalName")
-                or item_id
-            )
-            icon_obj = props.get("Icon", {}).get("ObjectPath") or ""
-            icon_rel = resolve_object_path(icon_obj)
-            icon_file = ""
-            if icon_rel:
-                icon_abs = content_root / icon_rel
-                if icon_abs.exists():
-                    icon_file = copy_icon(icon_abs, icons_dir)
-                else:
-                    icon_missing += 1
-                    print(f"[WARN] Icon not found: {file_path} -> {icon_obj}")
+    for file_path, record in load_item_index(source_dir, jobs, cache, index_dir):
+        icon_obj = record.icon_object
+        icon_rel = resolve_object_path(icon_obj)
+        icon_file = ""
+        if icon_rel:
+            icon_abs = assets.find(icon_rel)
+            if icon_abs:
+                icon_file = icons.add(icon_abs)
             else:
                 icon_missing += 1
-                print(f"[WARN] Icon missing: {file_path}")
+                print(f"[WARN] Icon not found: {file_path} -> {icon_obj}")
+        else:
+            icon_missing += 1
+            print(f"[WARN] Icon missing: {file_path}")
 
-            if not icon_file and placeholder_icon:
-                icon_file = placeholder_icon
+        if not icon_file and placeholder_icon:
+            icon_file = placeholder_icon
 
-            lookup[item_id] = {
-                "item_id": item_id,
-                "display_name": display_name,
-                "persistence_id": props.get("PersistenceID") or "",
-                "internal_name": props.get("InternalName") or "",
-                "icon": icon_file,
-            }
-            item_count += 1
+        record.icon = icon_file
+        lookup[record.item_id] = record
+        item_count += 1
 
     print(f"[INFO] Items indexed: {item_count}")
     print(f"[INFO] Missing item icons: {icon_missing}")
     return lookup
 
 
+def read_recipe(file_path: Path) -> RecipeRecord | None:
+    data = load_export(file_path, has_properties)
+    if not data:
+        return None
+    entry = extract_entry(data)
+    if not entry:
+        return None
+    props = entry.get("Properties", {})
+
+    def item_refs(items: list[dict[str, Any]]) -> list[IngredientRef]:
+        return [
+            IngredientRef(extract_item_id(item.get("ItemData", {}) or {}), item.get("Count", 1))
+            for item in items
+        ]
+
+    return RecipeRecord(
+        name=entry.get("Name", ""),
+        internal_name=props.get("InternalName", ""),
+        persistence_id=props.get("PersistenceID", ""),
+        row_name=props.get("OnCraftXpEvent", {}).get("RowName", ""),
+        items_consumed=item_refs(props.get("ItemsConsumed", []) or []),
+        items_created=item_refs(props.get("ItemsCreated", []) or []),
+    )
+
+
+def ingredient_json(ref: IngredientRef, strings: LocaleStrings | None = None) -> dict[str, Any]:
+    return {
+        "item_id": ref.item_id,
+        "count": ref.count,
+        "display_name": (
+            strings.item_name(ref.item, ref.display_name) if strings else ref.display_name
+        ),
+        "persistence_id": ref.persistence_id,
+        "icon": ref.icon,
+    }
+
+
+def recipe_json(recipe: RecipeRecord, strings: LocaleStrings | None = None) -> dict[str, Any]:
+    display_name = recipe.display_name
+    if strings is not None:
+        display_name = strings.item_name(recipe.display_item, display_name)
+    return {
+        "name": recipe.name,
+        "internal_name": recipe.internal_name,
+        "persistence_id": recipe.persistence_id,
+        "row_name": recipe.row_name,
+        "display_name": display_name,
+        "icon": recipe.icon,
+        "items_created": [ingredient_json(ref, strings) for ref in recipe.items_created],
+        "items_consumed": [ingredient_json(ref, strings) for ref in recipe.items_consumed],
+    }
+
+
+@phase("extract")
 def build_recipe_index(
     recipes_dir: Path,
-    item_lookup: dict[str, dict[str, Any]],
+    item_lookup: dict[str, ItemRecord],
     content_root: Path,
     icons_dir: Path,
     placeholder_icon: str,
-) -> list[dict[str, Any]]:
-    recipes: list[dict[str, Any]] = []
+    jobs: int = 1,
+    cache: BuildCache | None = None,
+) -> list[RecipeRecord]:
+    recipes: list[RecipeRecord] = []
     icon_missing = 0
     placeholder_used = 0
     skipped_recipes = 0
     recipe_count = 0
 
-    for file_path in sorted(recipes_dir.rglob("RECIPE_*.json")):
-        data = load_json(file_path)
-        if not data:
-            continue
-        entry = extract_entry(data)
-        if not entry:
+    def enrich_items(refs: list[IngredientRef]) -> list[IngredientRef]:
+        nonlocal icon_missing
+        nonlocal placeholder_used
+        for ref in resolve_refs(refs, item_lookup):
+            if not ref.icon:
+                icon_missing += 1
+                if placeholder_icon:
+                    ref.icon = placeholder_icon
+                    placeholder_used += 1
+        return refs
+
+    recipe_files = content_files(recipes_dir, "RECIPE_", cache)
+    records = parse_files(read_recipe, recipe_files, jobs, cache, "recipe_index.recipe.v3")
+    for _file_path, record in records:
+        if not record:
             continue
-        props = entry.get("Properties", {})
-
-        def enrich_items(items: list[dict[str, Any]]) -> list[dict[str, Any]]:
-            nonlocal icon_missing
-            nonlocal placeholder_used
-            enriched: list[dict[str, Any]] = []
-            for item in items:
-                item_data = item.get("ItemData", {}) or {}
-                item_id = extract_item_id(item_data)
-                count = item.get("Count", 1)
-                details = item_lookup.get(item_id, {})
-                icon_name = details.get("icon", "")
-                if not icon_name:
-                    icon_missing += 1
-                    if placeholder_icon:
-                        icon_name = placeholder_icon
-                        placeholder_used += 1
-                enriched.append(
-                    {
-                        "item_id": item_id,
-                        "count": count,
-                        "display_name": details.get("display_name", item_id),
-                        "persistence_id": details.get("persistence_id", ""),
-                        "icon": icon_name,
-                    }
-                )
-            return enriched
-
-        items_consumed = enrich_items(props.get("ItemsConsumed", []) or [])
-        items_created = enrich_items(props.get("ItemsCreated", []) or [])
-
-        valid_created = [
-            item for item in items_created if item.get("item_id") and item.get("count", 0) > 0
-        ]
+        enrich_items(record.items_consumed)
+        enrich_items(record.items_created)
+
+        valid_created = [ref for ref in record.items_created if ref.item_id and ref.count > 0]
         if not valid_created:
             skipped_recipes += 1
             continue
 
-        icon = valid_created[0]["icon"]
+        icon = valid_created[0].icon
         if not icon and placeholder_icon:
             icon = placeholder_icon
             placeholder_used += 1
 
-        display_name = valid_created[0]["display_name"] or entry.get("Name")
-
-        recipes.append(
-            {
-                "name": entry.get("Name", ""),
-                "internal_name": props.get("InternalName", ""),
-                "persistence_id": props.get("PersistenceID", ""),
-                "row_name": props.get("OnCraftXpEvent", {}).get("RowName", ""),
-                "display_name": display_name,
-                "icon": icon,
-                "items_created": items_created,
-                "items_consumed": items_consumed,
-            }
-        )
+        record.display_name = valid_created[0].display_name or record.name
+        record.display_item = valid_created[0].item
+        record.icon = icon
+        recipes.append(record)
         recipe_count += 1
 
     print(f"[INFO] Recipes indexed: {recipe_count}")
@@ -211,6 +199,86 @@ def build_recipe_index(
     return recipes
 
 
+@phase("extract")
+def normalize_recipes(
+    recipes: list[RecipeRecord],
+) -> tuple[list[list[Any]], dict[str, list[dict[str, Any]]]]:
+    item_rows: list[list[Any]] = []
+    item_indices: dict[str, int] = {}
+    shards: dict[str, list[dict[str, Any]]] = {}
+
+    def item_refs(refs: list[IngredientRef]) -> list[list[Any]]:
+        rows = []
+        for ref in refs:
+            index = item_indices.get(ref.item_id)
+            if index is None:
+                index = len(item_rows)
+                item_indices[ref.item_id] = index
+                item_rows.append([ref.item_id, ref.display_name, ref.persistence_id, ref.icon])
+            rows.append([index, ref.count])
+        return rows
+
+    for recipe in recipes:
+        normalized = {
+            "name": recipe.name,
+            "internal_name": recipe.internal_name,
+            "persistence_id": recipe.persistence_id,
+            "row_name": recipe.row_name,
+            "display_name": recipe.display_name,
+            "icon": recipe.icon,
+            "items_created": item_refs(recipe.items_created),
+            "items_consumed": item_refs(recipe.items_consumed),
+        }
+        shards.setdefault(recipe_category(recipe.name), []).append(normalized)
+    return item_rows, shards
+
+
+def write_normalized_catalog(
+    output_dir: Path,
+    recipes: list[RecipeRecord],
+    shard_by_category: bool,
+    precompress: bool = False,
+) -> int:
+    item_rows, shards = normalize_recipes(recipes)
+    if not shard_by_category:
+        shards = {"All": [recipe for shard in shards.values() for recipe in shard]}
+
+    written = 0
+    manifest = {
+        "version": 1,
+        "count": len(recipes),
+        "items": "items.json",
+        "shards": [],
+    }
+    items_payload = {
+        "fields": ["item_id", "display_name", "persistence_id", "icon"],
+        "items": item_rows,
+    }
+    written += write_catalog(
+        output_dir / "items.json", items_payload, compact=True, precompress=precompress
+    )
+    for category, shard_recipes in shards.items():
+        file_name = f"recipes_{category.lower()}.json"
+        manifest["shards"].append(
+            {"category": category, "file": file_name, "count": len(shard_recipes)}
+        )
+        written += write_catalog(
+            output_dir / file_name,
+            {"recipes": shard_recipes},
+            compact=True,
+            precompress=precompress,
+        )
+    written += write_catalog(output_dir / "manifest.json", manifest, precompress=precompress)
+
+    expected = {"manifest.json", "items.json"} | {
+        shard["file"] for shard in manifest["shards"]
+    }
+    for stale in output_dir.glob("recipes_*.json*"):
+        if stale.name.split(".json")[0] + ".json" not in expected:
+            stale.unlink()
+    return written
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Build a UI-friendly recipe catalog with icons and tooltips."
@@ -240,6 +308,38 @@ def main() -> int:
         default="docs/recipes/icons",
         help="Directory to copy recipe/item icons into.",
     )
+    add_parse_arguments(parser)
+    add_cache_arguments(parser)
+    add_link_arguments(parser)
+    parser.add_argument(
+        "--normalized-dir",
+        default="docs/data/recipes",
+        help="Directory for the normalized catalog (manifest, item table, recipe shards).",
+    )
+    parser.add_argument(
+        "--no-normalized",
+        action="store_true",
+        help="Only write the full recipe catalog.",
+    )
+    parser.add_argument(
+        "--shard-by-category",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Split the normalized recipes by category prefix (default: true).",
+    )
+    parser.add_argument(
+        "--bom-output",
+        default="docs/data/recipe_bom.json",
+        help="Output JSON path for the expanded bill of materials per recipe.",
+    )
+    parser.add_argument(
+        "--no-bom",
+        action="store_true",
+        help="Skip the bill-of-materials output.",
+    )
+    add_output_arguments(parser)
+    add_locale_arguments(parser)
+    add_metrics_argument(parser)
     args = parser.parse_args()
 
     recipes_dir = Path(args.recipes)
@@ -255,24 +355,62 @@ def main() -> int:
         print(f"[ERROR] Items directory not found: {items_dir}")
         return 1
 
-    placeholder_source = Path("docs") / "DWE" / "Assets" / "Placeholders" / "recipe_icon.png"
-    placeholder_icon = ""
-    if placeholder_source.exists():
-        placeholder_icon = copy_icon(placeholder_source, icons_dir)
+    cache = open_cache(args.cache_dir, not args.no_cache)
+    icons = IconStore(icons_dir, cache, args.link_mode)
+    try:
+        locales = open_locales(args, content_root, cache)
+        placeholder_source = (
+            Path("docs") / "DWE" / "Assets" / "Placeholders" / "recipe_icon.png"
+        )
+        placeholder_icon = ""
+        if placeholder_source.exists():
+            placeholder_icon = icons.add(placeholder_source)
+        else:
+            print(f"[WARN] Placeholder icon missing: {placeholder_source}")
+
+        assets = AssetIndex(content_root, cache)
+        item_lookup = build_item_lookup(
+            items_dir, assets, icons, placeholder_icon, args.jobs, cache, Path(args.cache_dir)
+        )
+        report_assets(assets)
+        recipes = build_recipe_index(
+            recipes_dir,
+            item_lookup,
+            content_root,
+            icons_dir,
+            placeholder_icon,
+            args.jobs,
+            cache,
+        )
+    finally:
+        report_cache(cache)
+        if cache is not None:
+            cache.close()
+
+    catalog = [recipe_json(recipe) for recipe in recipes]
+    if write_catalog(output_path, catalog, args.compact, args.precompress):
+        print(f"[INFO] Wrote recipe catalog: {output_path}")
     else:
-        print(f"[WARN] Placeholder icon missing: {placeholder_source}")
-
-    item_lookup = build_item_lookup(items_dir, content_root, icons_dir, placeholder_icon)
-    recipes = build_recipe_index(
-        recipes_dir, item_lookup, content_root, icons_dir, placeholder_icon
-    )
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(
-        json.dumps(recipes, indent=2, ensure_ascii=True) + "\n", encoding="utf-8"
-    )
-    print(f"[INFO] Wrote recipe catalog: {output_path}")
-    print(f"[INFO] Icons output: {icons_dir}")
+        print(f"[INFO] Recipe catalog unchanged: {output_path}")
+    for strings in locales:
+        path = locale_path(output_path, strings.locale)
+        catalog = [recipe_json(recipe, strings) for recipe in recipes]
+        write_catalog(path, catalog, args.compact, args.precompress)
+        report_locale(strings, path)
+    if not args.no_normalized:
+        normalized_dir = Path(args.normalized_dir)
+        written = write_normalized_catalog(
+            normalized_dir, recipes, args.shard_by_category, args.precompress
+        )
+        print(f"[INFO] Normalized catalog: {normalized_dir} ({written} files written)")
+    if not args.no_bom:
+        bom_path = Path(args.bom_output)
+        if write_recipe_bom(bom_path, recipes, precompress=args.precompress):
+            print(f"[INFO] Wrote bill of materials: {bom_path}")
+        else:
+            print(f"[INFO] Bill of materials unchanged: {bom_path}")
+    print(f"[INFO] Icons output: {icons_dir} ({icons.written} written)")
+    write_metrics(args.metrics_out, "build_recipe_index")
     return 0
 
 
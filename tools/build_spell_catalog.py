@@ -1,24 +1,32 @@
 import argparse
-import hashlib
-import json
 import re
 from pathlib import Path
 from typing import Any
 
-
-ITEM_ID_PATTERN = re.compile(r"(ITEM_[A-Za-z0-9_]+|DA_[A-Za-z0-9_]+)")
+from asset_index import AssetIndex, report_assets
+from build_cache import DEFAULT_CACHE_DIR, BuildCache, add_cache_arguments, open_cache, report_cache
+from build_metrics import add_metrics_argument, phase, write_metrics
+from catalog_output import add_output_arguments, write_catalog
+from content_scanner import content_files
+from export_reader import load_export
+from file_ops import add_link_arguments
+from icon_store import IconStore
+from item_index import load_item_index
+from parse_pool import add_parse_arguments, parse_files
+from records import IngredientRef, ItemRecord, SpellRecord, resolve_refs
+from string_tables import (
+    LocaleStrings,
+    add_locale_arguments,
+    locale_path,
+    open_locales,
+    report_locale,
+    text_ref,
+)
 
 
-def load_json(path: Path) -> list[dict[str, Any]] | None:
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as exc:
-        print(f"[WARN] JSON parse failed: {path} ({exc})")
-        return None
-    if not isinstance(data, list) or not data:
-        print(f"[WARN] Unexpected JSON root: {path}")
-        return None
-    return data
+ITEM_ID_PATTERN = re.compile(r"(ITEM_[A-Za-z0-9_]+|DA_[A-Za-z0-9_]+)")
+# SpellModule_CostItems'USD_SnareTrap:SpellModule_CostItems_0' -> SpellModule_CostItems_0
+MODULE_REF_PATTERN = re.compile(r"'(?:[^']*:)?([^':]+)'$")
 
 
 def resolve_object_path(object_path: str) -> Path | None:
@@ -29,27 +37,6 @@ def resolve_object_path(object_path: str) -> Path | None:
     return Path(cleaned + ".png")
 
 
-def file_hash(path: Path) -> str:
-    hasher = hashlib.sha1()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            hasher.update(chunk)
-    return hasher.hexdigest()
-
-
-def copy_icon(icon_abs: Path, icons_dir: Path) -> str:
-    icons_dir.mkdir(parents=True, exist_ok=True)
-    dest = icons_dir / icon_abs.name
-    if dest.exists():
-        if file_hash(dest) == file_hash(icon_abs):
-            return dest.name
-        base = icon_abs.stem
-        suffix = file_hash(icon_abs)[:8]
-        dest = icons_dir / f"{base}_{suffix}{icon_abs.suffix}"
-    dest.write_bytes(icon_abs.read_bytes())
-    return dest.name
-
-
 def extract_item_id(item_data: dict[str, Any]) -> str:
     object_name = item_data.get("ObjectName", "")
     object_path = item_data.get("ObjectPath", "")
@@ -61,33 +48,29 @@ def extract_item_id(item_data: dict[str, Any]) -> str:
     return ""
 
 
+@phase("extract")
 def build_item_lookup(
-    source_dir: Path, content_root: Path, icons_dir: Path
-) -> dict[str, dict[str, Any]]:
-    lookup: dict[str, dict[str, Any]] = {}
+    source_dir: Path,
+    assets: AssetIndex,
+    icons: IconStore,
+    jobs: int = 1,
+    cache: BuildCache | None = None,
+    index_dir: Path = DEFAULT_CACHE_DIR,
+) -> dict[str, ItemRecord]:
+    lookup: dict[str, ItemRecord] = {}
     icon_missing = 0
     item_count = 0
 
-    for file_path in sorted(source_dir.rglob("ITEM_*.json")):
-        data = load_json(file_path)
-        if not data:
+    for file_path, record in load_item_index(source_dir, jobs, cache, index_dir):
+        if not file_path.name.startswith("ITEM_"):
             continue
-        entry = next((row for row in data if row.get("Properties")), data[0])
-        props = entry.get("Properties", {})
-        item_id = entry.get("Name") or file_path.stem
-        display_name = (
-            props.get("Name", {}).get("SourceString")
-            or props.get("Name", {}).get("LocalizedString")
-            or props.get("InternalName")
-            or item_id
-        )
-        icon_obj = props.get("Icon", {}).get("ObjectPath") or ""
+        icon_obj = record.icon_object
         icon_rel = resolve_object_path(icon_obj)
         icon_file = ""
         if icon_rel:
-            icon_abs = content_root / icon_rel
-            if icon_abs.exists():
-                icon_file = copy_icon(icon_abs, icons_dir)
+            icon_abs = assets.find(icon_rel)
+            if icon_abs:
+                icon_file = icons.add(icon_abs)
             else:
                 icon_missing += 1
                 print(f"[WARN] Icon not found: {file_path} -> {icon_obj}")
@@ -95,11 +78,8 @@ def build_item_lookup(
             icon_missing += 1
             print(f"[WARN] Icon missing: {file_path}")
 
-        lookup[item_id] = {
-            "item_id": item_id,
-            "display_name": display_name,
-            "icon": icon_file,
-        }
+        record.icon = icon_file
+        lookup[record.item_id] = record
         item_count += 1
 
     print(f"[INFO] Items indexed: {item_count}")
@@ -125,19 +105,113 @@ def extract_cost_modules(data: list[dict[str, Any]]) -> list[dict[str, Any]]:
     return modules
 
 
+def module_ref_name(ref: Any) -> str | None:
+    object_name = str((ref.get("Module") or {}).get("ObjectName", "")) if isinstance(ref, dict) else ""
+    match = MODULE_REF_PATTERN.search(object_name)
+    return match.group(1) if match else None
+
+
+def spell_entries_complete(entries: list[dict[str, Any]]) -> bool:
+    # Stop once the spell entry and every module it references are parsed, so
+    # extract_cost_modules sees all of them whatever the refs are named. Without
+    # a module list, or with a ref that does not parse, the whole file is read.
+    spell_entry = extract_spell_entry(entries)
+    if not spell_entry:
+        return False
+    refs = (spell_entry.get("Properties", {}).get("Modules") or {}).get("Modules")
+    if not isinstance(refs, list):
+        return False
+    names = [module_ref_name(ref) for ref in refs]
+    if None in names:
+        return False
+    parsed = {entry.get("Name") for entry in entries if isinstance(entry, dict)}
+    return all(name in parsed for name in names)
+
+
+def read_spell(file_path: Path) -> SpellRecord | None:
+    data = load_export(file_path, spell_entries_complete)
+    if not data:
+        return None
+    spell_entry = extract_spell_entry(data)
+    if not spell_entry:
+        print(f"[WARN] Spell data missing: {file_path}")
+        return None
+    props = spell_entry.get("Properties", {})
+
+    display_text = props.get("SpellDisplayName", {}).get("SourceString") or props.get(
+        "SpellDisplayName", {}
+    ).get("LocalizedString")
+    display_name = display_text or spell_entry.get("Name") or file_path.stem
+    requirements = (
+        props.get("SpecialRequirementsText", {}).get("SourceString")
+        or props.get("SpecialRequirementsText", {}).get("LocalizedString")
+        or ""
+    )
+
+    costs = []
+    for module in extract_cost_modules(data):
+        module_props = module.get("Properties", {})
+        for cost in module_props.get("ItemsCostInfo", []) or []:
+            item_data = cost.get("ItemData", {}) or {}
+            costs.append(IngredientRef(extract_item_id(item_data), cost.get("Count", 1)))
+
+    return SpellRecord(
+        persistence_id=props.get("PersistenceID", ""),
+        display_name=display_name,
+        requirements=requirements,
+        cooldown=props.get("CooldownDuration"),
+        spell_icon_object=props.get("SpellIcon", {}).get("ObjectPath") or "",
+        spell_tag_object=props.get("SpellTagIcon", {}).get("ObjectPath") or "",
+        internal_name=props.get("InternalName", ""),
+        costs=costs,
+        display_ref=text_ref(props.get("SpellDisplayName")) if display_text else None,
+        requirements_ref=text_ref(props.get("SpecialRequirementsText")) if requirements else None,
+    )
+
+
+def spell_json(spell: SpellRecord, strings: LocaleStrings | None = None) -> dict[str, Any]:
+    display_name = spell.display_name
+    requirements = spell.requirements
+    if strings is not None:
+        display_name = strings.text(spell.display_ref, display_name)
+        requirements = strings.text(spell.requirements_ref, requirements)
+    return {
+        "persistence_id": spell.persistence_id,
+        "display_name": display_name,
+        "requirements": requirements,
+        "cooldown": spell.cooldown,
+        "spell_icon": spell.spell_icon,
+        "spell_tag_icon": spell.spell_tag_icon,
+        "costs": [
+            {
+                "item_id": ref.item_id,
+                "count": ref.count,
+                "display_name": (
+                    strings.item_name(ref.item, ref.display_name) if strings else ref.display_name
+                ),
+                "icon": ref.icon,
+            }
+            for ref in spell.costs
+        ],
+        "internal_name": spell.internal_name,
+    }
+
+
+@phase("extract")
 def build_spell_catalog(
     spells_dir: Path,
-    item_lookup: dict[str, dict[str, Any]],
-    content_root: Path,
-    icons_dir: Path,
-) -> list[dict[str, Any]]:
-    spells: list[dict[str, Any]] = []
+    item_lookup: dict[str, ItemRecord],
+    assets: AssetIndex,
+    icons: IconStore,
+    jobs: int = 1,
+    cache: BuildCache | None = None,
+) -> list[SpellRecord]:
+    spells: list[SpellRecord] = []
     spell_count = 0
     icon_missing = 0
     placeholder_icon = ""
-    placeholder_path = (
-        content_root
-        / "Art"
+    placeholder_rel = (
+        Path("Art")
         / "UI"
         / "Skills"
         / "Icons"
@@ -145,43 +219,28 @@ def build_spell_catalog(
         / "Placeholder"
         / "T_Skill_Placeholder_Active_Spells.png"
     )
-    if placeholder_path.exists():
-        placeholder_icon = copy_icon(placeholder_path, icons_dir)
+    placeholder_path = assets.find(placeholder_rel)
+    if placeholder_path:
+        placeholder_icon = icons.add(placeholder_path)
     else:
-        print(f"[WARN] Placeholder spell icon missing: {placeholder_path}")
+        print(f"[WARN] Placeholder spell icon missing: {assets.content_root / placeholder_rel}")
 
-    for file_path in sorted(spells_dir.rglob("USD_*.json")):
-        data = load_json(file_path)
-        if not data:
+    spell_files = content_files(spells_dir, "USD_", cache)
+    records = parse_files(read_spell, spell_files, jobs, cache, "spell_catalog.spell.v3")
+    for file_path, record in records:
+        if not record:
             continue
-        spell_entry = extract_spell_entry(data)
-        if not spell_entry:
-            print(f"[WARN] Spell data missing: {file_path}")
-            continue
-        props = spell_entry.get("Properties", {})
-
-        display_name = (
-            props.get("SpellDisplayName", {}).get("SourceString")
-            or props.get("SpellDisplayName", {}).get("LocalizedString")
-            or spell_entry.get("Name")
-            or file_path.stem
-        )
-        requirements = (
-            props.get("SpecialRequirementsText", {}).get("SourceString")
-            or props.get("SpecialRequirementsText", {}).get("LocalizedString")
-            or ""
-        )
 
-        spell_icon_obj = props.get("SpellIcon", {}).get("ObjectPath") or ""
-        spell_tag_obj = props.get("SpellTagIcon", {}).get("ObjectPath") or ""
+        spell_icon_obj = record.spell_icon_object
+        spell_tag_obj = record.spell_tag_object
         spell_icon = ""
         spell_tag_icon = ""
 
         spell_icon_rel = resolve_object_path(spell_icon_obj)
         if spell_icon_rel:
-            spell_icon_abs = content_root / spell_icon_rel
-            if spell_icon_abs.exists():
-                spell_icon = copy_icon(spell_icon_abs, icons_dir)
+            spell_icon_abs = assets.find(spell_icon_rel)
+            if spell_icon_abs:
+                spell_icon = icons.add(spell_icon_abs)
             else:
                 icon_missing += 1
                 print(f"[WARN] Spell icon not found: {file_path} -> {spell_icon_obj}")
@@ -192,44 +251,19 @@ def build_spell_catalog(
 
         spell_tag_rel = resolve_object_path(spell_tag_obj)
         if spell_tag_rel:
-            spell_tag_abs = content_root / spell_tag_rel
-            if spell_tag_abs.exists():
-                spell_tag_icon = copy_icon(spell_tag_abs, icons_dir)
+            spell_tag_abs = assets.find(spell_tag_rel)
+            if spell_tag_abs:
+                spell_tag_icon = icons.add(spell_tag_abs)
             else:
                 icon_missing += 1
                 print(f"[WARN] Tag icon not found: {file_path} -> {spell_tag_obj}")
         elif spell_tag_obj:
             icon_missing += 1
 
-        costs = []
-        for module in extract_cost_modules(data):
-            module_props = module.get("Properties", {})
-            for cost in module_props.get("ItemsCostInfo", []) or []:
-                item_data = cost.get("ItemData", {}) or {}
-                item_id = extract_item_id(item_data)
-                count = cost.get("Count", 1)
-                lookup = item_lookup.get(item_id, {})
-                costs.append(
-                    {
-                        "item_id": item_id,
-                        "count": count,
-                        "display_name": lookup.get("display_name", item_id),
-                        "icon": lookup.get("icon", ""),
-                    }
-                )
-
-        spells.append(
-            {
-                "persistence_id": props.get("PersistenceID", ""),
-                "display_name": display_name,
-                "requirements": requirements,
-                "cooldown": props.get("CooldownDuration"),
-                "spell_icon": spell_icon,
-                "spell_tag_icon": spell_tag_icon,
-                "costs": costs,
-                "internal_name": props.get("InternalName", ""),
-            }
-        )
+        resolve_refs(record.costs, item_lookup)
+        record.spell_icon = spell_icon
+        record.spell_tag_icon = spell_tag_icon
+        spells.append(record)
         spell_count += 1
 
     print(f"[INFO] Spells indexed: {spell_count}")
@@ -266,6 +300,12 @@ def main() -> int:
         default="docs/spells/icons",
         help="Directory to copy spell/item icons into.",
     )
+    add_parse_arguments(parser)
+    add_cache_arguments(parser)
+    add_link_arguments(parser)
+    add_output_arguments(parser)
+    add_locale_arguments(parser)
+    add_metrics_argument(parser)
     args = parser.parse_args()
 
     spells_dir = Path(args.spells)
@@ -281,15 +321,33 @@ def main() -> int:
         print(f"[ERROR] Items directory not found: {items_dir}")
         return 1
 
-    item_lookup = build_item_lookup(items_dir, content_root, icons_dir)
-    spells = build_spell_catalog(spells_dir, item_lookup, content_root, icons_dir)
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(
-        json.dumps(spells, indent=2, ensure_ascii=True) + "\n", encoding="utf-8"
-    )
-    print(f"[INFO] Wrote spell catalog: {output_path}")
-    print(f"[INFO] Icons output: {icons_dir}")
+    cache = open_cache(args.cache_dir, not args.no_cache)
+    icons = IconStore(icons_dir, cache, args.link_mode)
+    try:
+        locales = open_locales(args, content_root, cache)
+        assets = AssetIndex(content_root, cache)
+        item_lookup = build_item_lookup(
+            items_dir, assets, icons, args.jobs, cache, Path(args.cache_dir)
+        )
+        spells = build_spell_catalog(spells_dir, item_lookup, assets, icons, args.jobs, cache)
+        report_assets(assets)
+    finally:
+        report_cache(cache)
+        if cache is not None:
+            cache.close()
+
+    catalog = [spell_json(spell) for spell in spells]
+    if write_catalog(output_path, catalog, args.compact, args.precompress):
+        print(f"[INFO] Wrote spell catalog: {output_path}")
+    else:
+        print(f"[INFO] Spell catalog unchanged: {output_path}")
+    for strings in locales:
+        path = locale_path(output_path, strings.locale)
+        catalog = [spell_json(spell, strings) for spell in spells]
+        write_catalog(path, catalog, args.compact, args.precompress)
+        report_locale(strings, path)
+    print(f"[INFO] Icons output: {icons_dir} ({icons.written} written)")
+    write_metrics(args.metrics_out, "build_spell_catalog")
     return 0
 
 
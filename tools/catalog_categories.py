@@ -0,0 +1,5 @@
+def recipe_category(name: str) -> str:
+    # RECIPE_Armour_T3_Legs_Bronze -> Armour, RECIPE_Torch -> Torch. The recipe
+    # catalog shards and the save transforms both group recipes this way.
+    parts = name.removeprefix("RECIPE_").split("_")
+    return parts[0] if parts and parts[0] else "Misc"
@@ -0,0 +1,90 @@
+import gzip
+from pathlib import Path
+from typing import Any
+
+import json_codec
+from build_metrics import phase
+from file_ops import write_bytes_if_changed, write_text_if_changed
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+_brotli_warned = False
+
+
+def dump_catalog(data: Any, compact: bool = False) -> str:
+    with phase("serialize"):
+        return json_codec.dumps(data, indent=None if compact else 2)
+
+
+def remove_stale_compressed(path: Path, keep: tuple[str, ...] = ()) -> None:
+    # A static server prefers .gz/.br siblings, so ones left from an earlier
+    # --precompress run would be served instead of the fresh JSON.
+    for suffix in (".gz", ".br"):
+        sibling = path.with_name(path.name + suffix)
+        if suffix not in keep and sibling.exists():
+            sibling.unlink()
+            print(f"[INFO] Removed stale {sibling}")
+
+
+def write_precompressed(path: Path) -> dict[str, int]:
+    global _brotli_warned
+    raw = path.read_bytes()
+    sizes = {"raw": len(raw)}
+    with phase("serialize"):
+        gz_data = gzip.compress(raw, compresslevel=9, mtime=0)
+    write_bytes_if_changed(path.with_name(path.name + ".gz"), gz_data)
+    sizes["gz"] = len(gz_data)
+    if brotli is not None:
+        with phase("serialize"):
+            br_data = brotli.compress(raw, quality=11)
+        write_bytes_if_changed(path.with_name(path.name + ".br"), br_data)
+        sizes["br"] = len(br_data)
+    else:
+        remove_stale_compressed(path, keep=(".gz",))
+        if not _brotli_warned:
+            _brotli_warned = True
+            print("[WARN] brotli module not installed; skipping .br outputs")
+    return sizes
+
+
+def report_sizes(path: Path, sizes: dict[str, int]) -> None:
+    parts = [f"raw={sizes['raw']}"]
+    for key in ("gz", "br"):
+        if key in sizes:
+            ratio = sizes[key] / sizes["raw"] * 100 if sizes["raw"] else 0
+            parts.append(f"{key}={sizes[key]} ({ratio:.1f}%)")
+    print(f"[INFO] Size {path}: {' '.join(parts)}")
+
+
+def write_catalog(
+    path: Path,
+    data: Any,
+    compact: bool = False,
+    precompress: bool = False,
+    trailing_newline: bool = True,
+) -> bool:
+    text = dump_catalog(data, compact)
+    if trailing_newline:
+        text += "\n"
+    changed = write_text_if_changed(path, text)
+    if precompress:
+        report_sizes(path, write_precompressed(path))
+    else:
+        remove_stale_compressed(path)
+    return changed
+
+
+def add_output_arguments(parser) -> None:
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write minified JSON instead of indent=2.",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="Also write .gz (and .br when brotli is installed) siblings and report sizes.",
+    )
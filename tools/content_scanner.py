@@ -0,0 +1,99 @@
+import os
+from pathlib import Path, PurePosixPath
+
+from build_cache import BuildCache, DirectoryIndex
+from build_metrics import count, phase
+
+
+CONTENT_PREFIXES = ("ITEM_", "DA_", "USD_", "RECIPE_", "DT_", "ST_")
+
+
+def classify_name(name: str) -> str | None:
+    if not name.endswith(".json"):
+        return None
+    for prefix in CONTENT_PREFIXES:
+        if name.startswith(prefix):
+            return prefix
+    return None
+
+
+class ContentScan:
+    def __init__(self, root: Path, files: dict[str, list[PurePosixPath]]) -> None:
+        self.root = root
+        self._files = files
+
+    def count(self, prefix: str) -> int:
+        return len(self._files.get(prefix, []))
+
+    def files(self, prefix: str, under: Path | None = None) -> list[Path]:
+        category = next((p for p in CONTENT_PREFIXES if prefix.startswith(p)), None)
+        if category is None:
+            raise ValueError(f"Unsupported content prefix: {prefix}")
+        base = under if under is not None else self.root
+        rel_base = base.resolve().relative_to(self.root).as_posix()
+        matches: list[Path] = []
+        for rel_path in self._files.get(category, []):
+            rel = rel_path.as_posix()
+            if rel_base != ".":
+                if not rel.startswith(rel_base + "/"):
+                    continue
+                rel = rel[len(rel_base) + 1 :]
+            if not rel_path.name.startswith(prefix):
+                continue
+            matches.append(base / rel)
+        return matches
+
+
+_SCANS: dict[Path, ContentScan] = {}
+
+
+def walk_content(root: Path, cache: BuildCache | None = None) -> ContentScan:
+    with phase("scan"):
+        if cache is None:
+            return _walk_content(root)
+        # Builders run as separate processes under build_all; the persisted
+        # listings let each one stat unchanged folders instead of listing them.
+        tree = DirectoryIndex(root, cache.connection)
+        files: dict[str, list[PurePosixPath]] = {prefix: [] for prefix in CONTENT_PREFIXES}
+        for rel in tree.files():
+            prefix = classify_name(rel.rsplit("/", 1)[-1])
+            if prefix:
+                files[prefix].append(PurePosixPath(rel))
+        tree.flush()
+        for paths in files.values():
+            paths.sort()
+        return ContentScan(root, files)
+
+
+def _walk_content(root: Path) -> ContentScan:
+    files: dict[str, list[PurePosixPath]] = {prefix: [] for prefix in CONTENT_PREFIXES}
+    pending = [""]
+    while pending:
+        count("dirs_scanned")
+        rel_dir = pending.pop()
+        with os.scandir(root / rel_dir if rel_dir else root) as entries:
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(rel)
+                    continue
+                prefix = classify_name(entry.name)
+                if prefix:
+                    files[prefix].append(PurePosixPath(rel))
+    for paths in files.values():
+        paths.sort()
+    return ContentScan(root, files)
+
+
+def scan_content(directory: Path, cache: BuildCache | None = None) -> ContentScan:
+    resolved = directory.resolve()
+    for root, scan in _SCANS.items():
+        if resolved == root or root in resolved.parents:
+            return scan
+    scan = walk_content(resolved, cache)
+    _SCANS[resolved] = scan
+    return scan
+
+
+def content_files(directory: Path, prefix: str, cache: BuildCache | None = None) -> list[Path]:
+    return scan_content(directory, cache).files(prefix, directory)
@@ -0,0 +1,151 @@
+import codecs
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import json_codec
+from build_metrics import count
+
+
+READ_CHUNK = 64 * 1024
+WHITESPACE = " \t\n\r"
+NUMBER_CHARS = "0123456789+-.eE"
+
+_decoder = json.JSONDecoder()
+
+
+class _ExportReader:
+    def __init__(self, handle) -> None:
+        self.handle = handle
+        self.utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+
+    def fill(self) -> None:
+        # Read at least as much as is still buffered, so an entry that spans
+        # many chunks is re-decoded O(log n) times rather than once per chunk.
+        chunk = self.handle.read(max(READ_CHUNK, len(self.buffer) - self.pos))
+        self.bytes_read += len(chunk)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.pos :] + self.utf8.decode(chunk, final=self.eof)
+        self.pos = 0
+
+    def peek(self) -> str:
+        # Next non-whitespace character, or "" at end of file.
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos : self.pos + 1]
+            self.fill()
+
+    def value(self) -> Any:
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+                self.fill()
+                continue
+            # A value ending at the buffer edge, or a number followed by more
+            # number characters ("2." then "5"), may have been cut off by a chunk.
+            if not self.eof and (end == len(self.buffer) or self.buffer[end] in NUMBER_CHARS):
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+    def rest(self) -> str:
+        while not self.eof:
+            self.fill()
+        return self.buffer[self.pos :]
+
+
+def _prefix(data: list[Any], done: Callable[[list[Any]], bool]) -> list[Any]:
+    entries: list[Any] = []
+    for entry in data:
+        entries.append(entry)
+        if done(entries):
+            break
+    return entries
+
+
+def load_export_prefix(path: Path, done: Callable[[list[Any]], bool]) -> Any:
+    # Parses the top-level array entry by entry and returns the entries read
+    # when done(entries) first holds, or the whole array if it never does.
+    # Non-array roots are parsed and returned as-is.
+    count("files_read")
+    start = time.perf_counter()
+    with path.open("rb") as handle:
+        reader = _ExportReader(handle)
+        try:
+            if json_codec.BACKEND != "json" and os.fstat(handle.fileno()).st_size <= READ_CHUNK:
+                # A small file fits in one chunk anyway; one orjson pass beats
+                # decoding it entry by entry. Errors take the streaming path so
+                # both backends report the same files.
+                raw = handle.read()
+                try:
+                    data = json_codec.loads(raw)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    handle.seek(0)
+                else:
+                    reader.bytes_read = len(raw)
+                    return _prefix(data, done) if isinstance(data, list) else data
+            first = reader.peek()
+            if first == "\ufeff":
+                raise json.JSONDecodeError("Unexpected UTF-8 BOM (decode using utf-8-sig)", reader.buffer, 0)
+            if first != "[":
+                return json_codec.loads(reader.rest())
+            reader.pos += 1
+            entries: list[Any] = []
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    entries.append(reader.value())
+                    if done(entries):
+                        return entries
+                    separator = reader.peek()
+                    reader.pos += 1
+                    if separator == "]":
+                        break
+                    if separator != ",":
+                        raise json.JSONDecodeError("Expecting ',' delimiter", reader.buffer, reader.pos - 1)
+                    reader.peek()
+            if reader.rest().strip(WHITESPACE):
+                raise json.JSONDecodeError("Extra data", reader.buffer, reader.pos)
+            return entries
+        finally:
+            count("bytes_read", reader.bytes_read)
+            count("bytes_unparsed", max(0, os.fstat(handle.fileno()).st_size - reader.bytes_read))
+            count("json_parse_seconds", time.perf_counter() - start)
+
+
+def load_export(path: Path, done: Callable[[list[Any]], bool]) -> list[dict[str, Any]] | None:
+    # load_export_prefix for builders: a malformed or non-array export is
+    # reported and skipped instead of failing the run.
+    try:
+        data = load_export_prefix(path, done)
+    except json.JSONDecodeError as exc:
+        print(f"[WARN] JSON parse failed: {path} ({exc})")
+        return None
+    if not isinstance(data, list) or not data:
+        print(f"[WARN] Unexpected JSON root: {path}")
+        return None
+    return data
+
+
+def has_properties(entries: list[Any]) -> bool:
+    return isinstance(entries[-1], dict) and bool(entries[-1].get("Properties"))
+
+
+def extract_entry(data: list[dict[str, Any]]) -> dict[str, Any] | None:
+    for entry in data:
+        if isinstance(entry, dict) and entry.get("Properties"):
+            return entry
+    return data[0] if data else None
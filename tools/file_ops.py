@@ -0,0 +1,126 @@
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from build_metrics import count, phase
+
+
+LINK_MODES = ("copy", "hardlink", "reflink", "symlink")
+FICLONE = 0x40049409
+
+_fallback_warned: set[str] = set()
+
+
+def temp_path(dest: Path) -> Path:
+    return dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+
+
+def reflink(source: Path, dest: Path) -> None:
+    if not sys.platform.startswith("linux"):
+        raise OSError("reflink is only supported on Linux")
+    import fcntl
+
+    with source.open("rb") as src, dest.open("wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    shutil.copystat(source, dest)
+
+
+def already_linked(source: Path, dest: Path, mode: str) -> bool:
+    if mode == "symlink":
+        return dest.is_symlink() and dest.resolve() == source.resolve()
+    if mode == "hardlink" and dest.exists() and not dest.is_symlink():
+        return os.path.samefile(source, dest)
+    return False
+
+
+def place_file(source: Path, dest: Path, mode: str = "copy") -> str:
+    return place_files([(source, dest)], mode)[0]
+
+
+def place_files(pairs: list[tuple[Path, Path]], mode: str = "copy", threads: int = 1) -> list[str]:
+    # Copies run on a thread pool; metrics are only touched from this thread.
+    with phase("icon_copy"):
+        if threads > 1 and len(pairs) > 1:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                used = list(executor.map(lambda pair: _place_file(pair[0], pair[1], mode), pairs))
+        else:
+            used = [_place_file(source, dest, mode) for source, dest in pairs]
+    for (source, _dest), used_mode in zip(pairs, used):
+        if used_mode == "copy":
+            count("files_copied")
+            count("copy_bytes", source.stat().st_size)
+        else:
+            count("files_linked")
+    return used
+
+
+def _place_file(source: Path, dest: Path, mode: str) -> str:
+    if already_linked(source, dest, mode):
+        return mode
+    tmp = temp_path(dest)
+    used = mode
+    try:
+        if mode == "hardlink":
+            os.link(source, tmp)
+        elif mode == "symlink":
+            target = os.path.relpath(source.resolve(), dest.parent.resolve())
+            os.symlink(target, tmp)
+        elif mode == "reflink":
+            reflink(source, tmp)
+        else:
+            shutil.copy2(source, tmp)
+    except OSError as exc:
+        tmp.unlink(missing_ok=True)
+        if mode == "copy":
+            raise
+        if mode not in _fallback_warned:
+            _fallback_warned.add(mode)
+            print(f"[WARN] {mode} unavailable ({exc}); falling back to copy")
+        shutil.copy2(source, tmp)
+        used = "copy"
+    os.replace(tmp, dest)
+    return used
+
+
+def write_bytes_if_changed(path: Path, data: bytes) -> bool:
+    with phase("write"):
+        try:
+            if path.stat().st_size == len(data) and path.read_bytes() == data:
+                count("files_unchanged")
+                return False
+        except FileNotFoundError:
+            pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = temp_path(path)
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        count("files_written")
+        count("bytes_written", len(data))
+        return True
+
+
+def encode_text(text: str) -> bytes:
+    # Mirror Path.write_text newline translation so skipped files compare equal.
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    return text.encode("utf-8")
+
+
+def write_text_if_changed(path: Path, text: str) -> bool:
+    return write_bytes_if_changed(path, encode_text(text))
+
+
+def copy_if_changed(source: Path, dest: Path) -> bool:
+    return write_bytes_if_changed(dest, source.read_bytes())
+
+
+def add_link_arguments(parser, placed: str = "icons are staged") -> None:
+    parser.add_argument(
+        "--link-mode",
+        choices=LINK_MODES,
+        default="copy",
+        help=f"How {placed}: copy (default), hardlink, reflink or symlink. "
+        "Falls back to copy when the link cannot be created.",
+    )
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from build_cache import BuildCache, FileDigests
+from build_metrics import phase
+from file_ops import place_file
+
+
+class IconStore:
+    def __init__(
+        self, icons_dir: Path, cache: BuildCache | None = None, link_mode: str = "copy"
+    ) -> None:
+        self.icons_dir = icons_dir
+        self.link_mode = link_mode
+        self.digests = cache.digests if cache is not None else FileDigests()
+        self._names: dict[str, str] = {}
+        self._stored: dict[str, str] = {}
+        self.written = 0
+
+    def _matches(self, dest: Path, digest: str) -> bool:
+        if self._stored.get(dest.name) == digest:
+            return True
+        if not dest.exists():
+            return False
+        dest_digest = self.digests.digest(dest)
+        self._stored[dest.name] = dest_digest
+        return dest_digest == digest
+
+    def add(self, icon_abs: Path) -> str:
+        source_key = str(icon_abs)
+        name = self._names.get(source_key)
+        if name is not None:
+            return name
+        with phase("icon_copy"):
+            return self._add(icon_abs, source_key)
+
+    def _add(self, icon_abs: Path, source_key: str) -> str:
+        self.icons_dir.mkdir(parents=True, exist_ok=True)
+        digest = self.digests.digest(icon_abs)
+        dest = self.icons_dir / icon_abs.name
+        if not self._matches(dest, digest):
+            if dest.exists():
+                dest = self.icons_dir / f"{icon_abs.stem}_{digest[:8]}{icon_abs.suffix}"
+            if not self._matches(dest, digest):
+                place_file(icon_abs, dest, self.link_mode)
+                self.digests.remember(dest, digest)
+                self._stored[dest.name] = digest
+                self.written += 1
+        self._names[source_key] = dest.name
+        return dest.name
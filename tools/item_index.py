@@ -0,0 +1,90 @@
+from pathlib import Path
+from typing import Any
+
+import json_codec
+from build_cache import DEFAULT_CACHE_DIR, BuildCache
+from build_metrics import load_json_file
+from content_scanner import content_files
+from export_reader import extract_entry, has_properties, load_export
+from file_ops import write_text_if_changed
+from parse_pool import parse_files
+from records import ItemRecord, intern_item
+from string_tables import text_ref
+
+
+ITEM_PREFIXES = ("ITEM_", "DA_")
+ITEM_INDEX_NAME = "item_index.json"
+ITEM_INDEX_NAMESPACE = "item_index.item.v3"
+
+_LOADED: dict[Path, list[tuple[Path, ItemRecord]]] = {}
+
+
+def read_item_definition(file_path: Path) -> ItemRecord | None:
+    data = load_export(file_path, has_properties)
+    if not data:
+        return None
+    entry = extract_entry(data)
+    if not entry:
+        return None
+    props = entry.get("Properties", {})
+    item_id = entry.get("Name") or file_path.stem
+    name_text = props.get("Name", {}).get("SourceString") or props.get("Name", {}).get(
+        "LocalizedString"
+    )
+    display_name = name_text or props.get("InternalName") or item_id
+    return ItemRecord(
+        item_id=item_id,
+        display_name=display_name,
+        persistence_id=props.get("PersistenceID") or "",
+        internal_name=props.get("InternalName") or "",
+        icon_object=props.get("Icon", {}).get("ObjectPath") or "",
+        name_ref=text_ref(props.get("Name")) if name_text else None,
+    )
+
+
+def load_item_index(
+    items_dir: Path,
+    jobs: int = 1,
+    cache: BuildCache | None = None,
+    index_dir: Path = DEFAULT_CACHE_DIR,
+) -> list[tuple[Path, ItemRecord]]:
+    key = items_dir.resolve()
+    if key in _LOADED:
+        return _LOADED[key]
+
+    item_files: list[Path] = []
+    for prefix in ITEM_PREFIXES:
+        item_files.extend(content_files(items_dir, prefix, cache))
+    entries = [
+        (file_path, intern_item(record))
+        for file_path, record in parse_files(
+            read_item_definition, item_files, jobs, cache, ITEM_INDEX_NAMESPACE
+        )
+        if record
+    ]
+    _LOADED[key] = entries
+    # Written even with --no-cache: build_all tracks it as a stage output and
+    # update_drop_tables reads it.
+    index_dir.mkdir(parents=True, exist_ok=True)
+    write_item_index(index_dir / ITEM_INDEX_NAME, entries)
+    return entries
+
+
+def write_item_index(path: Path, entries: list[tuple[Path, ItemRecord]]) -> None:
+    index = {
+        record.item_id: {
+            "display_name": record.display_name,
+            "persistence_id": record.persistence_id,
+            "internal_name": record.internal_name,
+            "icon_object": record.icon_object,
+            "source": file_path.as_posix(),
+        }
+        for file_path, record in entries
+    }
+    write_text_if_changed(path, json_codec.dumps(index) + "\n")
+
+
+def read_item_index(path: Path) -> dict[str, dict[str, Any]]:
+    if not path.exists():
+        return {}
+    return load_json_file(path)
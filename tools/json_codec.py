@@ -0,0 +1,139 @@
+import json
+import math
+import os
+import re
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# DWE_JSON_BACKEND=json forces the stdlib path (e.g. to compare outputs).
+if os.environ.get("DWE_JSON_BACKEND") == "json":
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# Byte scans run through bytes.translate/find so they stay in C; a regex over
+# the text costs more than orjson's whole parse. Digits map to "0", e/E to "e"
+# and everything else to "x".
+_NUMBER_MAP = bytes(
+    0x30 if 0x30 <= code <= 0x39 else 0x65 if code in (0x45, 0x65) else 0x78
+    for code in range(256)
+)
+_NUMBER_CHARS = b"0123456789.-+eE"
+_DIGITS = b"0123456789"
+# orjson turns integers outside [-2**63, 2**64) into floats.
+_LONG_RUN = b"0" * 19
+_NON_ASCII = re.compile(r"[^\x00-\x7e]")
+
+
+def _starts_number(data: bytes, pos: int) -> bool:
+    # True when the token around pos is a JSON number rather than part of a
+    # string: number tokens follow "[", ":" or "," (or open the document).
+    i = pos
+    while i > 0 and data[i - 1] in _NUMBER_CHARS:
+        i -= 1
+    i -= 1
+    while i >= 0 and data[i] in b" \t\r\n":
+        i -= 1
+    return i < 0 or data[i] in b"[:,"
+
+
+def _find_number(data: bytes, mapped: bytes, needle: bytes) -> bool:
+    pos = mapped.find(needle)
+    while pos != -1:
+        if _starts_number(data, pos):
+            return True
+        pos = mapped.find(needle, pos + 1)
+    return False
+
+
+def _has_big_int(data: bytes) -> bool:
+    return _find_number(data, data.translate(_NUMBER_MAP), _LONG_RUN)
+
+
+def _float_mismatch(encoded: bytes) -> bool:
+    # orjson writes 1e16 / 0.00001 where repr() writes 1e+16 / 1e-05.
+    if _find_number(encoded, encoded.translate(_NUMBER_MAP), b"0e"):
+        return True
+    pos = encoded.find(b"0.0000")
+    while pos != -1:
+        if (pos == 0 or encoded[pos - 1] not in _DIGITS) and _starts_number(encoded, pos):
+            return True
+        pos = encoded.find(b"0.0000", pos + 1)
+    return False
+
+
+def _escape(match: re.Match) -> str:
+    # Same escapes as json.dumps(ensure_ascii=True), surrogate pairs included.
+    code = ord(match.group(0))
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    code -= 0x10000
+    return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+
+
+def _has_nonfinite(data: Any) -> bool:
+    pending = [data]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return False
+
+
+def loads(data: str | bytes) -> Any:
+    if orjson is not None:
+        try:
+            raw = data.encode("utf-8") if isinstance(data, str) else data
+        except UnicodeEncodeError:
+            # Lone surrogates; only the stdlib accepts them.
+            return json.loads(data)
+        if not _has_big_int(raw):
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # NaN, 1e400 and lone \ud800 escapes are valid for the stdlib;
+                # for real syntax errors it raises the usual message.
+                pass
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+
+def _dumps_orjson(data: Any, indent: int | None, sort_keys: bool) -> str | None:
+    option = orjson.OPT_INDENT_2 if indent == 2 else 0
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    try:
+        encoded = orjson.dumps(data, option=option)
+    except TypeError:
+        # Non-string keys, integers past 64 bits, nesting past orjson's limit.
+        return None
+    if _float_mismatch(encoded):
+        return None
+    if b"null" in encoded and _has_nonfinite(data):
+        # orjson writes NaN/Infinity as null.
+        return None
+    text = encoded.decode("utf-8")
+    if text.isascii() and "\x7f" not in text:
+        return text
+    return _NON_ASCII.sub(_escape, text)
+
+
+def dumps(data: Any, indent: int | None = 2, sort_keys: bool = False) -> str:
+    # indent=None writes minified JSON; both match json.dumps(ensure_ascii=True).
+    if orjson is not None and indent in (None, 2):
+        text = _dumps_orjson(data, indent, sort_keys)
+        if text is not None:
+            return text
+    if indent is None:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=True, sort_keys=sort_keys)
+    return json.dumps(data, indent=indent, ensure_ascii=True, sort_keys=sort_keys)
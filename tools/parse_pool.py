@@ -0,0 +1,96 @@
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from build_cache import BuildCache
+from build_metrics import counters_since, merge_counters, phase, snapshot_counters
+
+
+T = TypeVar("T")
+
+
+def resolve_jobs(jobs: int) -> int:
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def run_captured(func: Callable[[T], Any], task: T) -> tuple[str, Any, dict[str, float]]:
+    # Workers buffer their [WARN] output so the parent can replay it in task order,
+    # and hand back their metric counters for the parent to merge.
+    before = snapshot_counters()
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        result = func(task)
+    return buffer.getvalue(), result, counters_since(before)
+
+
+def map_captured(
+    func: Callable[[T], Any], tasks: list[T], jobs: int
+) -> Iterator[tuple[str, Any, dict[str, float]]]:
+    jobs = min(resolve_jobs(jobs), len(tasks))
+    if jobs <= 1:
+        for task in tasks:
+            output, result, _counters = run_captured(func, task)
+            yield output, result, {}
+        return
+
+    chunksize = max(1, len(tasks) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(run_captured, repeat(func), tasks, chunksize=chunksize)
+
+
+def parse_files(
+    func: Callable[[T], Any],
+    tasks: Iterable[T],
+    jobs: int = 1,
+    cache: BuildCache | None = None,
+    namespace: str = "",
+) -> Iterator[tuple[T, Any]]:
+    tasks = list(tasks)
+    if cache is None and min(resolve_jobs(jobs), len(tasks)) <= 1:
+        for task in tasks:
+            with phase("parse"):
+                result = func(task)
+            yield task, result
+        return
+
+    cached: dict[int, tuple[str, Any]] = {}
+    misses: list[T] = []
+    with phase("parse"):
+        for index, task in enumerate(tasks):
+            hit = cache.lookup(namespace, task) if cache is not None else None
+            if hit is None:
+                misses.append(task)
+            else:
+                cached[index] = hit
+
+    computed = map_captured(func, misses, jobs)
+    for index, task in enumerate(tasks):
+        if index in cached:
+            output, result = cached[index]
+        else:
+            # Phases are only entered around work, never across a yield.
+            with phase("parse"):
+                output, result, counters = next(computed)
+                merge_counters(counters)
+                if cache is not None:
+                    cache.store(namespace, task, output, result)
+        if output:
+            print(output, end="")
+        yield task, result
+    # Shut the pool down here so reaped worker CPU time is charged to parsing.
+    with phase("parse"):
+        computed.close()
+
+
+def add_parse_arguments(parser, purpose: str = "parse JSON exports") -> None:
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help=f"Worker processes used to {purpose} (0 = all CPUs, default: 1).",
+    )
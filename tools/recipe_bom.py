@@ -0,0 +1,169 @@
+from fractions import Fraction
+from pathlib import Path
+from typing import Any
+
+from build_metrics import phase
+from catalog_output import write_catalog
+from records import IngredientRef, RecipeRecord
+
+
+BOM_FIELDS = ["item_id", "display_name", "persistence_id", "icon"]
+
+
+class RecipeGraph:
+    # item -> producing recipe, recipe -> ingredients. An item made by several
+    # recipes expands through the first one in catalog order; items on a
+    # crafting cycle (e.g. smelt and recycle) are treated as raw materials so
+    # every expansion terminates and does not depend on where it started.
+    def __init__(self, recipes: list[RecipeRecord]) -> None:
+        self.producers: dict[str, RecipeRecord] = {}
+        for recipe in recipes:
+            for ref in recipe.items_created:
+                if ref.item_id and ref.count > 0:
+                    self.producers.setdefault(ref.item_id, recipe)
+        self.cyclic = self._cyclic_items()
+        # item -> (raw materials, intermediates) for one unit of the item.
+        self._units: dict[str, tuple[dict[str, Fraction], dict[str, Fraction]]] = {}
+
+    def ingredients(self, item_id: str) -> list[IngredientRef]:
+        recipe = self.producers.get(item_id)
+        if recipe is None:
+            return []
+        return [ref for ref in recipe.items_consumed if ref.item_id and ref.count > 0]
+
+    def _cyclic_items(self) -> set[str]:
+        # Iterative Tarjan SCC over item -> ingredient edges.
+        index: dict[str, int] = {}
+        low: dict[str, int] = {}
+        stack: list[str] = []
+        on_stack: set[str] = set()
+        cyclic: set[str] = set()
+        for root in self.producers:
+            if root in index:
+                continue
+            work = [(root, iter(self.ingredients(root)))]
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                item_id, edges = work[-1]
+                advanced = False
+                for ref in edges:
+                    child = ref.item_id
+                    if child == item_id:
+                        cyclic.add(item_id)
+                    if child not in index:
+                        index[child] = low[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self.ingredients(child))))
+                        advanced = True
+                        break
+                    if child in on_stack:
+                        low[item_id] = min(low[item_id], index[child])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[item_id])
+                if low[item_id] == index[item_id]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == item_id:
+                            break
+                    if len(component) > 1:
+                        cyclic.update(component)
+        return cyclic
+
+    def unit(self, item_id: str) -> tuple[dict[str, Fraction], dict[str, Fraction]]:
+        known = self._units.get(item_id)
+        if known is not None:
+            return known
+        recipe = self.producers.get(item_id)
+        if recipe is None or item_id in self.cyclic:
+            result = ({item_id: Fraction(1)}, {})
+        else:
+            made = sum(ref.count for ref in recipe.items_created if ref.item_id == item_id)
+            raw, intermediates = self.expand(self.ingredients(item_id))
+            scale = Fraction(1, made)
+            result = (
+                {key: value * scale for key, value in raw.items()},
+                {key: value * scale for key, value in intermediates.items()},
+            )
+        self._units[item_id] = result
+        return result
+
+    def expand(
+        self, refs: list[IngredientRef]
+    ) -> tuple[dict[str, Fraction], dict[str, Fraction]]:
+        # Children are always acyclic here, so recursion depth is bounded by
+        # the longest crafting chain and each item is expanded once.
+        raw: dict[str, Fraction] = {}
+        intermediates: dict[str, Fraction] = {}
+        for ref in refs:
+            if ref.count <= 0 or not ref.item_id:
+                continue
+            unit_raw, unit_intermediates = self.unit(ref.item_id)
+            if ref.item_id not in unit_raw:
+                intermediates[ref.item_id] = intermediates.get(ref.item_id, 0) + ref.count
+            for key, value in unit_raw.items():
+                raw[key] = raw.get(key, 0) + value * ref.count
+            for key, value in unit_intermediates.items():
+                intermediates[key] = intermediates.get(key, 0) + value * ref.count
+        return raw, intermediates
+
+
+def quantity(value: Fraction) -> int | float:
+    return int(value) if value.denominator == 1 else round(float(value), 4)
+
+
+@phase("extract")
+def build_recipe_bom(recipes: list[RecipeRecord]) -> dict[str, Any]:
+    graph = RecipeGraph(recipes)
+    item_rows: list[list[Any]] = []
+    item_indices: dict[str, int] = {}
+    refs: dict[str, IngredientRef] = {}
+    for recipe in recipes:
+        for ref in recipe.items_consumed + recipe.items_created:
+            refs.setdefault(ref.item_id, ref)
+
+    def rows(amounts: dict[str, Fraction]) -> list[list[Any]]:
+        result = []
+        for item_id in sorted(amounts):
+            index = item_indices.get(item_id)
+            if index is None:
+                index = len(item_rows)
+                item_indices[item_id] = index
+                ref = refs.get(item_id)
+                item_rows.append(
+                    [item_id, ref.display_name, ref.persistence_id, ref.icon]
+                    if ref
+                    else [item_id, item_id, "", ""]
+                )
+            result.append([index, quantity(amounts[item_id])])
+        return result
+
+    boms: dict[str, dict[str, Any]] = {}
+    for recipe in recipes:
+        raw, intermediates = graph.expand(recipe.items_consumed)
+        boms[recipe.name] = {"raw": rows(raw), "intermediates": rows(intermediates)}
+    return {
+        "version": 1,
+        "fields": BOM_FIELDS,
+        "items": item_rows,
+        "recipes": boms,
+        "cyclic": sorted(graph.cyclic),
+    }
+
+
+def write_recipe_bom(
+    path: Path, recipes: list[RecipeRecord], compact: bool = True, precompress: bool = False
+) -> bool:
+    bom = build_recipe_bom(recipes)
+    if bom["cyclic"]:
+        print(f"[INFO] Items on crafting cycles (kept as raw): {len(bom['cyclic'])}")
+    return write_catalog(path, bom, compact, precompress)
@@ -0,0 +1,88 @@
+import sys
+from dataclasses import dataclass, field
+from typing import Any
+
+
+# Slotted records for the catalog builders. Parse workers return these (and
+# the build cache pickles them), so changing a field means bumping the cache
+# namespaces that store them.
+
+# (TableId or Namespace, Key) of an exported FText, for per-locale output.
+TextRef = tuple[str, str]
+
+
+@dataclass(slots=True)
+class ItemRecord:
+    item_id: str
+    display_name: str
+    persistence_id: str = ""
+    internal_name: str = ""
+    icon_object: str = ""
+    name_ref: TextRef | None = None
+    # Staged icon file name, filled in by the builder that copies icons.
+    icon: str = ""
+
+
+@dataclass(slots=True)
+class IngredientRef:
+    item_id: str
+    count: Any = 1
+    # Resolved against the item lookup in the parent process; None when the
+    # referenced item is unknown.
+    item: ItemRecord | None = None
+    icon: str = ""
+
+    @property
+    def display_name(self) -> str:
+        return self.item.display_name if self.item else self.item_id
+
+    @property
+    def persistence_id(self) -> str:
+        return self.item.persistence_id if self.item else ""
+
+
+@dataclass(slots=True)
+class RecipeRecord:
+    name: str
+    internal_name: str
+    persistence_id: str
+    row_name: str
+    items_consumed: list[IngredientRef] = field(default_factory=list)
+    items_created: list[IngredientRef] = field(default_factory=list)
+    display_name: str = ""
+    icon: str = ""
+    # The created item the display name comes from.
+    display_item: ItemRecord | None = None
+
+
+@dataclass(slots=True)
+class SpellRecord:
+    persistence_id: str
+    display_name: str
+    requirements: str
+    cooldown: Any
+    spell_icon_object: str
+    spell_tag_object: str
+    internal_name: str
+    costs: list[IngredientRef] = field(default_factory=list)
+    display_ref: TextRef | None = None
+    requirements_ref: TextRef | None = None
+    spell_icon: str = ""
+    spell_tag_icon: str = ""
+
+
+def intern_item(record: ItemRecord) -> ItemRecord:
+    # Records arrive unpickled from workers or the cache, one string object per
+    # record; interning lets every recipe and spell share the same ids.
+    record.item_id = sys.intern(record.item_id)
+    record.display_name = sys.intern(record.display_name)
+    return record
+
+
+def resolve_refs(refs: list[IngredientRef], lookup: dict[str, ItemRecord]) -> list[IngredientRef]:
+    for ref in refs:
+        item = lookup.get(ref.item_id)
+        ref.item = item
+        ref.item_id = item.item_id if item else sys.intern(ref.item_id)
+        ref.icon = item.icon if item else ""
+    return refs
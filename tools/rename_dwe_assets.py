@@ -1,10 +1,19 @@
 import argparse
 import json
+import os
 import re
 from pathlib import Path
+from typing import Any
+
+import json_codec
+from build_metrics import add_metrics_argument, count, phase, write_metrics
+from file_ops import encode_text, write_bytes_if_changed, write_text_if_changed
 
 
 INVALID_CHARS = re.compile(r'[\\/:*?"<>|]')
+SUFFIX_PATTERN = re.compile(r"^(.*) \((\d+)\)$")
+# Not *.json, so a leftover journal is never picked up as an asset.
+JOURNAL_NAME = ".rename-journal.jsonl"
 
 
 def sanitize_filename(name: str) -> str:
@@ -15,17 +24,229 @@ def sanitize_filename(name: str) -> str:
     return name or "item"
 
 
-def unique_base_name(base: str, used: set[str]) -> str:
-    if base not in used:
-        used.add(base)
-        return base
-    idx = 2
-    while True:
+class FolderNames:
+    # Stems taken in one folder. next_index[base] is the lowest " (n)" suffix
+    # that may be free; every suffix below it is taken, so repeated names pick
+    # up where the last one stopped instead of probing from (2) again.
+    def __init__(self, used: set[str]) -> None:
+        self.used = used
+        self.next_index: dict[str, int] = {}
+
+    def release(self, stem: str) -> None:
+        self.used.discard(stem)
+        match = SUFFIX_PATTERN.match(stem)
+        if match:
+            base, idx = match.group(1), int(match.group(2))
+            if idx < self.next_index.get(base, 2):
+                self.next_index[base] = idx
+
+    def claim(self, base: str) -> str:
+        if base not in self.used:
+            self.used.add(base)
+            return base
+        idx = self.next_index.get(base, 2)
+        while f"{base} ({idx})" in self.used:
+            idx += 1
+        self.next_index[base] = idx + 1
         candidate = f"{base} ({idx})"
-        if candidate not in used:
-            used.add(candidate)
-            return candidate
-        idx += 1
+        self.used.add(candidate)
+        return candidate
+
+
+def plan_folder(
+    root: Path, folder: Path, files: list[Path], steps: list[dict[str, Any]], stats: dict[str, int]
+) -> None:
+    # Appends the folder's renames/rewrites to steps, in the order they must run.
+    # Files are tracked as they would be after each planned step, so a new name
+    # never lands on a file that has not moved out of the way yet.
+    with phase("scan"):
+        present = {p for p in folder.iterdir() if p.is_file()}
+    names = FolderNames({p.stem for p in present if p.suffix.lower() in {".json", ".png"}})
+
+    def rel(path: Path) -> str:
+        return path.relative_to(root).as_posix()
+
+    for json_path in sorted(files):
+        raw = json_path.read_bytes()
+        count("files_read")
+        count("bytes_read", len(raw))
+        try:
+            with phase("parse"):
+                data = json_codec.loads(raw)
+        except json.JSONDecodeError as exc:
+            print(f"[WARN] JSON parse failed: {json_path} ({exc})")
+            stats["warnings"] += 1
+            continue
+
+        if not isinstance(data, dict):
+            print(f"[WARN] Unexpected JSON shape: {json_path}")
+            stats["warnings"] += 1
+            continue
+
+        name = data.get("name", "").strip()
+        if not name:
+            icon_fallback = Path(data.get("icon", "")).stem
+            name = icon_fallback or json_path.stem
+            data["name"] = name
+            stats["warnings"] += 1
+            print(f"[WARN] Missing name patched: {json_path} -> {name}")
+
+        icon_name = data.get("icon", "").strip()
+        icon_path = folder / icon_name if icon_name else None
+        icon_ext = Path(icon_name).suffix if icon_name else ".png"
+        icon_exists = icon_path is not None and (
+            icon_path in present or (icon_path.parent != folder and icon_path.exists())
+        )
+        names.release(json_path.stem)
+        if icon_name:
+            names.release(Path(icon_name).stem)
+
+        sanitized = sanitize_filename(name)
+        while True:
+            # A claimed stem stays taken, so a retry moves on to the next suffix.
+            base = names.claim(sanitized)
+            new_json_path = folder / f"{base}.json"
+            new_icon_path = folder / f"{base}{icon_ext}"
+            taken = (new_json_path in present and new_json_path != json_path) or (
+                icon_exists and new_icon_path in present and new_icon_path != icon_path
+            )
+            if not taken:
+                break
+
+        if icon_exists:
+            # Compare names, not Paths: WindowsPath equality ignores case, and a
+            # case-only rename still has to happen.
+            if icon_path.name != new_icon_path.name:
+                steps.append({"op": "rename", "src": rel(icon_path), "dst": rel(new_icon_path)})
+                present.discard(icon_path)
+                present.add(new_icon_path)
+                stats["renamed_img"] += 1
+            data["icon"] = new_icon_path.name
+        else:
+            # Keep placeholder if missing.
+            data["icon"] = data.get("icon", "")
+
+        if json_path.name != new_json_path.name:
+            steps.append({"op": "rename", "src": rel(json_path), "dst": rel(new_json_path)})
+            present.discard(json_path)
+            present.add(new_json_path)
+            stats["renamed_json"] += 1
+
+        with phase("serialize"):
+            text = json_codec.dumps(data)
+        if encode_text(text) != raw:
+            # The original bytes are kept so a rollback restores them exactly.
+            steps.append(
+                {
+                    "op": "write",
+                    "path": rel(new_json_path),
+                    "text": text,
+                    "original": raw.decode("utf-8", "surrogateescape"),
+                }
+            )
+        stats["total"] += 1
+
+
+def write_journal(journal: Path, steps: list[dict[str, Any]]):
+    # Line 1 holds the whole plan; each finished step appends its index.
+    handle = journal.open("w", encoding="utf-8")
+    handle.write(json_codec.dumps({"steps": steps}, indent=None) + "\n")
+    handle.flush()
+    return handle
+
+
+def read_journal(journal: Path) -> tuple[list[dict[str, Any]], int]:
+    lines = journal.read_text(encoding="utf-8").splitlines()
+    steps = json_codec.loads(lines[0])["steps"]
+    done = 0
+    for line in lines[1:]:
+        try:
+            # max() so a line cut short by a crash can't move progress back.
+            done = max(done, int(line) + 1)
+        except ValueError:
+            break
+    return steps, done
+
+
+def case_temp_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.rename-tmp")
+
+
+def same_file(src: Path, dst: Path) -> bool:
+    # True when dst is src under other casing on a case-insensitive filesystem.
+    if src.name.casefold() != dst.name.casefold():
+        return False
+    try:
+        return os.path.samefile(src, dst)
+    except OSError:
+        return False
+
+
+def rename_file(src: Path, dst: Path) -> None:
+    # On a case-insensitive filesystem dst of a case-only rename (Foo -> foo) is
+    # src itself, so it goes through a temporary name.
+    temp = case_temp_path(src)
+    with phase("write"):
+        if temp.exists() and not src.exists():
+            # Interrupted halfway through a case-only rename.
+            temp.rename(dst)
+        elif same_file(src, dst):
+            src.rename(temp)
+            temp.rename(dst)
+        else:
+            src.rename(dst)
+
+
+def apply_steps(root: Path, steps: list[dict[str, Any]], start: int, log, resuming: bool) -> int:
+    rewritten = 0
+    for index in range(start, len(steps)):
+        step = steps[index]
+        if step["op"] == "rename":
+            src = root / step["src"]
+            dst = root / step["dst"]
+            if resuming and index == start and dst.exists() and not src.exists():
+                # Finished just before the interruption, but never logged.
+                pass
+            elif dst.exists() and not same_file(src, dst):
+                raise FileExistsError(f"Rename target already exists: {dst}")
+            else:
+                rename_file(src, dst)
+        elif write_text_if_changed(root / step["path"], step["text"]):
+            rewritten += 1
+        log.write(f"{index}\n")
+        log.flush()
+    return rewritten
+
+
+def rollback_steps(root: Path, steps: list[dict[str, Any]], done: int) -> int:
+    # Undo newest first. Step `done` may have landed without being logged,
+    # so it is undone too when the files show it happened.
+    undone = 0
+    for index in range(min(done, len(steps) - 1), -1, -1):
+        step = steps[index]
+        if step["op"] == "rename":
+            src = root / step["src"]
+            dst = root / step["dst"]
+            if (dst.exists() or case_temp_path(dst).exists()) and (
+                not src.exists() or same_file(src, dst)
+            ):
+                rename_file(dst, src)
+                undone += 1
+            elif index < done:
+                print(f"[WARN] Cannot undo rename, {dst} is missing or {src} exists")
+        else:
+            path = root / step["path"]
+            if path.exists() and write_bytes_if_changed(
+                path, step["original"].encode("utf-8", "surrogateescape")
+            ):
+                undone += 1
+    return undone
+
+
+def describe_step(root: Path, step: dict[str, Any]) -> str:
+    if step["op"] == "rename":
+        return f"{root / step['src']} -> {root / step['dst']}"
+    return f"write {root / step['path']}"
 
 
 def main() -> int:
@@ -37,19 +258,55 @@ def main() -> int:
         default="Table",
         help="Root directory containing asset folders (default: Table).",
     )
-    parser.add_argument(
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
         "--dry-run",
         action="store_true",
         help="Print planned renames without changing files.",
     )
+    mode.add_argument(
+        "--resume",
+        action="store_true",
+        help=f"Finish an interrupted run recorded in <root>/{JOURNAL_NAME}.",
+    )
+    mode.add_argument(
+        "--rollback",
+        action="store_true",
+        help=f"Undo an interrupted run recorded in <root>/{JOURNAL_NAME}.",
+    )
+    add_metrics_argument(parser)
     args = parser.parse_args()
 
     root = Path(args.root)
     if not root.exists():
         print(f"[ERROR] Root not found: {root}")
         return 1
+    journal = root / JOURNAL_NAME
+
+    if args.resume or args.rollback:
+        if not journal.exists():
+            print(f"[ERROR] No rename journal found: {journal}")
+            return 1
+        steps, done = read_journal(journal)
+        if args.rollback:
+            undone = rollback_steps(root, steps, done)
+            journal.unlink()
+            print(f"[INFO] Rolled back {undone} of {len(steps)} planned steps")
+        else:
+            print(f"[INFO] Resuming at step {done + 1} of {len(steps)}")
+            with journal.open("a", encoding="utf-8") as log:
+                apply_steps(root, steps, done, log, resuming=True)
+            journal.unlink()
+            print(f"[INFO] Rename finished: {len(steps)} steps")
+        write_metrics(args.metrics_out, "rename_dwe_assets")
+        return 0
+
+    if journal.exists():
+        print(f"[ERROR] Unfinished rename journal: {journal} (rerun with --resume or --rollback)")
+        return 1
 
-    json_files = sorted(root.rglob("*.json"))
+    with phase("scan"):
+        json_files = sorted(root.rglob("*.json"))
     if not json_files:
         print(f"[WARN] No json files found under: {root}")
         return 0
@@ -61,89 +318,33 @@ def main() -> int:
             continue
         folder_map.setdefault(json_path.parent, []).append(json_path)
 
-    total = 0
-    renamed_json = 0
-    renamed_img = 0
-    warnings = 0
-
+    # Plan everything before touching a file, so a bad JSON or a crash can't
+    # leave a folder half-renamed with stale icon references.
+    stats = {"total": 0, "renamed_json": 0, "renamed_img": 0, "warnings": 0}
+    steps: list[dict[str, Any]] = []
     for folder, files in folder_map.items():
-        used_names = {
-            p.stem
-            for p in folder.iterdir()
-            if p.is_file() and p.suffix.lower() in {".json", ".png"}
-        }
+        plan_folder(root, folder, files, steps, stats)
 
-        for json_path in sorted(files):
+    rewritten_json = 0
+    if args.dry_run:
+        for step in steps:
+            print(f"[DRYRUN] {describe_step(root, step)}")
+    elif steps:
+        with write_journal(journal, steps) as log:
             try:
-                data = json.loads(json_path.read_text(encoding="utf-8"))
-            except json.JSONDecodeError as exc:
-                print(f"[WARN] JSON parse failed: {json_path} ({exc})")
-                warnings += 1
-                continue
-
-            if not isinstance(data, dict):
-                print(f"[WARN] Unexpected JSON shape: {json_path}")
-                warnings += 1
-                continue
-
-            name = data.get("name", "").strip()
-            if not name:
-                icon_fallback = Path(data.get("icon", "")).stem
-                name = icon_fallback or json_path.stem
-                data["name"] = name
-                warnings += 1
-                print(f"[WARN] Missing name patched: {json_path} -> {name}")
-
-            icon_name = data.get("icon", "").strip()
-            icon_path = folder / icon_name if icon_name else None
-            icon_ext = Path(icon_name).suffix if icon_name else ".png"
-            current_json_stem = json_path.stem
-            current_icon_stem = Path(icon_name).stem if icon_name else None
-            used_names.discard(current_json_stem)
-            if current_icon_stem:
-                used_names.discard(current_icon_stem)
-
-            base = sanitize_filename(name)
-            base = unique_base_name(base, used_names)
-            new_icon_name = f"{base}{icon_ext}"
-            new_icon_path = folder / new_icon_name
-
-            # Rename image if it exists.
-            if icon_path and icon_path.exists():
-                if icon_path.name != new_icon_name:
-                    if args.dry_run:
-                        print(f"[DRYRUN] {icon_path} -> {new_icon_path}")
-                    else:
-                        icon_path.rename(new_icon_path)
-                    renamed_img += 1
-                data["icon"] = new_icon_name
-            else:
-                # Keep placeholder if missing.
-                data["icon"] = data.get("icon", "")
-
-            new_json_name = f"{base}.json"
-            new_json_path = folder / new_json_name
-
-            if json_path.name != new_json_name:
-                if args.dry_run:
-                    print(f"[DRYRUN] {json_path} -> {new_json_path}")
-                else:
-                    json_path.rename(new_json_path)
-                renamed_json += 1
-
-            if args.dry_run:
-                print(f"[DRYRUN] write {new_json_path}")
-            else:
-                new_json_path.write_text(
-                    json.dumps(data, indent=2, ensure_ascii=True), encoding="utf-8"
-                )
-            total += 1
+                rewritten_json = apply_steps(root, steps, 0, log, resuming=False)
+            except (OSError, KeyboardInterrupt) as exc:
+                print(f"[ERROR] Rename interrupted ({exc!r}); rerun with --resume or --rollback")
+                return 1
+        journal.unlink()
 
     print(f"[INFO] Root: {root}")
-    print(f"[INFO] Items processed: {total}")
-    print(f"[INFO] JSON renamed: {renamed_json}")
-    print(f"[INFO] Images renamed: {renamed_img}")
-    print(f"[INFO] Warnings: {warnings}")
+    print(f"[INFO] Items processed: {stats['total']}")
+    print(f"[INFO] JSON renamed: {stats['renamed_json']}")
+    print(f"[INFO] Images renamed: {stats['renamed_img']}")
+    print(f"[INFO] JSON rewritten: {rewritten_json}")
+    print(f"[INFO] Warnings: {stats['warnings']}")
+    write_metrics(args.metrics_out, "rename_dwe_assets")
     return 0
 
 
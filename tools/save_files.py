@@ -0,0 +1,24 @@
+from pathlib import Path
+
+
+# Backups written by transform_saves.py --in-place and the browser editors.
+BACKUP_SUFFIX = "_backup.json"
+
+
+def collect_saves(paths: list[str]) -> list[tuple[Path, Path]]:
+    # (save, root it was found under) so outputs can mirror the folder layout.
+    # Folders skip backups; a backup named on the command line is still used.
+    saves: list[tuple[Path, Path]] = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            saves.extend(
+                (save, path)
+                for save in sorted(path.rglob("*.json"))
+                if not save.name.endswith(BACKUP_SUFFIX)
+            )
+        elif path.exists():
+            saves.append((path, path.parent))
+        else:
+            print(f"[WARN] Save not found: {path}")
+    return saves
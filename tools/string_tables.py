@@ -0,0 +1,341 @@
+import hashlib
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Any
+
+import json_codec
+from build_cache import BuildCache
+from build_metrics import count, load_json_file, phase
+from content_scanner import content_files
+from file_ops import write_bytes_if_changed
+from records import ItemRecord, TextRef
+
+
+# Strings in the ST_*.json tables are the native culture, keyed by TableId
+# (table namespaces may be empty or shared). Other locales come from FModel
+# exports of the localization archives, one folder per culture:
+# <localization dir>/<locale>/*.json holding {namespace: {key: text}}.
+NATIVE_LOCALE = "en"
+# One file per source fingerprint: string_index.<signature[:16]>.bin.
+STRING_INDEX_PREFIX = "string_index."
+INDEX_MAGIC = b"DWSTR001"
+
+
+def text_ref(value: Any) -> TextRef | None:
+    # None for culture invariant or missing text, which never localizes.
+    if not isinstance(value, dict) or not value.get("Key"):
+        return None
+    if value.get("TableId"):
+        return value["TableId"], value["Key"]
+    if "Namespace" in value:
+        return value["Namespace"], value["Key"]
+    return None
+
+
+def table_id(content_root: Path, path: Path) -> str:
+    # Content/Gameplay/Items/ST_ItemNames.json -> /Game/Gameplay/Items/ST_ItemNames.ST_ItemNames
+    rel = path.relative_to(content_root).with_suffix("").as_posix()
+    return f"/Game/{rel}.{path.stem}"
+
+
+def locale_files(localization_dir: Path) -> dict[str, list[Path]]:
+    if not localization_dir.is_dir():
+        return {}
+    return {
+        folder.name: sorted(folder.glob("*.json"))
+        for folder in sorted(localization_dir.iterdir())
+        if folder.is_dir() and folder.name != NATIVE_LOCALE
+    }
+
+
+def sources_signature(table_files: list[Path], locales: dict[str, list[Path]]) -> str:
+    hasher = hashlib.sha1(INDEX_MAGIC)
+    for path in table_files + [path for paths in locales.values() for path in paths]:
+        stat = path.stat()
+        hasher.update(f"{path.as_posix()}:{stat.st_mtime_ns}:{stat.st_size}\n".encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def entry_key(scope: str, key: str) -> bytes:
+    return f"{scope}\0{key}".encode("utf-8")
+
+
+def pack_index(
+    signature: str,
+    tables: dict[str, str],
+    strings: dict[str, dict[bytes, str]],
+) -> bytes:
+    # Layout, little-endian and 4-byte aligned:
+    #   magic, uint32 header length, JSON header,
+    #   (count + 1) uint32 key offsets, then per locale (count + 1) uint32
+    #   value offsets, then the key and value bytes.
+    # Entry i spans offsets[i]:offsets[i + 1]; an empty value means the locale
+    # has no string for that key. Keys are sorted, so lookups bisect in place.
+    keys = sorted({key for entries in strings.values() for key in entries})
+    locales = list(strings)
+    header = {"signature": signature, "count": len(keys), "locales": locales, "tables": tables}
+    header_bytes = json_codec.dumps(header, indent=None).encode("utf-8")
+    header_bytes += b" " * (-(len(INDEX_MAGIC) + 4 + len(header_bytes)) % 4)
+    table_start = len(INDEX_MAGIC) + 4 + len(header_bytes)
+    data_start = table_start + 4 * (len(keys) + 1) * (len(locales) + 1)
+
+    blobs: list[bytes] = []
+    offsets: list[int] = []
+    position = data_start
+    for column in [None, *locales]:
+        entries = strings[column] if column else {}
+        for key in keys:
+            offsets.append(position)
+            value = key if column is None else entries.get(key, "").encode("utf-8")
+            blobs.append(value)
+            position += len(value)
+        offsets.append(position)
+    return b"".join(
+        [
+            INDEX_MAGIC,
+            struct.pack("<I", len(header_bytes)),
+            header_bytes,
+            struct.pack(f"<{len(offsets)}I", *offsets),
+            *blobs,
+        ]
+    )
+
+
+def read_header(buffer: Any) -> tuple[dict[str, Any], int] | None:
+    # None for anything that is not a whole index (empty, truncated, foreign).
+    header_start = len(INDEX_MAGIC) + 4
+    if len(buffer) < header_start or buffer[: len(INDEX_MAGIC)] != INDEX_MAGIC:
+        return None
+    (header_length,) = struct.unpack_from("<I", buffer, len(INDEX_MAGIC))
+    table_start = header_start + header_length
+    if table_start > len(buffer):
+        return None
+    try:
+        header = json_codec.loads(bytes(buffer[header_start:table_start]))
+    except ValueError:
+        return None
+    if not isinstance(header, dict) or not {"signature", "count", "locales", "tables"} <= header.keys():
+        return None
+    # The last value offset is the end of the data, so it must match the size.
+    table_end = table_start + 4 * (len(header["locales"]) + 1) * (header["count"] + 1)
+    if table_end > len(buffer) or struct.unpack_from("<I", buffer, table_end - 4)[0] != len(buffer):
+        return None
+    return header, table_start
+
+
+class StringIndex:
+    def __init__(self, buffer: Any, header: tuple[dict[str, Any], int]) -> None:
+        # buffer is an mmap of the index file, or the packed bytes when the
+        # build cache is disabled. Nothing is copied out of it up front.
+        self._buffer = buffer
+        header, table_start = header
+        self.signature: str = header["signature"]
+        self.count: int = header["count"]
+        self.locales: list[str] = header["locales"]
+        self.tables: dict[str, str] = header["tables"]
+        columns = len(self.locales) + 1
+        table = memoryview(buffer)[table_start : table_start + 4 * columns * (self.count + 1)]
+        if sys.byteorder == "little":
+            self._offsets = table.cast("I")
+        else:
+            self._offsets = struct.unpack(f"<{columns * (self.count + 1)}I", table)
+
+    def _find(self, key: bytes) -> int:
+        offsets = self._offsets
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._buffer[offsets[middle] : offsets[middle + 1]] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._buffer[offsets[low] : offsets[low + 1]] == key:
+            return low
+        return -1
+
+    def get(self, locale: str, ref: TextRef) -> str | None:
+        if locale not in self.locales:
+            return None
+        scope, key = ref
+        if locale != NATIVE_LOCALE:
+            scope = self.tables.get(scope, scope)
+        index = self._find(entry_key(scope, key))
+        if index < 0:
+            return None
+        start = (self.locales.index(locale) + 1) * (self.count + 1) + index
+        begin, end = self._offsets[start], self._offsets[start + 1]
+        if begin == end:
+            return None
+        return bytes(self._buffer[begin:end]).decode("utf-8")
+
+
+def read_string_tables(
+    content_root: Path, table_files: list[Path]
+) -> tuple[dict[str, str], dict[bytes, str]]:
+    tables: dict[str, str] = {}
+    strings: dict[bytes, str] = {}
+    for path in table_files:
+        try:
+            data = load_json_file(path)
+        except ValueError as exc:
+            print(f"[WARN] JSON parse failed: {path} ({exc})")
+            continue
+        for entry in data if isinstance(data, list) else []:
+            table = entry.get("StringTable") if isinstance(entry, dict) else None
+            if not isinstance(table, dict):
+                continue
+            table_key = table_id(content_root, path)
+            tables[table_key] = table.get("TableNamespace") or ""
+            for key, value in (table.get("KeysToEntries") or {}).items():
+                strings[entry_key(table_key, key)] = value
+    return tables, strings
+
+
+def read_locale(paths: list[Path]) -> dict[bytes, str]:
+    strings: dict[bytes, str] = {}
+    for path in paths:
+        try:
+            data = load_json_file(path)
+        except ValueError as exc:
+            print(f"[WARN] JSON parse failed: {path} ({exc})")
+            continue
+        if not isinstance(data, dict):
+            print(f"[WARN] Unexpected localization JSON: {path}")
+            continue
+        for namespace, entries in data.items():
+            if not isinstance(entries, dict):
+                continue
+            for key, value in entries.items():
+                if isinstance(value, str) and value:
+                    strings[entry_key(namespace, key)] = value
+    return strings
+
+
+def map_index(path: Path, signature: str) -> StringIndex | None:
+    try:
+        with path.open("rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # ValueError: mmap of an empty file.
+        return None
+    header = read_header(mapped)
+    if header is None or header[0]["signature"] != signature:
+        mapped.close()
+        return None
+    return StringIndex(mapped, header)
+
+
+def remove_old_indexes(index_path: Path) -> None:
+    # string_index*.bin also catches the single string_index.bin of older runs.
+    for path in index_path.parent.glob("string_index*.bin"):
+        if path != index_path:
+            try:
+                path.unlink()
+            except OSError:
+                # Still mapped by another stage (Windows); the next run retries.
+                pass
+
+
+@phase("extract")
+def load_string_index(
+    content_root: Path, localization_dir: Path, cache: BuildCache | None = None
+) -> StringIndex:
+    # The index is rebuilt only when a string table or localization export
+    # changed; otherwise the cached file is mapped as is.
+    table_files = content_files(content_root, "ST_", cache)
+    locales = locale_files(localization_dir)
+    signature = sources_signature(table_files, locales)
+    # Concurrent stages building from the same sources write identical bytes to
+    # the same file, and a content change picks a new name, so a file another
+    # process has mapped is never replaced underneath it.
+    index_path = (
+        cache.path.parent / f"{STRING_INDEX_PREFIX}{signature[:16]}.bin" if cache is not None else None
+    )
+    if index_path is not None and index_path.exists():
+        index = map_index(index_path, signature)
+        if index is not None:
+            count("string_index_reused")
+            return index
+        print(f"[WARN] String index unreadable, rebuilding: {index_path}")
+
+    tables, native = read_string_tables(content_root, table_files)
+    strings = {NATIVE_LOCALE: native}
+    for locale, paths in locales.items():
+        strings[locale] = read_locale(paths)
+    packed = pack_index(signature, tables, strings)
+    print(
+        f"[INFO] String index: {len(tables)} tables, "
+        + ", ".join(f"{locale} {len(entries)}" for locale, entries in strings.items())
+    )
+    if index_path is None:
+        return StringIndex(packed, read_header(packed))
+    try:
+        write_bytes_if_changed(index_path, packed)
+    except OSError as exc:
+        print(f"[WARN] String index not saved ({exc}); using it from memory")
+        return StringIndex(packed, read_header(packed))
+    remove_old_indexes(index_path)
+    return map_index(index_path, signature) or StringIndex(packed, read_header(packed))
+
+
+class LocaleStrings:
+    # One locale's view of the index. Text the locale does not have keeps the
+    # string the export itself carried.
+    def __init__(self, index: StringIndex, locale: str) -> None:
+        self.index = index
+        self.locale = locale
+        self.missing: set[TextRef] = set()
+
+    def text(self, ref: TextRef | None, fallback: str) -> str:
+        if ref is None:
+            return fallback
+        value = self.index.get(self.locale, ref)
+        if value is None:
+            self.missing.add(ref)
+            return fallback
+        return value
+
+    def item_name(self, item: ItemRecord | None, fallback: str) -> str:
+        return self.text(item.name_ref, fallback) if item else fallback
+
+
+def add_locale_arguments(parser: Any) -> None:
+    parser.add_argument(
+        "--locales",
+        nargs="+",
+        default=[],
+        help=f"Also write a catalog per locale (e.g. {NATIVE_LOCALE} de fr), "
+        "named <output>.<locale>.json.",
+    )
+    parser.add_argument(
+        "--localization-dir",
+        help="Folder with one <locale>/*.json localization export per culture "
+        "(default: <content root>/Localization/Game).",
+    )
+
+
+def open_locales(
+    args: Any, content_root: Path, cache: BuildCache | None
+) -> list[LocaleStrings]:
+    if not args.locales:
+        return []
+    localization_dir = (
+        Path(args.localization_dir)
+        if args.localization_dir
+        else content_root / "Localization" / "Game"
+    )
+    index = load_string_index(content_root, localization_dir, cache)
+    for locale in args.locales:
+        if locale not in index.locales:
+            print(f"[WARN] No strings for locale {locale} in {localization_dir}; source text is used")
+    return [LocaleStrings(index, locale) for locale in dict.fromkeys(args.locales)]
+
+
+def locale_path(path: Path, locale: str) -> Path:
+    return path.with_name(f"{path.stem}.{locale}{path.suffix}")
+
+
+def report_locale(strings: LocaleStrings, path: Path) -> None:
+    print(f"[INFO] Locale {strings.locale}: {path} ({len(strings.missing)} texts untranslated)")
@@ -1,13 +1,19 @@
 import argparse
-import shutil
 from pathlib import Path
 
+from build_cache import DEFAULT_CACHE_DIR, DirectoryIndex, FileDigests, add_cache_arguments, open_cache
+from build_metrics import add_metrics_argument, count, phase, write_metrics
+from file_ops import add_link_arguments, place_files
 
-def build_asset_index(assets_root: Path) -> dict[str, list[Path]]:
+
+ICON_EXCEPTION_DIRS = ["AmmoTab", "BagTab/Consumables/Burnt Food"]
+
+
+@phase("scan")
+def build_asset_index(assets_root: Path, asset_files: list[str]) -> dict[str, list[Path]]:
     index: dict[str, list[Path]] = {}
-    for path in assets_root.rglob("*"):
-        if not path.is_file():
-            continue
+    for rel_path in asset_files:
+        path = assets_root / rel_path
         if path.name.lower() == "desktop.ini":
             continue
         if path.suffix.lower() not in {".json", ".png"}:
@@ -17,27 +23,36 @@ def build_asset_index(assets_root: Path) -> dict[str, list[Path]]:
     return index
 
 
-def build_icon_exceptions(assets_root: Path) -> set[str]:
+@phase("scan")
+def build_icon_exceptions(assets_root: Path, asset_files: list[str]) -> set[str]:
     exceptions: set[str] = set()
-    exception_dirs = [
-        assets_root / "AmmoTab",
-        assets_root / "BagTab" / "Consumables" / "Burnt Food",
-    ]
-    for folder in exception_dirs:
-        if not folder.exists():
-            print(f"[WARN] Exception folder not found: {folder}")
+    for folder in ICON_EXCEPTION_DIRS:
+        if not (assets_root / folder).is_dir():
+            print(f"[WARN] Exception folder not found: {assets_root / folder}")
             continue
-        for path in folder.rglob("*.png"):
-            if path.is_file() and path.name.lower() != "desktop.ini":
-                exceptions.add(path.name.lower())
+        prefix = folder + "/"
+        for rel_path in asset_files:
+            if rel_path.startswith(prefix) and rel_path.lower().endswith(".png"):
+                exceptions.add(rel_path.rsplit("/", 1)[-1].lower())
     return exceptions
 
 
+def same_bytes(source: Path, target: Path, digests: FileDigests) -> bool:
+    # Sizes first; digests are cached by stat signature, so an untouched
+    # asset is only hashed once across runs.
+    if source.stat().st_size != target.stat().st_size:
+        return False
+    return digests.digest(source) == digests.digest(target)
+
+
 def sync_table_to_assets(
     table_root: Path,
     assets_root: Path,
     dry_run: bool,
     delete_matched: bool,
+    link_mode: str = "copy",
+    cache_dir: str | None = str(DEFAULT_CACHE_DIR),
+    threads: int = 4,
 ) -> int:
     if not table_root.exists():
         print(f"[ERROR] Table not found: {table_root}")
@@ -45,58 +60,90 @@ def sync_table_to_assets(
     if not assets_root.exists():
         print(f"[ERROR] Assets not found: {assets_root}")
         return 1
+    if delete_matched and link_mode == "symlink":
+        print("[ERROR] --link-mode symlink cannot be combined with --delete-matched")
+        return 1
 
-    asset_index = build_asset_index(assets_root)
-    icon_exceptions = build_icon_exceptions(assets_root)
-    table_files = [
-        path
-        for path in sorted(table_root.rglob("*"))
-        if path.is_file()
-        and path.name.lower() != "desktop.ini"
-        and path.suffix.lower() in {".json", ".png"}
-    ]
-
-    replaced = 0
-    deleted = 0
-    missing = 0
-    multi_match = 0
-    skipped_icons = 0
-
-    for table_file in table_files:
-        targets = asset_index.get(table_file.name.lower(), [])
-        if not targets:
-            missing += 1
-            print(f"[WARN] No asset match for: {table_file}")
-            continue
-        if len(targets) > 1:
-            multi_match += 1
-            print(f"[WARN] Multiple asset matches for: {table_file.name}")
-        if table_file.suffix.lower() == ".png" and table_file.name.lower() in icon_exceptions:
-            skipped_icons += len(targets)
-            print(f"[INFO] Skipping protected icon: {table_file.name}")
-            continue
-        for target in targets:
-            if dry_run:
-                print(f"[DRYRUN] {table_file} -> {target}")
-            else:
-                shutil.copy2(table_file, target)
-            replaced += 1
-        if delete_matched:
-            if dry_run:
-                print(f"[DRYRUN] delete {table_file}")
-            else:
-                table_file.unlink()
-            deleted += 1
+    cache = open_cache(cache_dir, cache_dir is not None)
+    tree = DirectoryIndex(assets_root, cache.connection if cache else None)
+    digests = cache.digests if cache else FileDigests()
+    try:
+        with phase("scan"):
+            asset_files = tree.files()
+        asset_index = build_asset_index(assets_root, asset_files)
+        icon_exceptions = build_icon_exceptions(assets_root, asset_files)
+        with phase("scan"):
+            table_files = [
+                path
+                for path in sorted(table_root.rglob("*"))
+                if path.is_file()
+                and path.name.lower() != "desktop.ini"
+                and path.suffix.lower() in {".json", ".png"}
+            ]
+
+        replaced = 0
+        unchanged = 0
+        deleted = 0
+        missing = 0
+        multi_match = 0
+        skipped_icons = 0
+        copies: list[tuple[Path, Path]] = []
+        to_delete: list[Path] = []
+
+        for table_file in table_files:
+            targets = asset_index.get(table_file.name.lower(), [])
+            if not targets:
+                missing += 1
+                print(f"[WARN] No asset match for: {table_file}")
+                continue
+            if len(targets) > 1:
+                multi_match += 1
+                print(f"[WARN] Multiple asset matches for: {table_file.name}")
+            if table_file.suffix.lower() == ".png" and table_file.name.lower() in icon_exceptions:
+                skipped_icons += len(targets)
+                print(f"[INFO] Skipping protected icon: {table_file.name}")
+                continue
+            for target in targets:
+                # Links are checked by place_file itself; copies of identical
+                # bytes are skipped here.
+                if link_mode in ("copy", "reflink") and same_bytes(table_file, target, digests):
+                    unchanged += 1
+                    count("files_unchanged")
+                    continue
+                if dry_run:
+                    print(f"[DRYRUN] {table_file} -> {target}")
+                else:
+                    copies.append((table_file, target))
+                replaced += 1
+            if delete_matched:
+                if dry_run:
+                    print(f"[DRYRUN] delete {table_file}")
+                else:
+                    to_delete.append(table_file)
+                deleted += 1
+
+        if copies:
+            place_files(copies, link_mode, threads)
+        # Only after every copy has landed, so a failed copy keeps its source.
+        for table_file in to_delete:
+            table_file.unlink()
+    finally:
+        # Digests and folder listings gathered so far stay valid if a copy fails.
+        tree.flush()
+        if cache is not None:
+            cache.close()
 
     print(f"[INFO] Table root: {table_root}")
     print(f"[INFO] Assets root: {assets_root}")
     print(f"[INFO] Table files scanned: {len(table_files)}")
     print(f"[INFO] Files replaced: {replaced}")
+    print(f"[INFO] Files already identical: {unchanged}")
     if delete_matched:
         print(f"[INFO] Table files deleted: {deleted}")
     print(f"[INFO] Missing matches: {missing}")
     print(f"[INFO] Multiple matches: {multi_match}")
     print(f"[INFO] Protected icons skipped: {skipped_icons}")
+    print(f"[INFO] Asset folders listed: {tree.listed}, reused from cache: {tree.reused}")
     return 0
 
 
@@ -124,14 +171,33 @@ def main() -> int:
         action="store_true",
         help="Delete Table files after they successfully replace assets.",
     )
+    add_link_arguments(parser, "matched files are placed")
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=4,
+        help="Threads used to copy files (default: 4).",
+    )
+    add_cache_arguments(
+        parser,
+        "the asset folder index and file digests",
+        "List the whole assets tree instead of reusing the cached index.",
+    )
+    add_metrics_argument(parser)
     args = parser.parse_args()
 
-    return sync_table_to_assets(
+    result = sync_table_to_assets(
         Path(args.table),
         Path(args.assets),
         args.dry_run,
         args.delete_matched,
+        args.link_mode,
+        None if args.no_cache else args.cache_dir,
+        args.threads,
     )
+    if result == 0:
+        write_metrics(args.metrics_out, "sync_table_to_assets")
+    return result
 
 
 if __name__ == "__main__":
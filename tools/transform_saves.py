@@ -0,0 +1,280 @@
+import argparse
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+import json_codec
+from build_metrics import add_metrics_argument, count, load_json_file, phase, write_metrics
+from catalog_categories import recipe_category as shard_category
+from file_ops import write_bytes_if_changed
+from parse_pool import add_parse_arguments, parse_files
+from save_files import BACKUP_SUFFIX, collect_saves
+
+
+# Catalog kind -> (Progress list of unlocked ids, Progress list of "new" badges).
+PROGRESS_KEYS = {
+    "recipes": ("RecipesUnlocked", "RecipesNew"),
+    "spells": ("SpellsUnlocked", "SpellsNew"),
+}
+# The spell bar: a fixed number of slots holding spell persistence ids, "" when empty.
+SELECTED_SPELLS = ("Spellcasting", "SelectedSpells")
+OP_PATTERN = re.compile(r"^(unlock|clear-new|clear-selected)-(recipes|spells)(?:=(.+))?$")
+SPELL_TAG_PATTERN = re.compile(r"^T_Icon_Tag_Skill_(.+)\.png$")
+
+_decoder = json.JSONDecoder()
+_CATALOGS: dict[tuple[Path, Path], dict[str, dict[str, list[str]]]] = {}
+
+
+def recipe_category(recipe: dict[str, Any]) -> str:
+    # Same rule as the recipe catalog shards: RECIPE_Armour_T3_Legs_Bronze -> Armour,
+    # RECIPE_Torch -> Torch.
+    return shard_category(str(recipe.get("name", "")))
+
+
+def spell_category(spell: dict[str, Any]) -> str:
+    # T_Icon_Tag_Skill_Construction.png -> Construction
+    match = SPELL_TAG_PATTERN.match(spell.get("spell_tag_icon") or "")
+    return match.group(1) if match else "Other"
+
+
+def load_catalogs(recipes_path: Path, spells_path: Path) -> dict[str, dict[str, list[str]]]:
+    # kind -> category -> persistence ids in catalog order; "" holds every id.
+    # Built once per process, like the validator's item index.
+    key = (recipes_path.resolve(), spells_path.resolve())
+    catalogs = _CATALOGS.get(key)
+    if catalogs is not None:
+        return catalogs
+    catalogs = {}
+    for kind, path, category_of in (
+        ("recipes", recipes_path, recipe_category),
+        ("spells", spells_path, spell_category),
+    ):
+        categories: dict[str, list[str]] = {"": []}
+        seen: set[str] = set()
+        for entry in load_json_file(path):
+            persistence_id = entry.get("persistence_id")
+            if not persistence_id or persistence_id in seen:
+                continue
+            seen.add(persistence_id)
+            categories[""].append(persistence_id)
+            categories.setdefault(category_of(entry), []).append(persistence_id)
+        catalogs[kind] = categories
+    _CATALOGS[key] = catalogs
+    return catalogs
+
+
+def parse_op(raw: str) -> tuple[str, str, tuple[str, ...]]:
+    match = OP_PATTERN.match(raw)
+    if not match:
+        raise ValueError(f"Unknown operation: {raw}")
+    action, kind, categories = match.groups()
+    if action == "clear-selected" and kind != "spells":
+        raise ValueError(f"Only spells can be selected: {raw}")
+    if categories and action == "clear-new":
+        raise ValueError(f"Categories do not apply to clear-new operations: {raw}")
+    names = tuple(name.strip() for name in categories.split(",")) if categories else ()
+    return action, kind, names
+
+
+def locate_list(text: str, key: str) -> tuple[int, int] | None:
+    # Span of the list value of a key that appears once in the save.
+    matches = list(re.finditer(r'"%s"\s*:\s*\[' % re.escape(key), text))
+    if len(matches) != 1:
+        return None
+    start = matches[0].end() - 1
+    _value, end = _decoder.raw_decode(text, start)
+    return start, end
+
+
+def render_list(text: str, start: int, end: int, values: list[str]) -> str:
+    # Reuse the save's own layout: one value per line, indented like the
+    # existing values (or one level past the key when the list was empty).
+    if not values:
+        return "[]"
+    newline = "\r\n" if "\r\n" in text else "\n"
+    line = text[text.rfind("\n", 0, start) + 1 : start]
+    key_indent = line[: len(line) - len(line.lstrip(" \t"))]
+    original = text[start + 1 : end - 1]
+    stripped = original.lstrip("\r\n")
+    if stripped.strip():
+        item_indent = stripped[: len(stripped) - len(stripped.lstrip(" \t"))]
+        close_indent = original[original.rfind("\n") + 1 :] if "\n" in original else key_indent
+    else:
+        item_indent = key_indent + ("\t" if "\t" in key_indent or not key_indent else "  ")
+        close_indent = key_indent
+    body = ("," + newline).join(item_indent + json_codec.dumps(value) for value in values)
+    return "[" + newline + body + newline + close_indent + "]"
+
+
+def transform_save(task: tuple[Path, Path, Path, Path, tuple]) -> dict[str, Any]:
+    save_path, output_path, recipes_path, spells_path, ops = task
+    catalogs = load_catalogs(recipes_path, spells_path)
+    with phase("parse"):
+        raw = save_path.read_bytes()
+        count("files_read")
+        count("bytes_read", len(raw))
+        try:
+            text = raw.decode("utf-8")
+            data = json_codec.loads(text)
+        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+            return {"error": f"JSON parse failed ({exc})"}
+    if not isinstance(data, dict):
+        return {"error": "Unexpected JSON root"}
+
+    with phase("extract"):
+        # (section, key) -> new list value.
+        lists: dict[tuple[str, str], list[str]] = {}
+        for action, kind, categories in ops:
+            unlocked_key, new_key = PROGRESS_KEYS[kind]
+            section = SELECTED_SPELLS[0] if action == "clear-selected" else "Progress"
+            if not isinstance(data.get(section), dict):
+                return {"error": f"{section} section missing"}
+            if action == "clear-new":
+                lists[(section, new_key)] = []
+                continue
+            target = SELECTED_SPELLS if action == "clear-selected" else (section, unlocked_key)
+            current = lists.get(target, data[section].get(target[1]) or [])
+            wanted = catalogs[kind][""] if not categories else [
+                persistence_id
+                for category in categories
+                for persistence_id in catalogs[kind][category]
+            ]
+            if action == "clear-selected":
+                # Slots are positional, so cleared ones stay as "".
+                cleared = set(wanted)
+                lists[target] = ["" if not categories or value in cleared else value for value in current]
+                continue
+            present = set(current)
+            missing = []
+            for persistence_id in wanted:
+                if persistence_id not in present:
+                    present.add(persistence_id)
+                    missing.append(persistence_id)
+            lists[target] = current + missing
+
+    changes: dict[str, int] = {}
+    spans = []
+    for (section, key), values in lists.items():
+        original = data[section].get(key)
+        if values == original or (not values and original is None):
+            continue
+        span = locate_list(text, key)
+        if span is None:
+            return {"error": f"{section}.{key} not found exactly once; save left unchanged"}
+        spans.append((span, key, values))
+        # Non-empty entries, so a cleared spell slot counts as one removed.
+        changes[key] = sum(1 for value in values if value) - sum(1 for value in original or [] if value)
+
+    if not spans:
+        return {"changes": {}, "written": False}
+    with phase("serialize"):
+        # Splice from the end so earlier offsets stay valid.
+        for (start, end), _key, values in sorted(spans, reverse=True):
+            text = text[:start] + render_list(text, start, end, values) + text[end:]
+        data = text.encode("utf-8")
+    written = False
+    if output_path is not None:
+        backup_path = save_path.with_name(save_path.stem + BACKUP_SUFFIX)
+        if output_path == save_path and not backup_path.exists():
+            # Same backup name the browser editors download before saving. An
+            # existing backup is kept, so it stays the save before any run.
+            write_bytes_if_changed(backup_path, raw)
+        written = write_bytes_if_changed(output_path, data)
+    return {"changes": changes, "written": written}
+
+
+def describe(changes: dict[str, int]) -> str:
+    return ", ".join(f"{key} {delta:+d}" for key, delta in sorted(changes.items()))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Apply recipe/spell unlock operations to many character saves."
+    )
+    parser.add_argument(
+        "saves",
+        nargs="+",
+        help="Save files or folders (folders are searched for *.json, skipping *_backup.json).",
+    )
+    parser.add_argument(
+        "--op",
+        action="append",
+        required=True,
+        help=(
+            "Operation, applied in order: unlock-recipes, unlock-spells, "
+            "unlock-recipes=Armour,Weapon, unlock-spells=Magic, "
+            "clear-new-recipes, clear-new-spells, clear-selected-spells[=Magic]."
+        ),
+    )
+    parser.add_argument("--recipes", default="docs/data/recipes.json", help="Recipe catalog JSON.")
+    parser.add_argument("--spells", default="docs/data/spells.json", help="Spell catalog JSON.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--output", help="Write transformed saves under this folder.")
+    target.add_argument("--in-place", action="store_true", help="Overwrite the saves, keeping <name>_backup.json copies.")
+    target.add_argument("--dry-run", action="store_true", help="Report changes without writing.")
+    add_parse_arguments(parser, "transform saves")
+    parser.add_argument("--list-categories", action="store_true", help="Print catalog categories first.")
+    add_metrics_argument(parser)
+    args = parser.parse_args()
+
+    recipes_path = Path(args.recipes)
+    spells_path = Path(args.spells)
+    for path in (recipes_path, spells_path):
+        if not path.exists():
+            print(f"[ERROR] Catalog not found: {path}")
+            return 1
+    catalogs = load_catalogs(recipes_path, spells_path)
+    if args.list_categories:
+        for kind, categories in catalogs.items():
+            names = ", ".join(f"{name} ({len(ids)})" for name, ids in sorted(categories.items()) if name)
+            print(f"[INFO] {kind}: {names}")
+
+    try:
+        ops = tuple(parse_op(raw) for raw in args.op)
+    except ValueError as exc:
+        print(f"[ERROR] {exc}")
+        return 1
+    for _action, kind, categories in ops:
+        unknown = [name for name in categories if name not in catalogs[kind]]
+        if unknown:
+            print(f"[ERROR] Unknown {kind} category: {', '.join(unknown)} (see --list-categories)")
+            return 1
+
+    with phase("scan"):
+        saves = collect_saves(args.saves)
+    if not saves:
+        print("[ERROR] No save files to transform.")
+        return 1
+
+    tasks = []
+    for save_path, root in saves:
+        if args.dry_run:
+            output_path = None
+        elif args.in_place:
+            output_path = save_path
+        else:
+            output_path = Path(args.output) / save_path.relative_to(root)
+        tasks.append((save_path, output_path, recipes_path, spells_path, ops))
+
+    changed = written = failed = 0
+    for task, result in parse_files(transform_save, tasks, args.jobs):
+        save_path = task[0]
+        if "error" in result:
+            failed += 1
+            print(f"[WARN] {save_path}: {result['error']}")
+            continue
+        if result["changes"]:
+            changed += 1
+            print(f"[INFO] {save_path}: {describe(result['changes'])}")
+        written += int(result["written"])
+
+    print(
+        f"[INFO] Saves: {len(saves)}, changed: {changed}, written: {written}, failed: {failed}"
+    )
+    write_metrics(args.metrics_out, "transform_saves")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
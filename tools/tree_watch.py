@@ -0,0 +1,204 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+
+# inotify(7) event bits.
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def stat_tree(path: Path) -> dict[str, tuple[int, int]]:
+    # Relative posix path -> (mtime_ns, size); a single file maps to "".
+    if path.is_file():
+        stat = path.stat()
+        return {"": (stat.st_mtime_ns, stat.st_size)}
+    if not path.is_dir():
+        return {}
+    files: dict[str, tuple[int, int]] = {}
+    pending = [path]
+    while pending:
+        current = pending.pop()
+        try:
+            scan = os.scandir(current)
+        except FileNotFoundError:
+            continue
+        with scan:
+            for entry in scan:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(Path(entry.path))
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                rel = os.path.relpath(entry.path, path).replace(os.sep, "/")
+                files[rel] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def is_under(rel_path: str, roots: list[str]) -> bool:
+    return any(rel_path == root or rel_path.startswith(root + "/") for root in roots)
+
+
+def watch_roots(rel_paths: list[str]) -> list[str]:
+    # Drop paths nested in another watched path; one walk covers both.
+    roots: list[str] = []
+    for rel_path in sorted(set(rel_paths)):
+        if not is_under(rel_path, roots):
+            roots.append(rel_path)
+    return roots
+
+
+class PollingWatcher:
+    name = "polling"
+
+    def __init__(self, root: Path, rel_paths: list[str]) -> None:
+        self.root = root
+        self.rel_paths = watch_roots(rel_paths)
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot: dict[str, tuple[int, int]] = {}
+        for rel_path in self.rel_paths:
+            for rel, stat in stat_tree(self.root / rel_path).items():
+                snapshot[f"{rel_path}/{rel}" if rel else rel_path] = stat
+        return snapshot
+
+    def wait(self, timeout: float) -> set[str]:
+        time.sleep(timeout)
+        current = self._scan()
+        changed = {
+            path
+            for path in self._snapshot.keys() | current.keys()
+            if self._snapshot.get(path) != current.get(path)
+        }
+        self._snapshot = current
+        return changed
+
+    def drain(self, ignored: list[str]) -> set[str]:
+        # Changes since the last wait, minus those under the ignored paths.
+        return {path for path in self.wait(0) if not is_under(path, ignored)}
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    name = "inotify"
+
+    def __init__(self, root: Path, rel_paths: list[str]) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self.root = root
+        self.rel_paths = watch_roots(rel_paths)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, str] = {}
+        try:
+            for rel_path in self.rel_paths:
+                if (root / rel_path).is_file():
+                    # A watched file is covered by a watch on its folder.
+                    self._add_watch(Path(rel_path).parent.as_posix())
+                else:
+                    self._add_tree(rel_path)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, rel_dir: str) -> None:
+        path = self.root / rel_dir if rel_dir != "." else self.root
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            # The folder vanished between the walk and the watch.
+            if code == errno.ENOENT:
+                return
+            raise OSError(code, f"inotify_add_watch failed: {os.strerror(code)}", str(path))
+        self._dirs[wd] = rel_dir
+
+    def _add_tree(self, rel_dir: str) -> None:
+        if not (self.root / rel_dir).is_dir():
+            return
+        pending = [rel_dir]
+        while pending:
+            current = pending.pop()
+            self._add_watch(current)
+            try:
+                scan = os.scandir(self.root / current)
+            except FileNotFoundError:
+                continue
+            with scan:
+                for entry in scan:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(f"{current}/{entry.name}" if current != "." else entry.name)
+
+    def _watched(self, rel_path: str) -> bool:
+        return is_under(rel_path, self.rel_paths)
+
+    def _read(self) -> set[str]:
+        changed: set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0").decode("utf-8", "surrogateescape")
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped; treat every watched path as changed.
+                    changed.update(self.rel_paths)
+                    continue
+                rel_dir = self._dirs.get(wd)
+                if rel_dir is None:
+                    continue
+                rel_path = f"{rel_dir}/{name}" if rel_dir != "." else name
+                if not name:
+                    rel_path = rel_dir
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    self._add_tree(rel_path)
+                if self._watched(rel_path):
+                    changed.add(rel_path)
+
+    def wait(self, timeout: float) -> set[str]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        return self._read()
+
+    def drain(self, ignored: list[str]) -> set[str]:
+        return {path for path in self._read() if not is_under(path, ignored)}
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def open_watcher(root: Path, rel_paths: list[str], poll: bool = False):
+    if not poll:
+        try:
+            return InotifyWatcher(root, rel_paths)
+        except (OSError, AttributeError) as exc:
+            print(f"[WARN] inotify unavailable ({exc}); falling back to polling")
+    return PollingWatcher(root, rel_paths)
@@ -1,8 +1,19 @@
-import json
+import argparse
 import re
-import shutil
 from pathlib import Path
 
+import json_codec
+from build_metrics import add_metrics_argument, load_json_file, phase, write_metrics
+from catalog_output import (
+    add_output_arguments,
+    remove_stale_compressed,
+    report_sizes,
+    write_catalog,
+    write_precompressed,
+)
+from file_ops import copy_if_changed, write_text_if_changed
+from item_index import ITEM_INDEX_NAME, read_item_index
+
 
 LOOT_TABLE_PATH = Path("LootDropTable/DT_LootDropTable.json")
 ENEMY_NAMES_PATH = Path("LootDropTable/DT_LootDropTable_EnemyNames.json")
@@ -13,18 +24,17 @@ WEB_TARGETS = {
     ENEMY_NAMES_PATH: Path("docs/data/loot_drop_table_enemy_names.json"),
     ITEM_NAMES_PATH: Path("docs/data/loot_drop_table_item_names.json"),
 }
+SUMMARY_PATH = Path("docs/data/loot_drop_summary.json")
 
 ITEM_ID_PATTERN = re.compile(r"(ITEM_[A-Za-z0-9_]+|DA_[A-Za-z0-9_]+)")
 
 
 def load_json(path: Path) -> object:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return load_json_file(path)
 
 
-def write_json(path: Path, data: object) -> None:
-    path.write_text(
-        json.dumps(data, indent=2, ensure_ascii=True) + "\n", encoding="utf-8"
-    )
+def write_json(path: Path, data: object) -> bool:
+    return write_text_if_changed(path, json_codec.dumps(data) + "\n")
 
 
 def extract_rows(loot_table: object) -> dict:
@@ -51,7 +61,7 @@ def update_enemy_names(rows: dict) -> dict:
     return updated
 
 
-def update_item_names(rows: dict) -> dict:
+def update_item_names(rows: dict, item_index: dict | None = None) -> dict:
     existing = {}
     if ITEM_NAMES_PATH.exists():
         existing = load_json(ITEM_NAMES_PATH)
@@ -66,22 +76,102 @@ def update_item_names(rows: dict) -> dict:
         current = ""
         if isinstance(existing, dict):
             current = existing.get(item_id, "")
+        if not current and item_index:
+            current = item_index.get(item_id, {}).get("display_name", "")
         updated[item_id] = current
     write_json(ITEM_NAMES_PATH, updated)
     return updated
 
 
+def resource_item_id(resource: dict) -> str:
+    object_name = resource.get("SpawnedItemData", {}).get("ObjectName", "")
+    match = ITEM_ID_PATTERN.search(str(object_name))
+    return match.group(1) if match else ""
+
+
+def build_drop_summary(rows: dict) -> dict:
+    # enemies: enemy -> [[item, drop chance %, expected count], ...] and
+    # items: item -> [[enemy, drop chance %, expected count], ...].
+    # Chance is the odds of at least one drop when an enemy lists the same
+    # item several times; expected count is the sum of row DropChance x
+    # resource DropChance x mean amount over those entries.
+    enemies = {}
+    items: dict[str, list] = {}
+    for enemy in sorted(rows):
+        row = rows[enemy]
+        row_chance = float(row.get("DropChance", 100.0)) / 100
+        totals: dict[str, list[float]] = {}
+        for resource in row.get("Resources", []):
+            item_id = resource_item_id(resource)
+            if not item_id:
+                continue
+            chance = float(resource.get("DropChance", 0.0)) / 100
+            low = resource.get("MinimumDropAmount", 1)
+            high = resource.get("MaximumDropAmount", low)
+            # [chance every entry misses, expected count]
+            entry = totals.setdefault(item_id, [1.0, 0.0])
+            entry[0] *= 1 - chance
+            entry[1] += row_chance * chance * (low + high) / 2
+        drops = [
+            [item_id, round(row_chance * (1 - miss) * 100, 4), round(expected, 4)]
+            for item_id, (miss, expected) in totals.items()
+        ]
+        drops.sort(key=lambda drop: (-drop[2], drop[0]))
+        enemies[enemy] = drops
+        for item_id, chance, expected in drops:
+            items.setdefault(item_id, []).append([enemy, chance, expected])
+    for sources in items.values():
+        sources.sort(key=lambda source: (-source[1], -source[2], source[0]))
+    return {"enemies": enemies, "items": dict(sorted(items.items()))}
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Refresh loot drop table name maps and sync them into docs/data."
+    )
+    parser.add_argument(
+        "--item-index",
+        default=str(Path(".build-cache") / ITEM_INDEX_NAME),
+        help="Item index written by the catalog builders, used to fill blank item names.",
+    )
+    add_output_arguments(parser)
+    add_metrics_argument(parser)
+    args = parser.parse_args()
+
     loot_table = load_json(LOOT_TABLE_PATH)
     rows = extract_rows(loot_table)
 
-    update_enemy_names(rows)
-    update_item_names(rows)
+    item_index = read_item_index(Path(args.item_index))
+    if not item_index:
+        print(f"[WARN] Item index not found, item names left as-is: {args.item_index}")
+
+    with phase("extract"):
+        update_enemy_names(rows)
+        update_item_names(rows, item_index)
+        summary = build_drop_summary(rows)
 
     for src_path, dst_path in WEB_TARGETS.items():
-        dst_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copyfile(src_path, dst_path)
-        print(f"Copied {src_path} -> {dst_path}")
+        if args.compact:
+            changed = write_catalog(
+                dst_path, load_json(src_path), compact=True, precompress=args.precompress
+            )
+        else:
+            changed = copy_if_changed(src_path, dst_path)
+            if args.precompress:
+                report_sizes(dst_path, write_precompressed(dst_path))
+            else:
+                remove_stale_compressed(dst_path)
+        if changed:
+            print(f"Copied {src_path} -> {dst_path}")
+        else:
+            print(f"Unchanged {dst_path}")
+    # Always minified: the page only reads it for lookups.
+    if write_catalog(SUMMARY_PATH, summary, compact=True, precompress=args.precompress):
+        print(f"Wrote {SUMMARY_PATH}")
+    else:
+        print(f"Unchanged {SUMMARY_PATH}")
+    print(f"[INFO] Drop summary: {len(summary['enemies'])} enemies, {len(summary['items'])} items")
+    write_metrics(args.metrics_out, "update_drop_tables")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,259 @@
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import json_codec
+from build_metrics import add_metrics_argument, load_json_file, phase, write_metrics
+from file_ops import write_text_if_changed
+from parse_pool import add_parse_arguments, parse_files
+from save_files import collect_saves
+
+
+# (first slot, last slot, label, catalog tab required in those slots or None).
+INVENTORY_RANGES = [
+    (0, 7, "Action bar", None),
+    (8, 31, "Main", None),
+    (32, 55, "Runes", "rune"),
+    (56, 79, "Arrows", "ammo"),
+    (80, 103, "Quest", "quest"),
+]
+INVENTORY_LAST_SLOT = 103
+PERSONAL_LAST_SLOT = 19
+LOADOUT_SLOT_KEYS = ["Head", "Body", "Legs", "Cape", "Jewellery"]
+ARMOUR_SLOTS = ("Head", "Body", "Legs")
+
+_INDEXES: dict[Path, dict[str, dict[str, Any]]] = {}
+
+
+def equipment_slots(category: str) -> tuple[str, ...] | None:
+    # Loadout slots an item may sit in, from its catalog category. The catalog
+    # has no per-item slot, so Head/Body/Legs armour cannot be told apart and
+    # shields are not checked (None).
+    root, _, group = category.partition("/")
+    if root != "Armour":
+        return ()
+    if group.startswith("Capes"):
+        return ("Cape",)
+    if group.startswith("Trinkets"):
+        return ("Jewellery",)
+    if group.startswith("Shields"):
+        return None
+    return ARMOUR_SLOTS
+
+
+def load_catalog_index(catalog_path: Path) -> dict[str, dict[str, Any]]:
+    # Built once per process; pool workers each load their own copy.
+    key = catalog_path.resolve()
+    index = _INDEXES.get(key)
+    if index is not None:
+        return index
+    catalog = load_json_file(catalog_path)
+    index = {}
+    for tab, tab_data in (catalog.get("tabs") or {}).items():
+        for item in tab_data.get("items") or []:
+            item_data = item.get("itemData")
+            if not item_data:
+                continue
+            index[item_data] = {
+                "tab": tab,
+                "name": item.get("name") or item_data,
+                "category": item.get("category") or "",
+                "slots": equipment_slots(item.get("category") or ""),
+                "max_stack": item.get("maxStack") or 1,
+            }
+    _INDEXES[key] = index
+    return index
+
+
+def slot_range(slot: int) -> tuple[int, int, str, str | None] | None:
+    for entry in INVENTORY_RANGES:
+        if entry[0] <= slot <= entry[1]:
+            return entry
+    return None
+
+
+def iter_slots(section_name: str, section: Any, issues: list[str]) -> list[tuple[int, Any]]:
+    if section is None:
+        return []
+    if not isinstance(section, dict):
+        issues.append(f"{section_name}: expected an object")
+        return []
+    slots = []
+    for key, value in section.items():
+        if key == "MaxSlotIndex":
+            continue
+        try:
+            slots.append((int(key), value))
+        except ValueError:
+            issues.append(f"{section_name}: invalid slot key {key!r}")
+    return slots
+
+
+def check_item(
+    label: str,
+    entry: dict[str, Any],
+    index: dict[str, dict[str, Any]],
+    guids: dict[str, str],
+    issues: list[str],
+) -> dict[str, Any] | None:
+    guid = entry.get("GUID")
+    if not guid:
+        issues.append(f"{label}: missing GUID")
+    elif guid in guids:
+        issues.append(f"{label}: duplicate GUID {guid} (also {guids[guid]})")
+    else:
+        guids[guid] = label
+
+    item_data = entry.get("ItemData")
+    if not item_data:
+        issues.append(f"{label}: missing ItemData")
+        return None
+    meta = index.get(item_data)
+    if meta is None:
+        issues.append(f"{label}: unknown ItemData {item_data}")
+        return None
+
+    count = entry.get("Count", 1)
+    if not isinstance(count, int) or isinstance(count, bool) or count < 1:
+        issues.append(f"{label}: invalid Count {count!r} ({meta['name']})")
+    elif count > meta["max_stack"]:
+        issues.append(f"{label}: Count {count} exceeds max stack {meta['max_stack']} ({meta['name']})")
+    return meta
+
+
+def validate_save(task: tuple[Path, Path]) -> list[str]:
+    save_path, catalog_path = task
+    index = load_catalog_index(catalog_path)
+    try:
+        data = load_json_file(save_path)
+    except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+        return [f"JSON parse failed ({exc})"]
+    if not isinstance(data, dict):
+        return ["Unexpected JSON root"]
+
+    issues: list[str] = []
+    guids: dict[str, str] = {}
+
+    for slot, entry in iter_slots("Inventory", data.get("Inventory"), issues):
+        label = f"Inventory[{slot}]"
+        if not isinstance(entry, dict):
+            issues.append(f"{label}: expected an object")
+            continue
+        section = slot_range(slot)
+        if section is None:
+            issues.append(f"{label}: slot outside 0-{INVENTORY_LAST_SLOT}")
+        meta = check_item(label, entry, index, guids, issues)
+        if section is None or meta is None:
+            continue
+        first, last, range_label, tab = section
+        if tab is not None and meta["tab"] != tab:
+            issues.append(f"{label}: {meta['name']} not allowed in {range_label} slots {first}-{last}")
+
+    for slot, entry in iter_slots("PersonalInventory", data.get("PersonalInventory"), issues):
+        label = f"PersonalInventory[{slot}]"
+        if not isinstance(entry, dict):
+            issues.append(f"{label}: expected an object")
+            continue
+        if not 0 <= slot <= PERSONAL_LAST_SLOT:
+            issues.append(f"{label}: slot outside 0-{PERSONAL_LAST_SLOT}")
+        check_item(label, entry, index, guids, issues)
+
+    for slot, entry in iter_slots("Loadout", data.get("Loadout"), issues):
+        label = f"Loadout[{slot}]"
+        if not isinstance(entry, dict):
+            issues.append(f"{label}: expected an object")
+            continue
+        if "PlayerInventoryItemIndex" in entry:
+            # Quick slots point back into Inventory instead of holding an item.
+            target = entry["PlayerInventoryItemIndex"]
+            if not isinstance(target, int) or not 0 <= target <= INVENTORY_LAST_SLOT:
+                issues.append(f"{label}: PlayerInventoryItemIndex {target!r} outside 0-{INVENTORY_LAST_SLOT}")
+            continue
+        if not 0 <= slot < len(LOADOUT_SLOT_KEYS):
+            issues.append(f"{label}: equipment slot outside 0-{len(LOADOUT_SLOT_KEYS) - 1}")
+            check_item(label, entry, index, guids, issues)
+            continue
+        meta = check_item(label, entry, index, guids, issues)
+        slot_key = LOADOUT_SLOT_KEYS[slot]
+        if meta is None or meta["slots"] is None:
+            continue
+        if not meta["slots"]:
+            issues.append(f"{label}: {meta['name']} ({meta['category']}) is not equipment")
+        elif slot_key not in meta["slots"]:
+            issues.append(f"{label}: {meta['name']} ({meta['category']}) does not fit the {slot_key} slot")
+
+    return issues
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Validate character save files against the generated item catalog."
+    )
+    parser.add_argument(
+        "saves",
+        nargs="+",
+        help="Save files or folders (folders are searched for *.json, skipping *_backup.json).",
+    )
+    parser.add_argument(
+        "--catalog",
+        default="docs/data/catalog.json",
+        help="Item catalog written by build_dwe_catalog.py.",
+    )
+    add_parse_arguments(parser, "validate saves")
+    parser.add_argument(
+        "--report",
+        help="Optional JSON file mapping each save with issues to its issue list.",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Only print the summary line.",
+    )
+    add_metrics_argument(parser)
+    args = parser.parse_args()
+
+    catalog_path = Path(args.catalog)
+    if not catalog_path.exists():
+        print(f"[ERROR] Catalog not found: {catalog_path}")
+        return 1
+    with phase("scan"):
+        saves = [save for save, _root in collect_saves(args.saves)]
+    if not saves:
+        print("[ERROR] No save files to validate.")
+        return 1
+
+    start = time.perf_counter()
+    with phase("parse"):
+        index = load_catalog_index(catalog_path)
+    print(f"[INFO] Catalog items indexed: {len(index)}")
+
+    report: dict[str, list[str]] = {}
+    issue_count = 0
+    tasks = [(save_path, catalog_path) for save_path in saves]
+    for (save_path, _catalog), issues in parse_files(validate_save, tasks, args.jobs):
+        if not issues:
+            continue
+        report[save_path.as_posix()] = issues
+        issue_count += len(issues)
+        if not args.quiet:
+            for issue in issues:
+                print(f"[ERROR] {save_path}: {issue}")
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"[INFO] Checked {len(saves)} saves in {elapsed:.2f}s: "
+        f"{len(saves) - len(report)} valid, {len(report)} with issues ({issue_count} issues)"
+    )
+    if args.report:
+        with phase("serialize"):
+            text = json_codec.dumps(report) + "\n"
+        write_text_if_changed(Path(args.report), text)
+        print(f"[INFO] Wrote report: {args.report}")
+    write_metrics(args.metrics_out, "validate_saves")
+    return 1 if report else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())